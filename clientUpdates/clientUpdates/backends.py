@@ -1,7 +1,9 @@
 from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from .models import pwsCreds
-from django.contrib.auth.hashers import check_password
+from .utils.jobs import enqueue_user_password
+from django.utils.crypto import constant_time_compare
 
 # class PwsTableAuthBackend(BaseBackend):
 #     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -28,19 +30,22 @@ from django.contrib.auth.hashers import check_password
 
 class pwsCredsAuthBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            # Retrieve the user from the PWS table using form_userid and form_pw
-            pws_record = pwsCreds.objects.get(username=username)
-            if pws_record and password == pws_record.password:
-                # Check if a User exists with the same username
-                user, created = User.objects.get_or_create(username=username)
-                if created:
-                    user.set_password(password)
-                    user.save()
-                return user
-        except pwsCreds.DoesNotExist:
+        if not username or password is None:
+            return None
+
+        # Retrieve the stored password from the PWS credentials table (indexed on username)
+        stored_password = pwsCreds.objects.filter(username=username).values_list('password', flat=True).first()
+        if stored_password is None or not constant_time_compare(password, stored_password):
             return None
 
+        user, created = User.objects.get_or_create(username=username,
+                                                   defaults={'password': make_password(None)})
+        if created:
+            # First login: the PBKDF2 hash is computed by a background job instead of during the request.
+            # Until it runs the user has an unusable password, which only matters to ModelBackend.
+            enqueue_user_password(username)
+        return user
+
     def get_user(self, user_id):
         try:
             return User.objects.get(pk=user_id)
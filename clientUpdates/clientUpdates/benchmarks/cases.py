@@ -0,0 +1,95 @@
+from django.test import Client
+from django.urls import reverse
+
+from ..utils.tables_utils import get_latest_entries
+from ..utils.updates import (update_ehe_source_table, update_ehe_pws_table, bulk_update_ehe_source_table,
+                             bulk_update_ehe_pws_table)
+from .seed import CLAIM, TB_CLAIM
+
+
+class BenchmarkContext:
+    """ The sampled sources of a run, and a logged-in test client per PWS for the view benchmarks. """
+
+    def __init__(self, source_keys):
+        from django.contrib.auth import get_user_model
+        from ..models import TB_ClaimSource
+
+        self.source_keys = source_keys
+        # Sampled sources that also have a Tyco/BASF claim
+        pwsids = {pwsid for pwsid, _ in source_keys}
+        self.tb_claim_keys = set(source_keys) & set(
+            TB_ClaimSource.objects.filter(pwsid__in=pwsids).values_list('pwsid', 'source_name'))
+        # Logging in is not part of what the view benchmarks measure, so it's done up front
+        self.clients = {}
+        for pwsid, _ in source_keys:
+            if pwsid not in self.clients:
+                user, _ = get_user_model().objects.get_or_create(username=pwsid)
+                self.clients[pwsid] = Client()
+                self.clients[pwsid].force_login(user)
+
+    def client(self, pwsid):
+        return self.clients[pwsid]
+
+
+def get_page(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise AssertionError(f"GET {url} returned {response.status_code}")
+    return response
+
+
+def bench_update_ehe_source_table(context, pwsid, source_name):
+    update_ehe_source_table(pwsid, source_name)
+
+
+def bench_update_ehe_pws_table(context, pwsid, source_name):
+    update_ehe_pws_table(pwsid)
+
+
+def bench_recompute_source_job(context, pwsid, source_name):
+    # What the background job runs after an update (utils.jobs.recompute_source_job)
+    bulk_update_ehe_source_table([pwsid])
+    bulk_update_ehe_pws_table([pwsid])
+
+
+def bench_get_latest_entries(context, pwsid, source_name):
+    from ..models import PfasResult, FlowRate
+
+    updates = {'pwsid': pwsid, 'source_name': source_name, 'updated_by_water_provider': True}
+    list(get_latest_entries(PfasResult.objects.filter(**updates)).values('analyte', 'result_ppt'))
+    list(get_latest_entries(FlowRate.objects.filter(**updates), source_variable='AFR').values('year', 'flow_rate_gpm'))
+    list(get_latest_entries(FlowRate.objects.filter(**updates), source_variable='VFR').values('flow_rate_gpm'))
+
+
+def bench_source_detail_view(context, pwsid, source_name):
+    get_page(context.client(pwsid), reverse('source-detail', args=(CLAIM, pwsid, source_name)))
+
+
+def bench_source_detail_full_history(context, pwsid, source_name):
+    # Synthetic claim sources have a max flow rate and every annual from 2013 to 2025. The 3M/DuPont page reads
+    # them from the source's current state; the Tyco/BASF page, rendered for the sources that have that claim,
+    # reads the claim rows with their unit conversions computed in the query
+    claims = (CLAIM, TB_CLAIM) if (pwsid, source_name) in context.tb_claim_keys else (CLAIM,)
+    for claim in claims:
+        get_page(context.client(pwsid), reverse('source-detail', args=(claim, pwsid, source_name)))
+
+
+def bench_activity_view(context, pwsid, source_name):
+    get_page(context.client(pwsid), reverse('activity'))
+
+
+def bench_dashboard(context, pwsid, source_name):
+    get_page(context.client(pwsid), reverse('dashboard', args=(CLAIM, 1)))
+
+
+# Each benchmark runs once per sampled source
+BENCHMARKS = {
+    'update_ehe_source_table': bench_update_ehe_source_table,
+    'update_ehe_pws_table': bench_update_ehe_pws_table,
+    'recompute_source_job': bench_recompute_source_job,
+    'get_latest_entries': bench_get_latest_entries,
+    'source_detail_view': bench_source_detail_view,
+    'source_detail_full_history': bench_source_detail_full_history,
+    'activity_view': bench_activity_view,
+    'dashboard': bench_dashboard,
+}
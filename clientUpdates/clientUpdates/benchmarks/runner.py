@@ -0,0 +1,86 @@
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connection, connections
+
+from ..utils.request_metrics import QueryTimer, summarize_samples
+
+
+def run_benchmark(func, context, sample_keys, repeat=1, memory_samples=3):
+    """
+    Time a benchmark over the sampled sources.
+
+    Each call is timed with the queries it runs (count and time spent in the database). Peak memory is
+    measured in a separate pass over the first memory_samples sources, since tracemalloc slows the code down.
+
+    Returns:
+        dict with the percentiles of the wall and DB times (ms), the query counts and peak_memory_kib.
+    """
+    # Warm up caches, connections and lazily imported modules
+    func(context, *sample_keys[0])
+
+    samples = []
+    for _ in range(repeat):
+        for pwsid, source_name in sample_keys:
+            query_timer = QueryTimer()
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(query_timer))
+                start = time.perf_counter()
+                func(context, pwsid, source_name)
+                wall_ms = (time.perf_counter() - start) * 1000
+            samples.append((wall_ms, query_timer.duration * 1000, query_timer.count))
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for pwsid, source_name in sample_keys[:memory_samples]:
+            tracemalloc.reset_peak()
+            func(context, pwsid, source_name)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {**summarize_samples(samples), 'peak_memory_kib': round(peak / 1024, 1)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_report(results, **parameters):
+    """ The JSON document written by the run_benchmarks command. """
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'database': connection.vendor,
+        **parameters,
+        'benchmarks': results,
+    }
+
+
+def compare_reports(report, baseline, metrics=('wall_ms_p50', 'wall_ms_p95', 'queries_mean', 'peak_memory_kib')):
+    """
+    Returns:
+        list of (benchmark, metric, baseline value, new value, relative change) for the benchmarks in both reports.
+    """
+    rows = []
+    for name, result in report['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        for metric in metrics:
+            old, new = previous.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else None
+            rows.append((name, metric, old, new, change))
+    return rows
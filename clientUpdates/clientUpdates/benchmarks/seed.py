@@ -0,0 +1,28 @@
+from ..utils.synthetic_data import load_synthetic_data
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+
+# Synthetic PWSIDs are BM followed by 7 digits, so benchmark rows never collide with real or other synthetic ones
+PWSID_PREFIX = 'BM'
+CLAIM = '3M_DuPont'
+TB_CLAIM = 'Tyco_BASF'
+
+# The tables the benchmarked code reads
+BENCHMARK_TABLES = ('pws', 'source', 'claim', 'tb_claim', 'updates', 'supplemental')
+
+
+def seed_benchmark_data(n_sources, seed=0, updates_per_source=2, batch_size=None):
+    """
+    Load the synthetic claims and updates dataset the benchmarks run on (utils.synthetic_data).
+
+    Args:
+        n_sources: Number of sources.
+        seed: Seed of the random generator; the same seed loads the same rows.
+        updates_per_source: Average number of PfasResult and of FlowRate updates per source.
+        batch_size: Rows per COPY or INSERT batch.
+
+    Returns:
+        tuple: (list of (pwsid, source_name) of the seeded sources, dict of row counts per table)
+    """
+    return load_synthetic_data(n_sources, seed=seed, pwsid_prefix=PWSID_PREFIX, revisions=updates_per_source,
+                               tables=BENCHMARK_TABLES, batch_size=batch_size)
@@ -1,19 +1,17 @@
-from .models import Pws, ClaimPws
+from .utils.pws_profile import get_pws_profile
 import logging
 
 logger = logging.getLogger('clientUpdates')
 
 def info_bar_context(request):
     if request.user.is_authenticated:
-        try:
-            pws_record = Pws.objects.get(form_userid=request.user.username)
-            claim_pws_record = ClaimPws.objects.get(pwsid=pws_record.pwsid)
-
-            return {
-                'pws': pws_record,
-                'claim_pws': claim_pws_record,
-            }
-        except (Pws.DoesNotExist, ClaimPws.DoesNotExist):
+        profile = get_pws_profile(request)
+        if profile.pws is None or profile.claim_pws is None:
             #logger.info("Pws or ClaimPws record does not exist.")
             return {}
-    return {}
\ No newline at end of file
+
+        return {
+            'pws': profile.pws,
+            'claim_pws': profile.claim_pws,
+        }
+    return {}
@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, close_old_connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from clientUpdates.utils.request_metrics import QueryTimer, summarize_samples
+
+
+class Command(BaseCommand):
+    help = ("Benchmark a page with a new database connection per request (CONN_MAX_AGE=0) against a persistent "
+            "connection (CONN_MAX_AGE=60), as the WSGI handler opens and closes them. Reads existing data only.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pwsid', help="PWSID of the user the page is requested as (default: the first claim "
+                                            "source PWSID with a user).")
+        parser.add_argument('--url-name', default='landing_page', help="URL name of the page to request.")
+        parser.add_argument('--requests', type=int, default=300, help="Number of requests per setting.")
+        parser.add_argument('--conn-max-age', type=int, nargs='+', default=[0, 60],
+                            help="CONN_MAX_AGE values to compare.")
+
+    def handle(self, *args, **options):
+        from clientUpdates.models import ClaimSource
+
+        users = get_user_model().objects
+        pwsid = options['pwsid'] or (ClaimSource.objects.filter(pwsid__in=users.values('username'))
+                                     .order_by('pwsid').values_list('pwsid', flat=True).first())
+        user = users.filter(username=pwsid).first()
+        if user is None:
+            raise CommandError(f"No user {pwsid!r}; pass the --pwsid of an existing user.")
+
+        url = reverse(options['url_name'])
+        self.stdout.write(f"GET {url} as {pwsid}, {options['requests']} requests per setting, "
+                          f"{connection.vendor} {connection.settings_dict['HOST'] or 'local socket'}")
+
+        configured_max_age = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                client = Client()
+                client.force_login(user)
+                for conn_max_age in options['conn_max_age']:
+                    result = self.run(client, url, conn_max_age, options['requests'])
+                    self.stdout.write(f"CONN_MAX_AGE={conn_max_age:<4} p50 {result['wall_ms_p50']:>7.2f} ms  "
+                                      f"p95 {result['wall_ms_p95']:>7.2f} ms  db p50 {result['db_ms_p50']:>7.2f} ms  "
+                                      f"queries {result['queries_mean']:>5.1f}  new connections {result['connections']}")
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = configured_max_age
+
+    def run(self, client, url, conn_max_age, n_requests):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+        # Warm up the URL resolver, templates and caches
+        client.get(url)
+
+        samples = []
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            connects.append(connection.alias)
+
+        connection_created.connect(count_connect)
+        try:
+            for _ in range(n_requests):
+                query_timer = QueryTimer()
+                with connection.execute_wrapper(query_timer):
+                    start = time.perf_counter()
+                    # The test client disconnects close_old_connections from request_started and request_finished,
+                    # so call it where the WSGI handler would: before and after each request
+                    close_old_connections()
+                    response = client.get(url)
+                    close_old_connections()
+                    wall_ms = (time.perf_counter() - start) * 1000
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}")
+                samples.append((wall_ms, query_timer.duration * 1000, query_timer.count))
+        finally:
+            connection_created.disconnect(count_connect)
+
+        for conn in connections.all():
+            conn.close()
+        return {**summarize_samples(samples), 'connections': len(connects)}
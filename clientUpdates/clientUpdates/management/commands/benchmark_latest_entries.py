@@ -0,0 +1,110 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from clientUpdates.models import PfasResult, FlowRate
+from clientUpdates.utils.form_options import pfasAnalytes, years
+from clientUpdates.utils.tables_utils import get_latest_entries
+
+
+class Rollback(Exception):
+    """ Raised to discard the synthetic rows once the benchmark is done. """
+
+
+def get_latest_entries_correlated(queryset, source_variable=None):
+    """ The previous correlated Subquery implementation, kept here as the benchmark baseline. """
+    if source_variable == 'AFR':
+        latest_annuals = queryset.filter(source_variable='AFR', year=OuterRef('year')).order_by('-submit_date')
+        return queryset.filter(row_names__in=Subquery(latest_annuals.values('row_names')[:1]))
+    elif source_variable == 'VFR':
+        return queryset.filter(source_variable='VFR').order_by('-submit_date')[:1]
+    latest_pfas_results = queryset.filter(analyte=OuterRef('analyte')).order_by('-submit_date')
+    return queryset.filter(row_names__in=Subquery(latest_pfas_results.values('row_names')[:1]))
+
+
+# (label, model, source_variable, columns read) of the benchmarked lookups
+LOOKUPS = (
+    ('pfas_result', PfasResult, None, ('analyte', 'result_ppt')),
+    ('flow_rate AFR', FlowRate, 'AFR', ('year', 'flow_rate_gpm')),
+    ('flow_rate VFR', FlowRate, 'VFR', ('flow_rate_gpm',)),
+)
+
+
+class Command(BaseCommand):
+    help = ("Benchmark get_latest_entries against the previous correlated subquery on synthetic pfas_result and "
+            "flow_rate tables. The synthetic rows are inserted in a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help="Number of synthetic rows per table (pfas_result and flow_rate).")
+        parser.add_argument('--sources', type=int, default=10_000, help="Number of synthetic sources.")
+        parser.add_argument('--samples', type=int, default=50, help="Number of sources queried per implementation.")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(**options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic rows rolled back.")
+
+    def run(self, rows, sources, samples, seed, **options):
+        rng = random.Random(seed)
+        now = timezone.now()
+        source_keys = [(f"BM{i // 10:07d}", f"Source {i}") for i in range(sources)]
+
+        def updated(pwsid, source_name):
+            return {'pwsid': pwsid, 'source_name': source_name, 'updated_by_water_provider': True,
+                    'submit_date': now - timedelta(minutes=rng.randint(0, 500_000))}
+
+        self.stdout.write(f"Seeding {rows} pfas_result and {rows} flow_rate rows across {sources} sources...")
+        pfas_results, flow_rates = [], []
+        for _ in range(rows):
+            pfas_results.append(PfasResult(analyte=rng.choice(pfasAnalytes), result_ppt=rng.uniform(0, 50),
+                                           **updated(*rng.choice(source_keys))))
+            # About one VFR revision for every annual production revision of each year
+            source_variable = 'VFR' if rng.random() < 1 / (len(years) + 1) else 'AFR'
+            flow_rates.append(FlowRate(source_variable=source_variable,
+                                       year=rng.choice(years) if source_variable == 'AFR' else None,
+                                       flow_rate_gpm=rng.uniform(0, 5000), **updated(*rng.choice(source_keys))))
+            if len(pfas_results) == 10_000:
+                PfasResult.objects.bulk_create(pfas_results)
+                FlowRate.objects.bulk_create(flow_rates)
+                pfas_results, flow_rates = [], []
+        PfasResult.objects.bulk_create(pfas_results)
+        FlowRate.objects.bulk_create(flow_rates)
+
+        sample_keys = rng.sample(source_keys, min(samples, len(source_keys)))
+        pwsids = {pwsid for pwsid, _ in sample_keys}
+
+        results = {}
+        for label, model, source_variable, columns in LOOKUPS:
+            updates = model.objects.filter(updated_by_water_provider=True)
+
+            def per_source(latest_func):
+                timings = []
+                for pwsid, source_name in sample_keys:
+                    start = time.perf_counter()
+                    list(latest_func(updates.filter(pwsid=pwsid, source_name=source_name),
+                                     source_variable=source_variable).values(*columns))
+                    timings.append(time.perf_counter() - start)
+                return timings
+
+            results[f'{label}: correlated subquery (per source)'] = per_source(get_latest_entries_correlated)
+            results[f'{label}: get_latest_entries (per source)'] = per_source(get_latest_entries)
+
+            start = time.perf_counter()
+            list(get_latest_entries(updates.filter(pwsid__in=pwsids), source_variable=source_variable, by_source=True)
+                 .values('pwsid', 'source_name', *columns))
+            results[f'{label}: get_latest_entries (bulk, all sampled PWSIDs)'] = [time.perf_counter() - start]
+
+        for name, timings in results.items():
+            self.stdout.write(f"{name}: median {statistics.median(timings) * 1000:.2f} ms, "
+                              f"max {max(timings) * 1000:.2f} ms over {len(timings)} run(s)")
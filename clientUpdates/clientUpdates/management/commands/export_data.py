@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from clientUpdates.utils.exports import EXPORT_DATASETS, EXPORT_CHUNK_SIZE, get_export_queryset, iter_csv
+from clientUpdates.utils.tables_utils import CLAIMS
+
+
+class Command(BaseCommand):
+    help = ("Export a claim dataset (sources, PFAS results, flow rates or source payments) as CSV, for one PWS "
+            "or for everyone. Rows are streamed, so memory stays flat for full-database exports.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('claim', choices=CLAIMS)
+        parser.add_argument('dataset', choices=EXPORT_DATASETS)
+        parser.add_argument('--pwsid', help="PWSID to export (default: every PWS).")
+        parser.add_argument('--output', '-o', help="CSV file to write (default: standard output).")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help="Rows fetched per round trip.")
+
+    def handle(self, *args, **options):
+        try:
+            columns, rows = get_export_queryset(options['claim'], options['dataset'], options['pwsid'])
+        except ValueError as e:
+            raise CommandError(e)
+
+        chunks = iter_csv(columns, rows, chunk_size=options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Exported {options['dataset']} to {options['output']}."))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clientUpdates.utils.synthetic_data import (TABLES, DEFAULT_PWSID_PREFIX, load_synthetic_data,
+                                                delete_synthetic_data)
+
+
+class Command(BaseCommand):
+    help = ("Load a deterministic synthetic dataset of PWSs and sources with their claim, update, payment and "
+            "Phase 2 rows, for load and performance testing. Uses COPY on PostgreSQL.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sources', type=int, default=10_000, help="Number of synthetic sources.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--revisions', type=int, default=3,
+                            help="Average number of PFAS result and of flow rate updates per source.")
+        parser.add_argument('--tables', nargs='+', choices=TABLES, default=TABLES, help="Tables to load.")
+        parser.add_argument('--pwsid-prefix', default=DEFAULT_PWSID_PREFIX,
+                            help="Prefix of the synthetic PWSIDs, which are 9 characters long.")
+        parser.add_argument('--method', choices=('auto', 'copy', 'bulk_create'), default='auto',
+                            help="How rows are written; auto uses COPY on PostgreSQL and bulk_create elsewhere.")
+        parser.add_argument('--batch-size', type=int, help="Rows per COPY or INSERT batch.")
+        parser.add_argument('--replace', action='store_true',
+                            help="Delete the rows of PWSIDs with the prefix before loading.")
+        parser.add_argument('--delete', action='store_true',
+                            help="Only delete the rows of PWSIDs with the prefix.")
+
+    def handle(self, *args, **options):
+        prefix = options['pwsid_prefix']
+        if not 1 <= len(prefix) <= 4 or not prefix.isalpha():
+            raise CommandError("--pwsid-prefix must be 1 to 4 letters.")
+
+        if options['delete'] or options['replace']:
+            counts = delete_synthetic_data(prefix)
+            self.stdout.write(f"Deleted {sum(counts.values())} rows of {prefix}* PWSs.")
+            if options['delete']:
+                return
+
+        start = time.perf_counter()
+        try:
+            source_keys, counts = load_synthetic_data(options['sources'], seed=options['seed'], pwsid_prefix=prefix,
+                                                      revisions=options['revisions'], tables=options['tables'],
+                                                      method=options['method'], batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(e)
+        elapsed = time.perf_counter() - start
+
+        for table, count in counts.items():
+            self.stdout.write(f"  {table:<28} {count:>12}")
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {total} rows for {len(source_keys)} sources in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)."))
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from clientUpdates.utils.claims_import import (CLAIM_TABLES, SOURCE_STATE_TABLES, IMPORT_MODES, ClaimImportError,
+                                               read_import_rows, import_claim_rows)
+from clientUpdates.utils.pws_profile import invalidate_pws_profiles_for_pwsids
+from clientUpdates.utils.source_state import rebuild_source_state
+from clientUpdates.utils.synthetic_data import COPY_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = ("Import a claims portal export (CSV or newline-delimited JSON, optionally gzipped) into a claim table. "
+            "Rows are validated, staged with COPY and swapped into the live table in one transaction. "
+            "Run recompute_scores afterwards to update the EH&E scores.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=CLAIM_TABLES)
+        parser.add_argument('path', help="Export file (.csv, .ndjson or .jsonl, optionally .gz).")
+        parser.add_argument('--format', choices=('csv', 'ndjson'), help="File format (default: from the extension).")
+        parser.add_argument('--mode', choices=IMPORT_MODES, default='merge',
+                            help="merge replaces the rows of the PWSIDs in the export; replace the whole table.")
+        parser.add_argument('--max-errors', type=int, default=0,
+                            help="Number of invalid rows skipped before the import is aborted.")
+        parser.add_argument('--batch-size', type=int, default=COPY_BATCH_SIZE, help="Rows per COPY batch.")
+        parser.add_argument('--dry-run', action='store_true', help="Validate the export without importing it.")
+        parser.add_argument('--skip-state', action='store_true',
+                            help="Don't rebuild source_current_state for the imported PWSIDs.")
+
+    def handle(self, *args, **options):
+        table, mode = options['table'], options['mode']
+        start = time.perf_counter()
+        try:
+            result = import_claim_rows(table, read_import_rows(options['path'], options['format']), mode=mode,
+                                       max_errors=options['max_errors'], batch_size=options['batch_size'],
+                                       dry_run=options['dry_run'])
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        except ClaimImportError as e:
+            for error in e.errors:
+                self.stderr.write(error)
+            raise CommandError(e)
+
+        for error in result.errors:
+            self.stderr.write(error)
+        if result.n_errors:
+            self.stdout.write(self.style.WARNING(f"Skipped {result.n_errors} invalid rows."))
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"Validated {result.rows} rows for {len(result.pwsids)} PWSIDs; "
+                                                 "nothing was imported."))
+            return
+
+        self.stdout.write(f"Imported {result.rows} rows for {len(result.pwsids)} PWSIDs into {table}, "
+                          f"replacing {result.deleted}, in {time.perf_counter() - start:.1f}s.")
+
+        pwsids = None if mode == 'replace' else result.pwsids
+        if table in SOURCE_STATE_TABLES and not options['skip_state']:
+            n_states = rebuild_source_state(pwsids)
+            self.stdout.write(f"Rebuilt current state for {n_states} sources.")
+        invalidate_pws_profiles_for_pwsids(pwsids)
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.1f}s."))
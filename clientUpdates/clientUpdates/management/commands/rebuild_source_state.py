@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from clientUpdates.utils.source_state import rebuild_source_state
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the source_current_state table from the claim and update tables. "
+            "Run after the claim tables are refreshed from the claims portal.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('pwsids', nargs='*',
+                            help="PWSIDs to rebuild. Rebuilds every source when omitted.")
+
+    def handle(self, *args, **options):
+        n_states = rebuild_source_state(options['pwsids'] or None)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt current state for {n_states} sources."))
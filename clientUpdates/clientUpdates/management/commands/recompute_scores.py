@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from clientUpdates.utils.updates import bulk_update_ehe_source_table, bulk_update_ehe_pws_table, BULK_UPDATE_BATCH_SIZE
+
+logger = logging.getLogger('clientUpdates')
+
+
+class Command(BaseCommand):
+    help = "Recompute PFAS scores, AFRs, base scores and GFEs in the EH&E Source and Pws tables in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument('pwsids', nargs='*',
+                            help="PWSIDs to recompute. Recomputes every source when omitted.")
+        parser.add_argument('--batch-size', type=int, default=BULK_UPDATE_BATCH_SIZE,
+                            help="Number of rows written per UPDATE batch.")
+        parser.add_argument('--skip-pws', action='store_true',
+                            help="Only recompute the Source table, not the aggregated Pws GFEs.")
+        parser.add_argument('--from-state', action='store_true',
+                            help="Read score inputs from the source_current_state table instead of the claim and update tables.")
+
+    def handle(self, *args, **options):
+        pwsids = options['pwsids'] or None
+        batch_size = options['batch_size']
+        start = time.monotonic()
+
+        n_sources = bulk_update_ehe_source_table(pwsids, batch_size=batch_size, from_state=options['from_state'])
+        logger.info(f"Recomputed {n_sources} sources in {time.monotonic() - start:.1f}s.")
+        self.stdout.write(f"Recomputed {n_sources} sources.")
+
+        if not options['skip_pws']:
+            n_pws = bulk_update_ehe_pws_table(pwsids, batch_size=batch_size)
+            logger.info(f"Recomputed GFE totals for {n_pws} PWS records.")
+            self.stdout.write(f"Recomputed GFE totals for {n_pws} PWS records.")
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.monotonic() - start:.1f}s."))
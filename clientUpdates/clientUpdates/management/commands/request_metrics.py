@@ -0,0 +1,37 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from clientUpdates.utils.request_metrics import load_request_metrics
+
+
+class Command(BaseCommand):
+    help = "Show request latency percentiles and query counts per URL name, merged across worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', default=settings.REQUEST_METRICS['directory'],
+                            help="Directory the metrics files are written to.")
+        parser.add_argument('--max-age', type=float, default=24,
+                            help="Ignore files of processes that haven't written metrics for this many hours.")
+        parser.add_argument('--sort', default='wall_ms_p95',
+                            help="Column to sort by, descending (e.g. count, wall_ms_p50, db_ms_p95, queries_mean).")
+        parser.add_argument('--json', action='store_true', help="Print the summary as JSON.")
+
+    def handle(self, *args, **options):
+        metrics = load_request_metrics(options['directory'], max_age_seconds=options['max_age'] * 3600)
+        if options['json']:
+            self.stdout.write(json.dumps(metrics, indent=2))
+            return
+        if not metrics:
+            self.stdout.write(f"No request metrics in {options['directory']}.")
+            return
+
+        columns = ['count', 'wall_ms_p50', 'wall_ms_p95', 'wall_ms_p99', 'db_ms_p50', 'db_ms_p95',
+                   'queries_mean', 'queries_max']
+        rows = sorted(metrics.items(), key=lambda item: item[1].get(options['sort'], 0), reverse=True)
+        width = max(len('url_name'), *(len(url_name) for url_name in metrics))
+        self.stdout.write(f"{'url_name':<{width}}  " + '  '.join(f'{column:>12}' for column in columns))
+        for url_name, summary in rows:
+            self.stdout.write(f"{url_name:<{width}}  " +
+                              '  '.join(f"{summary.get(column, ''):>12}" for column in columns))
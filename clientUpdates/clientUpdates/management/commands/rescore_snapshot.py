@@ -0,0 +1,42 @@
+import json
+
+import pyarrow.compute as pc
+from django.core.management.base import BaseCommand, CommandError
+
+from clientUpdates.utils.score_snapshot import read_score_snapshot, rescore_snapshot, compare_scores, write_partition
+from clientUpdates.utils.tables_utils import CLAIMS
+
+
+class Command(BaseCommand):
+    help = ("Reload a score snapshot, recompute its scores with the current scoring code and report how they differ "
+            "from the snapshot scores (the stored Source table scores for 3M/DuPont). The live database isn't touched.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory of a snapshot written by snapshot_scores.")
+        parser.add_argument('--claims', nargs='+', choices=CLAIMS, help="Claims to rescore (default: all).")
+        parser.add_argument('--output', help="Directory to write the rescored snapshot to.")
+        parser.add_argument('--json', action='store_true', help="Print the comparison as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            snapshot = read_score_snapshot(options['directory'], claims=options['claims'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read the snapshot in {options['directory']}: {e}")
+
+        comparisons = {}
+        for claim in sorted(set(snapshot['claim'].to_pylist())):
+            before = snapshot.filter(pc.equal(snapshot['claim'], claim))
+            after = rescore_snapshot(before)
+            comparisons[claim] = compare_scores(before, after)
+            if options['output']:
+                write_partition(after.drop_columns(['claim']), options['output'], claim, overwrite=True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(comparisons, indent=2))
+            return
+        for claim, comparison in comparisons.items():
+            self.stdout.write(f"claim={claim}")
+            for column, change in comparison.items():
+                self.stdout.write(f"  {column:<20} changed {change['changed']:>8}  max change "
+                                  f"{change['max_abs_change']:>12.4g}  total {change['total_before']:>14.2f} -> "
+                                  f"{change['total_after']:>14.2f}")
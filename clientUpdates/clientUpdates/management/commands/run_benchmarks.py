@@ -0,0 +1,95 @@
+import json
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from clientUpdates.benchmarks.cases import BENCHMARKS, BenchmarkContext
+from clientUpdates.benchmarks.runner import run_benchmark, benchmark_report, compare_reports
+from clientUpdates.benchmarks.seed import SCALES, PWSID_PREFIX, seed_benchmark_data
+from clientUpdates.utils.pws_profile import invalidate_pws_profiles
+
+
+class Rollback(Exception):
+    """ Raised to discard the synthetic rows once the benchmarks are done. """
+
+
+class Command(BaseCommand):
+    help = ("Seed a synthetic dataset and benchmark the scoring and page hot paths, reporting latency percentiles, "
+            "query counts and peak memory to a JSON file. The synthetic rows are rolled back afterwards unless --keep.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='1k', help="Number of synthetic sources.")
+        parser.add_argument('--sources', type=int, help="Number of synthetic sources (overrides --scale).")
+        parser.add_argument('--samples', type=int, default=50, help="Number of sources each benchmark runs on.")
+        parser.add_argument('--repeat', type=int, default=1, help="Number of passes over the sampled sources.")
+        parser.add_argument('--updates-per-source', type=int, default=2,
+                            help="Average number of PFAS result and of flow rate updates seeded per source.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help="Benchmarks to run (default: all).")
+        parser.add_argument('--output', default='benchmark_results.json', help="JSON file the results are written to.")
+        parser.add_argument('--compare', help="JSON results of a previous run to compare against.")
+        parser.add_argument('--keep', action='store_true', help="Commit the synthetic rows instead of rolling them back.")
+        parser.add_argument('--no-seed', action='store_true',
+                            help=f"Benchmark the {PWSID_PREFIX}* sources kept by a previous --keep run instead of seeding.")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read {options['compare']}: {e}")
+
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                report = self.run(**options)
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Synthetic rows rolled back.")
+
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+
+        if baseline:
+            self.stdout.write(f"Compared to {options['compare']} ({baseline.get('git_commit')}):")
+            for name, metric, old, new, change in compare_reports(report, baseline):
+                change = f"{change:+.1%}" if change is not None else 'n/a'
+                self.stdout.write(f"  {name:<28} {metric:<16} {old:>10} -> {new:>10}  {change}")
+
+    def run(self, scale, sources, samples, repeat, updates_per_source, seed, only, no_seed, **options):
+        from clientUpdates.models import ClaimSource
+
+        n_sources = sources or SCALES[scale]
+        if no_seed:
+            source_keys = list(ClaimSource.objects.filter(pwsid__startswith=PWSID_PREFIX)
+                               .order_by('pwsid', 'source_name').values_list('pwsid', 'source_name'))
+            if not source_keys:
+                raise CommandError(f"No {PWSID_PREFIX}* sources found; run with --keep first.")
+            n_sources = len(source_keys)
+        else:
+            self.stdout.write(f"Seeding {n_sources} sources...")
+            start = time.perf_counter()
+            source_keys, counts = seed_benchmark_data(n_sources, seed=seed, updates_per_source=updates_per_source)
+            self.stdout.write(f"Seeded {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s.")
+
+        sample_keys = random.Random(seed).sample(source_keys, min(samples, len(source_keys)))
+        context = BenchmarkContext(sample_keys)
+
+        results = {}
+        for name in only or BENCHMARKS:
+            results[name] = result = run_benchmark(BENCHMARKS[name], context, sample_keys, repeat=repeat)
+            self.stdout.write(f"{name:<28} p50 {result['wall_ms_p50']:>8.2f} ms  p95 {result['wall_ms_p95']:>8.2f} ms  "
+                              f"queries {result['queries_mean']:>6.1f}  peak {result['peak_memory_kib']:>9.1f} KiB")
+
+        # Logged-in benchmark users may have their (rolled back) profiles cached
+        invalidate_pws_profiles(list(context.clients))
+
+        return benchmark_report(results, sources=n_sources, samples=len(sample_keys), repeat=repeat,
+                                updates_per_source=updates_per_source, seed=seed)
@@ -0,0 +1,71 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from clientUpdates.utils.jobs import claim_next_job, run_job, run_pending_jobs
+
+logger = logging.getLogger('clientUpdates')
+
+
+class Command(BaseCommand):
+    help = "Run background jobs (source recomputes, Dropbox uploads) from the background_job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.BACKGROUND_JOBS['workers'],
+                            help="Number of worker threads.")
+        parser.add_argument('--once', action='store_true',
+                            help="Run the jobs that are currently due and exit instead of polling.")
+
+    def handle(self, *args, **options):
+        if options['once']:
+            n_jobs = run_pending_jobs()
+            self.stdout.write(self.style.SUCCESS(f"Ran {n_jobs} job(s)."))
+            return
+
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # gunicorn, systemd and Ctrl-C: let the workers finish their running job instead of leaving it locked
+            logger.info(f"Received {signal.Signals(signum).name}, stopping background job workers after their "
+                        f"running jobs...")
+            stop.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        workers = [threading.Thread(target=self.work, args=(stop,), name=f"job-worker-{i}", daemon=True)
+                   for i in range(options['workers'])]
+        for worker in workers:
+            worker.start()
+        logger.info(f"Started {len(workers)} background job worker(s).")
+
+        while not stop.is_set():
+            stop.wait(1)
+        for worker in workers:
+            worker.join()
+        logger.info("Background job workers stopped.")
+
+    def work(self, stop):
+        poll_interval = settings.BACKGROUND_JOBS['poll_interval_seconds']
+        try:
+            while not stop.is_set():
+                close_old_connections()
+                try:
+                    job = claim_next_job()
+                    if job is not None:
+                        run_job(job)
+                except Exception:
+                    # E.g. the database went away while claiming a job or saving its status. The worker keeps
+                    # going; a job left running is picked up again once it is stale.
+                    logger.exception("Error in background job worker")
+                    connection.close()
+                    job = None
+
+                if job is None:
+                    stop.wait(poll_interval)
+        finally:
+            connection.close()
@@ -0,0 +1,91 @@
+import atexit
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .utils.request_metrics import QueryTimer, RequestMetrics
+
+logger = logging.getLogger('clientUpdates')
+
+
+class DebugHeadersMiddleware:
+    """
+    Measures the wall time, database time and query count of every request.
+
+    - Adds a Server-Timing header (total, db and app time) to the response, except to streaming responses,
+      which are measured until the stream is closed.
+    - Logs requests slower than REQUEST_METRICS['slow_request_ms'] as warnings.
+    - Keeps per-URL-name samples, written with their percentiles to REQUEST_METRICS['directory']
+      (see utils.request_metrics and the request_metrics management command).
+
+    Should be the first entry of MIDDLEWARE, so the queries of the other middleware (e.g. session saves)
+    are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = settings.REQUEST_METRICS
+        self.metrics = RequestMetrics(self.config['directory'], self.config['sample_size'],
+                                      self.config['flush_interval_seconds'])
+        atexit.register(self.metrics.flush)
+
+    def __call__(self, request):
+        query_timer = QueryTimer()
+        start = time.perf_counter()
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(query_timer))
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            stack.close()
+            raise
+
+        if response.streaming:
+            # The body of a streaming response (e.g. a CSV export) is produced while the server sends it, after
+            # this returns: keep counting its queries and record the request once the stream is closed
+            response.streaming_content = self.record_when_closed(response.streaming_content, stack, request,
+                                                                 query_timer, start)
+            return response
+
+        stack.close()
+        wall_ms, db_ms = self.record(request, query_timer, start)
+        if self.config['server_timing_header']:
+            # Not added to streaming responses, whose headers are sent before the timings are known
+            response['Server-Timing'] = (f'total;dur={wall_ms:.1f}, '
+                                         f'db;dur={db_ms:.1f};desc="{query_timer.count} queries", '
+                                         f'app;dur={wall_ms - db_ms:.1f}')
+        return response
+
+    def record_when_closed(self, streaming_content, stack, request, query_timer, start):
+        # The response closes this generator (WSGI close()), whether or not it was read to the end
+        try:
+            yield from streaming_content
+        finally:
+            stack.close()
+            self.record(request, query_timer, start)
+
+    def record(self, request, query_timer, start):
+        """ Record the timings of a request and log it if it was slow. Returns (wall_ms, db_ms). """
+        wall_ms = (time.perf_counter() - start) * 1000
+        db_ms = query_timer.duration * 1000
+
+        url_name = request.resolver_match.view_name if request.resolver_match else 'unresolved'
+        self.metrics.record(url_name, round(wall_ms, 1), round(db_ms, 1), query_timer.count)
+
+        if wall_ms >= self.config['slow_request_ms']:
+            user = getattr(request, 'user', None)
+            logger.warning(
+                f"Slow request: {request.method} {request.path} ({url_name}) took {wall_ms:.0f} ms, "
+                f"{query_timer.count} queries in {db_ms:.0f} ms.",
+                extra={
+                    'pwsid': user.username if user is not None and user.is_authenticated else None,
+                    'url_name': url_name,
+                    'duration_ms': round(wall_ms, 1),
+                    'db_duration_ms': round(db_ms, 1),
+                    'query_count': query_timer.count,
+                })
+        return wall_ms, db_ms
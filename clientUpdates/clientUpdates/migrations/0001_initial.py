@@ -0,0 +1,1033 @@
+# Generated by Django 4.1 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, unique=True)),
+            ],
+            options={
+                'db_table': 'auth_group',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthGroupPermissions',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'auth_group_permissions',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthPermission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('codename', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'auth_permission',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128)),
+                ('last_login', models.DateTimeField(blank=True, null=True)),
+                ('is_superuser', models.BooleanField()),
+                ('username', models.CharField(max_length=150, unique=True)),
+                ('first_name', models.CharField(max_length=150)),
+                ('last_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=254)),
+                ('is_staff', models.BooleanField()),
+                ('is_active', models.BooleanField()),
+                ('date_joined', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'auth_user',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthUserGroups',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'auth_user_groups',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthUserUserPermissions',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'db_table': 'auth_user_user_permissions',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoAdminLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action_time', models.DateTimeField()),
+                ('object_id', models.TextField(blank=True, null=True)),
+                ('object_repr', models.CharField(max_length=200)),
+                ('action_flag', models.SmallIntegerField()),
+                ('change_message', models.TextField()),
+            ],
+            options={
+                'db_table': 'django_admin_log',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoContentType',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('app_label', models.CharField(max_length=100)),
+                ('model', models.CharField(max_length=100)),
+            ],
+            options={
+                'db_table': 'django_content_type',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoMigrations',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('app', models.CharField(max_length=255)),
+                ('name', models.CharField(max_length=255)),
+                ('applied', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'django_migrations',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DjangoSession',
+            fields=[
+                ('session_key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('session_data', models.TextField()),
+                ('expire_date', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'django_session',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimDocumentInfo',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('water_system_id', models.FloatField(blank=True, null=True)),
+                ('water_system_name', models.TextField(blank=True, null=True)),
+                ('object_type_attached_to', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('law_firm_3rd_party_representative', models.TextField(blank=True, null=True)),
+                ('test_result_date', models.DateField(blank=True, null=True)),
+                ('entity_document_file_id', models.FloatField(blank=True, null=True)),
+                ('entity_document_id', models.FloatField(blank=True, null=True)),
+                ('doc_reference', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('file_size', models.TextField(blank=True, null=True)),
+                ('document_purpose', models.TextField(blank=True, null=True)),
+                ('date_uploaded', models.DateField(blank=True, null=True)),
+                ('content_type', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+            ],
+            options={
+                'db_table': 'claim_document_info',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimFlowRate',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('water_source_id', models.FloatField(blank=True, null=True)),
+                ('year', models.FloatField(blank=True, null=True)),
+                ('flow_rate_reduced', models.BooleanField(blank=True, null=True)),
+                ('did_not_exist', models.BooleanField(blank=True, null=True)),
+                ('flow_rate', models.FloatField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('flow_rate_gpm', models.FloatField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('source_variable', models.TextField(blank=True, null=True)),
+                ('max_flow_rate_explanation', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+            ],
+            options={
+                'db_table': 'claim_flow_rate',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimPfasResult',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('water_source_id', models.TextField(blank=True, null=True)),
+                ('analyte', models.TextField(blank=True, null=True)),
+                ('result_ppt', models.FloatField(blank=True, null=True)),
+                ('lab_sample_id', models.TextField(blank=True, null=True)),
+                ('doc_reference', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('result', models.TextField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('sampling_date', models.DateField(blank=True, null=True)),
+                ('company_of_person_who_took_sample', models.TextField(blank=True, null=True)),
+                ('analysis_date', models.DateField(blank=True, null=True)),
+                ('analysis_method', models.TextField(blank=True, null=True)),
+                ('lab', models.TextField(blank=True, null=True)),
+                ('lab_street_address', models.TextField(blank=True, null=True)),
+                ('lab_city', models.TextField(blank=True, null=True)),
+                ('lab_state', models.TextField(blank=True, null=True)),
+                ('lab_zip', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+                ('all_nds', models.BooleanField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'claim_pfas_result',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimPws',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('law_firm_3rd_party_representative', models.TextField(blank=True, null=True)),
+                ('certification_cst_3m', models.TextField(blank=True, null=True)),
+                ('certification_cst_dupont', models.TextField(blank=True, null=True)),
+                ('certification_hst_3m', models.TextField(blank=True, null=True)),
+                ('certification_hst_dupont', models.TextField(blank=True, null=True)),
+                ('postmark_date_3m', models.FloatField(blank=True, null=True)),
+                ('postmark_date_dupont', models.FloatField(blank=True, null=True)),
+                ('not_participating_3m', models.TextField(blank=True, null=True)),
+                ('not_participating_dupont', models.FloatField(blank=True, null=True)),
+                ('claim_status', models.TextField(blank=True, null=True)),
+                ('cc_a_is_3m', models.BooleanField(blank=True, null=True)),
+                ('cc_b_active_and_needs_testing_3m', models.BooleanField(blank=True, null=True)),
+                ('cc_c_is_dupont', models.BooleanField(blank=True, null=True)),
+                ('cc_d_active_and_needs_testing_dupont', models.BooleanField(blank=True, null=True)),
+                ('address_1', models.TextField(blank=True, null=True)),
+                ('address_2', models.TextField(blank=True, null=True)),
+                ('city', models.TextField(blank=True, null=True)),
+                ('state', models.TextField(blank=True, null=True)),
+                ('zip', models.TextField(blank=True, null=True)),
+                ('entity_lookup', models.TextField(blank=True, null=True)),
+                ('pws_w9_filename', models.TextField(blank=True, null=True)),
+                ('has_lawsuit', models.BooleanField(blank=True, null=True)),
+                ('has_lawsuit_pending_mdl', models.BooleanField(blank=True, null=True)),
+                ('lawsuit_court_name', models.TextField(blank=True, null=True)),
+                ('lawsuit_case_number', models.TextField(blank=True, null=True)),
+                ('litigation_filing_date', models.TextField(blank=True, null=True)),
+                ('complaint_petition_filename', models.TextField(blank=True, null=True)),
+                ('has_attorney_representation', models.BooleanField(blank=True, null=True)),
+                ('test_ucmr', models.BooleanField(blank=True, null=True)),
+                ('test_state', models.BooleanField(blank=True, null=True)),
+                ('conn15', models.BooleanField(blank=True, null=True)),
+                ('residents25', models.BooleanField(blank=True, null=True)),
+                ('fewer_than_3300_people', models.BooleanField(blank=True, null=True)),
+                ('usa', models.BooleanField(blank=True, null=True)),
+                ('ownedbygov', models.BooleanField(blank=True, null=True)),
+                ('pws_sdwis_code', models.TextField(blank=True, null=True)),
+                ('sdwis_sf_sue', models.BooleanField(blank=True, null=True)),
+                ('sdwis_p_type', models.TextField(blank=True, null=True)),
+                ('pws_facility_activity_code', models.TextField(blank=True, null=True)),
+                ('sdwis_activity_code', models.TextField(blank=True, null=True)),
+                ('total_ground_sources', models.TextField(blank=True, null=True)),
+                ('total_ground_sources_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_ground_sources_ucmr5_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_ground_sources_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_ground_sources_ucmr5_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_sw_sources', models.TextField(blank=True, null=True)),
+                ('total_sw_sources_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_sw_sources_ucmr5_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_sw_sources_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_sw_sources_ucmr5_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('has_other_sources', models.BooleanField(blank=True, null=True)),
+                ('other_sources_description', models.TextField(blank=True, null=True)),
+                ('total_other_sources', models.TextField(blank=True, null=True)),
+                ('total_other_sources_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_other_sources_ucmr5_tested_with_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_other_sources_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('total_other_sources_ucmr5_tested_without_pfas', models.BooleanField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('in_consortium', models.BooleanField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+            ],
+            options={
+                'db_table': 'claim_pws',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimSource',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('water_source_id', models.FloatField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('is_part_of_idws', models.BooleanField(blank=True, null=True)),
+                ('is_idws_cooperating', models.BooleanField(blank=True, null=True)),
+                ('is_idws_responsible_pfas', models.BooleanField(blank=True, null=True)),
+                ('partner_name', models.TextField(blank=True, null=True)),
+                ('partner_pwsid', models.TextField(blank=True, null=True)),
+                ('idws_partner_relationship', models.TextField(blank=True, null=True)),
+                ('claimed_share_percent', models.FloatField(blank=True, null=True)),
+                ('source_type', models.TextField(blank=True, null=True)),
+                ('source_type_other', models.TextField(blank=True, null=True)),
+                ('pws_owns_source', models.BooleanField(blank=True, null=True)),
+                ('source_co_owned', models.BooleanField(blank=True, null=True)),
+                ('pws_operates_source', models.BooleanField(blank=True, null=True)),
+                ('source_operated_by', models.BooleanField(blank=True, null=True)),
+                ('pws_purchased', models.BooleanField(blank=True, null=True)),
+                ('source_original_pwsid', models.TextField(blank=True, null=True)),
+                ('pws_drinking_water', models.BooleanField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+                ('all_nds', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'claim_source',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ClaimSubmission',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('x3m_dupont_claim', models.BooleanField(blank=True, null=True)),
+                ('tyco_basf_claim', models.BooleanField(blank=True, null=True)),
+                ('any_claim_submission', models.BooleanField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'claim_submissions',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='DropboxLinks',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('url_file_request', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'dropbox_links',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='EurofinsReportsFilenames',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('excel_name', models.TextField(blank=True, null=True)),
+                ('eurofins_id', models.TextField(blank=True, null=True)),
+                ('pdf_name', models.TextField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('file_path', models.TextField(blank=True, null=True)),
+                ('cat', models.TextField(blank=True, null=True)),
+                ('results_cat', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'eurofins_reports_filenames',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='FlowRate',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('water_source_id', models.BigIntegerField(blank=True, null=True)),
+                ('submit_date', models.DateTimeField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('sample_id', models.TextField(blank=True, null=True)),
+                ('year', models.FloatField(blank=True, null=True)),
+                ('flow_rate', models.FloatField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('flow_rate_reduced', models.BooleanField(blank=True, null=True)),
+                ('source_variable', models.TextField(blank=True, null=True)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('method', models.TextField(blank=True, null=True)),
+                ('flow_rate_gpm', models.FloatField(blank=True, null=True)),
+                ('flag', models.BooleanField(blank=True, null=True)),
+                ('ehe_comments', models.TextField(blank=True, null=True)),
+                ('system_gswc', models.TextField(blank=True, null=True)),
+                ('gswc_loc', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('sample_id_from', models.TextField(blank=True, null=True)),
+                ('filename', models.FileField(blank=True, null=True, upload_to='uploads/')),
+                ('dms_initials', models.TextField(blank=True, null=True)),
+                ('rm_row', models.FloatField(blank=True, null=True)),
+                ('qc_flag', models.TextField(blank=True, null=True)),
+                ('updated_by_water_provider', models.BooleanField(default=False)),
+                ('data_origin', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'flow_rate',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='paymentInfo',
+            fields=[
+                ('pwsid', models.TextField(primary_key=True, serialize=False)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('entity_name', models.TextField(blank=True, null=True)),
+                ('claim_number', models.IntegerField(blank=True, null=True)),
+                ('payment_method', models.TextField(blank=True, null=True)),
+                ('verification_name', models.TextField(blank=True, null=True)),
+                ('verification_email', models.TextField(blank=True, null=True)),
+                ('verification_number', models.TextField(blank=True, null=True)),
+                ('wire_account_name', models.TextField(blank=True, null=True)),
+                ('wire_account_number', models.TextField(blank=True, null=True)),
+                ('wire_routing_number', models.TextField(blank=True, null=True)),
+                ('wire_further_credit', models.TextField(blank=True, null=True)),
+                ('wire_client_address', models.TextField(blank=True, null=True)),
+                ('wire_client_city', models.TextField(blank=True, null=True)),
+                ('wire_client_state', models.TextField(blank=True, null=True)),
+                ('wire_client_zip', models.TextField(blank=True, null=True)),
+                ('wire_bank_name', models.TextField(blank=True, null=True)),
+                ('wire_bank_address', models.TextField(blank=True, null=True)),
+                ('wire_bank_city', models.TextField(blank=True, null=True)),
+                ('wire_bank_state', models.TextField(blank=True, null=True)),
+                ('wire_bank_zip', models.TextField(blank=True, null=True)),
+                ('check_payee_name', models.TextField(blank=True, null=True)),
+                ('check_addressed_to', models.TextField(blank=True, null=True)),
+                ('check_street_address', models.TextField(blank=True, null=True)),
+                ('check_city', models.TextField(blank=True, null=True)),
+                ('check_state', models.TextField(blank=True, null=True)),
+                ('check_zip', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'payment_information',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='PfasReportsFilenames',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('firm', models.TextField(blank=True, null=True)),
+                ('file_path', models.TextField(blank=True, null=True)),
+                ('client_group', models.TextField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('cat', models.TextField(blank=True, null=True)),
+                ('results_cat', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pfas_reports_filenames',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='PfasResult',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('water_source_id', models.BigIntegerField(blank=True, null=True)),
+                ('submit_date', models.DateTimeField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('sample_id', models.TextField(blank=True, null=True)),
+                ('sampling_date', models.DateField(blank=True, null=True)),
+                ('analyte', models.TextField(blank=True, null=True)),
+                ('result', models.TextField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('detected', models.BooleanField(blank=True, null=True)),
+                ('result_ppt', models.FloatField(blank=True, null=True)),
+                ('flag', models.BooleanField(blank=True, null=True)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('qc_flag', models.TextField(blank=True, null=True)),
+                ('analysis_method', models.TextField(blank=True, null=True)),
+                ('lab_sample_id', models.TextField(blank=True, null=True)),
+                ('lab', models.TextField(blank=True, null=True)),
+                ('cas_number', models.TextField(blank=True, null=True)),
+                ('mdl', models.FloatField(blank=True, null=True)),
+                ('rl', models.FloatField(blank=True, null=True)),
+                ('filename', models.FileField(blank=True, null=True, upload_to='uploads/')),
+                ('analysis_date', models.DateField(blank=True, null=True)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('dms_initials', models.TextField(blank=True, null=True)),
+                ('all_nds', models.BooleanField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('sample_id_from', models.TextField(blank=True, null=True)),
+                ('updated_by_water_provider', models.BooleanField(default=False)),
+                ('data_origin', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pfas_result',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='phase2AnnualFlow',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True)),
+                ('pws_name', models.TextField(blank=True)),
+                ('source_name', models.TextField(blank=True)),
+                ('year', models.IntegerField(blank=True, choices=[(2013, 2013), (2014, 2014), (2015, 2015), (2016, 2016), (2017, 2017), (2018, 2018), (2019, 2019), (2020, 2020), (2021, 2021), (2022, 2022), (2023, 2023), (2024, 2024), (2025, 2025)])),
+                ('flow_rate', models.FloatField(blank=True)),
+                ('flow_rate_reduced', models.TextField(blank=True)),
+                ('did_not_exist', models.TextField(blank=True)),
+                ('units', models.TextField(blank=True)),
+                ('file_name', models.TextField(blank=True)),
+                ('comments', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('draft_complete', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'phase2_annual_flow',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='phase2MaxFlow',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True)),
+                ('pws_name', models.TextField(blank=True)),
+                ('source_name', models.TextField(blank=True)),
+                ('flow_rate', models.FloatField(blank=True, null=True)),
+                ('units', models.TextField(blank=True)),
+                ('flow_determination', models.TextField(blank=True)),
+                ('file_name', models.TextField(blank=True, null=True)),
+                ('comments', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('draft_complete', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'phase2_max_flow',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='phase2PfasResults',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True)),
+                ('pws_name', models.TextField(blank=True)),
+                ('source_name', models.TextField(blank=True)),
+                ('analyte', models.TextField(blank=True, null=True)),
+                ('result', models.FloatField(blank=True, null=True)),
+                ('units', models.TextField(blank=True, null=True)),
+                ('sample_date', models.DateField(blank=True, null=True)),
+                ('file_name', models.TextField(blank=True)),
+                ('comments', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('draft_complete', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'phase2_pfas_results',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='phase2PwsInfo',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('ein', models.TextField(blank=True, null=True)),
+                ('facility_address', models.TextField(blank=True, null=True)),
+                ('facility_city', models.TextField(blank=True, null=True)),
+                ('facility_state', models.CharField(blank=True, choices=[('AL', 'Alabama'), ('AK', 'Alaska'), ('AS', 'American Samoa'), ('AZ', 'Arizona'), ('AR', 'Arkansas'), ('AA', 'Armed Forces Americas'), ('AE', 'Armed Forces Europe'), ('AP', 'Armed Forces Pacific'), ('CA', 'California'), ('CO', 'Colorado'), ('CT', 'Connecticut'), ('DE', 'Delaware'), ('DC', 'District of Columbia'), ('FL', 'Florida'), ('GA', 'Georgia'), ('GU', 'Guam'), ('HI', 'Hawaii'), ('ID', 'Idaho'), ('IL', 'Illinois'), ('IN', 'Indiana'), ('IA', 'Iowa'), ('KS', 'Kansas'), ('KY', 'Kentucky'), ('LA', 'Louisiana'), ('ME', 'Maine'), ('MD', 'Maryland'), ('MA', 'Massachusetts'), ('MI', 'Michigan'), ('MN', 'Minnesota'), ('MS', 'Mississippi'), ('MO', 'Missouri'), ('MT', 'Montana'), ('NE', 'Nebraska'), ('NV', 'Nevada'), ('NH', 'New Hampshire'), ('NJ', 'New Jersey'), ('NM', 'New Mexico'), ('NY', 'New York'), ('NC', 'North Carolina'), ('ND', 'North Dakota'), ('MP', 'Northern Mariana Islands'), ('OH', 'Ohio'), ('OK', 'Oklahoma'), ('OR', 'Oregon'), ('PA', 'Pennsylvania'), ('PR', 'Puerto Rico'), ('RI', 'Rhode Island'), ('SC', 'South Carolina'), ('SD', 'South Dakota'), ('TN', 'Tennessee'), ('TX', 'Texas'), ('UT', 'Utah'), ('VT', 'Vermont'), ('VI', 'Virgin Islands'), ('VA', 'Virginia'), ('WA', 'Washington'), ('WV', 'West Virginia'), ('WI', 'Wisconsin'), ('WY', 'Wyoming')], max_length=2, null=True)),
+                ('facility_zip', models.TextField(blank=True, null=True)),
+                ('mailing_address', models.TextField(blank=True, null=True)),
+                ('mailing_city', models.TextField(blank=True, null=True)),
+                ('mailing_state', models.CharField(blank=True, choices=[('AL', 'Alabama'), ('AK', 'Alaska'), ('AS', 'American Samoa'), ('AZ', 'Arizona'), ('AR', 'Arkansas'), ('AA', 'Armed Forces Americas'), ('AE', 'Armed Forces Europe'), ('AP', 'Armed Forces Pacific'), ('CA', 'California'), ('CO', 'Colorado'), ('CT', 'Connecticut'), ('DE', 'Delaware'), ('DC', 'District of Columbia'), ('FL', 'Florida'), ('GA', 'Georgia'), ('GU', 'Guam'), ('HI', 'Hawaii'), ('ID', 'Idaho'), ('IL', 'Illinois'), ('IN', 'Indiana'), ('IA', 'Iowa'), ('KS', 'Kansas'), ('KY', 'Kentucky'), ('LA', 'Louisiana'), ('ME', 'Maine'), ('MD', 'Maryland'), ('MA', 'Massachusetts'), ('MI', 'Michigan'), ('MN', 'Minnesota'), ('MS', 'Mississippi'), ('MO', 'Missouri'), ('MT', 'Montana'), ('NE', 'Nebraska'), ('NV', 'Nevada'), ('NH', 'New Hampshire'), ('NJ', 'New Jersey'), ('NM', 'New Mexico'), ('NY', 'New York'), ('NC', 'North Carolina'), ('ND', 'North Dakota'), ('MP', 'Northern Mariana Islands'), ('OH', 'Ohio'), ('OK', 'Oklahoma'), ('OR', 'Oregon'), ('PA', 'Pennsylvania'), ('PR', 'Puerto Rico'), ('RI', 'Rhode Island'), ('SC', 'South Carolina'), ('SD', 'South Dakota'), ('TN', 'Tennessee'), ('TX', 'Texas'), ('UT', 'Utah'), ('VT', 'Vermont'), ('VI', 'Virgin Islands'), ('VA', 'Virginia'), ('WA', 'Washington'), ('WV', 'West Virginia'), ('WI', 'Wisconsin'), ('WY', 'Wyoming')], max_length=2, null=True)),
+                ('mailing_zip', models.TextField(blank=True, null=True)),
+                ('primary_contact_name', models.TextField(blank=True, null=True)),
+                ('primary_contact_title', models.TextField(blank=True, null=True)),
+                ('primary_contact_telephone', models.TextField(blank=True, null=True)),
+                ('primary_contact_cell_phone', models.TextField(blank=True, null=True)),
+                ('primary_contact_email', models.TextField(blank=True, null=True)),
+                ('secondary_contact_name', models.TextField(blank=True, null=True)),
+                ('secondary_contact_title', models.TextField(blank=True, null=True)),
+                ('secondary_contact_telephone', models.TextField(blank=True, null=True)),
+                ('secondary_contact_cell_phone', models.TextField(blank=True, null=True)),
+                ('secondary_contact_email', models.TextField(blank=True, null=True)),
+                ('tertiary_contact_name', models.TextField(blank=True, null=True)),
+                ('tertiary_contact_title', models.TextField(blank=True, null=True)),
+                ('tertiary_contact_telephone', models.TextField(blank=True, null=True)),
+                ('tertiary_contact_cell_phone', models.TextField(blank=True, null=True)),
+                ('tertiary_contact_email', models.TextField(blank=True, null=True)),
+                ('ucmr5_required', models.TextField(blank=True, null=True)),
+                ('pfas_required_state', models.TextField(blank=True, null=True)),
+                ('connections_15', models.TextField(blank=True, null=True)),
+                ('residents_25', models.TextField(blank=True, null=True)),
+                ('pop_fewer_3300_062223', models.TextField(blank=True, null=True)),
+                ('pop_fewer_3300_063023', models.TextField(blank=True, null=True)),
+                ('pop_fewer_3300_051524', models.TextField(blank=True, null=True)),
+                ('pws_in_usa', models.TextField(blank=True, null=True)),
+                ('pws_owned_state_fed', models.TextField(blank=True, null=True)),
+                ('sdwis_owner_code', models.TextField(blank=True, null=True)),
+                ('sdwis_private_type', models.TextField(blank=True, null=True)),
+                ('sdwis_statefed_sue', models.TextField(blank=True, null=True)),
+                ('sdwis_facility_code', models.TextField(blank=True, null=True)),
+                ('sdwis_activity_code', models.TextField(blank=True, null=True)),
+                ('pfas_detected_06222023', models.TextField(blank=True, null=True)),
+                ('pfas_detected_06302023', models.TextField(blank=True, null=True)),
+                ('pfas_detected_05152024', models.TextField(blank=True, null=True)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('draft_complete', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'phase2_pws_info',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='phase2SourceInfo',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True)),
+                ('pws_name', models.TextField(blank=True)),
+                ('source_name', models.TextField(blank=True)),
+                ('source_type', models.TextField(blank=True)),
+                ('source_type_other', models.TextField(blank=True)),
+                ('pws_owns_source', models.TextField(blank=True)),
+                ('source_co_owned', models.TextField(blank=True)),
+                ('co_owner_pwsid', models.TextField(blank=True)),
+                ('co_owner_explained', models.TextField(blank=True)),
+                ('pws_operates_source', models.TextField(blank=True)),
+                ('other_operates_source', models.TextField(blank=True)),
+                ('pws_purchased', models.TextField(blank=True)),
+                ('purchased_water_from', models.TextField(blank=True)),
+                ('pws_drinking_water', models.TextField(blank=True)),
+                ('is_part_of_idws', models.TextField(blank=True)),
+                ('idws_explanation', models.TextField(blank=True)),
+                ('pfas_ever_tested', models.TextField(blank=True)),
+                ('pfas_detected', models.TextField(blank=True)),
+                ('detected_b4_jun2223', models.TextField(blank=True)),
+                ('detected_after_jun2223', models.TextField(blank=True)),
+                ('detected_b4_jun3023', models.TextField(blank=True)),
+                ('detected_after_jun3023', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('draft_complete', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'phase2_source_info',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductionDataFilenames',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('firm', models.TextField(blank=True, null=True)),
+                ('file_path', models.TextField(blank=True, null=True)),
+                ('client_group', models.TextField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('cat', models.TextField(blank=True, null=True)),
+                ('results_cat', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'production_data_filenames',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='Pws',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.CharField(max_length=9, unique=True)),
+                ('gfe_3m', models.FloatField(blank=True, db_column='gfe_3M', null=True)),
+                ('gfe_dupont', models.FloatField(blank=True, db_column='gfe_Dupont', null=True)),
+                ('gfe_total', models.FloatField(blank=True, null=True)),
+                ('gfe_basf', models.FloatField(blank=True, db_column='gfe_BASF', null=True)),
+                ('gfe_tyco', models.FloatField(blank=True, null=True)),
+                ('gfe_total_basf_tyco', models.FloatField(blank=True, null=True)),
+                ('submit_date', models.DateTimeField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('test_ucmr5', models.BooleanField(blank=True, null=True)),
+                ('test_state', models.BooleanField(blank=True, null=True)),
+                ('conn15', models.BooleanField(blank=True, null=True)),
+                ('residents25', models.BooleanField(blank=True, null=True)),
+                ('x3m_3300', models.BooleanField(blank=True, null=True)),
+                ('dupont_3300', models.BooleanField(blank=True, null=True)),
+                ('usa', models.BooleanField(blank=True, null=True)),
+                ('ownedbygov', models.BooleanField(blank=True, null=True)),
+                ('pws_sdwis_code', models.TextField(blank=True, null=True)),
+                ('sdwis_p_type', models.TextField(blank=True, null=True)),
+                ('sdwis_sf_sue', models.TextField(blank=True, null=True)),
+                ('sdwis_activity_code', models.TextField(blank=True, null=True)),
+                ('pws_source_count_gw_count', models.TextField(blank=True, null=True)),
+                ('pws_source_count_sw_count', models.TextField(blank=True, null=True)),
+                ('pws_source_count_other_count', models.TextField(blank=True, null=True)),
+                ('pws_3m_june', models.BooleanField(blank=True, null=True)),
+                ('pws_dupont_june', models.BooleanField(blank=True, null=True)),
+                ('eurofins_permissions', models.BooleanField(blank=True, null=True)),
+                ('estimate_made', models.BooleanField(blank=True, null=True)),
+                ('estimate_documents_estimate_doc1', models.TextField(blank=True, null=True)),
+                ('pws_comment', models.TextField(blank=True, null=True)),
+                ('ehe_password', models.TextField(blank=True, null=True)),
+                ('special_needs', models.TextField(blank=True, null=True)),
+                ('form_type', models.TextField(blank=True, null=True)),
+                ('workbook_completeness', models.TextField(blank=True, null=True)),
+                ('phase_3d', models.TextField(blank=True, null=True)),
+                ('phase_tb', models.TextField(blank=True, null=True)),
+                ('sl_client_number', models.FloatField(blank=True, null=True)),
+                ('pws_group', models.TextField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('retention_date', models.DateTimeField(blank=True, null=True)),
+                ('litigation_filing_date', models.DateTimeField(blank=True, null=True)),
+                ('signature_group', models.TextField(blank=True, null=True)),
+                ('firm', models.TextField(blank=True, null=True)),
+                ('firm_contact_name', models.TextField(blank=True, null=True)),
+                ('firm_email', models.TextField(blank=True, null=True)),
+                ('workbook_sent_date', models.DateTimeField(blank=True, null=True)),
+                ('firm_email_to_client_date', models.DateTimeField(blank=True, null=True)),
+                ('ehe_letter_sent_date', models.TextField(blank=True, null=True)),
+                ('form_userid', models.TextField(blank=True, null=True)),
+                ('form_pw', models.TextField(blank=True, null=True)),
+                ('gs_version_control', models.TextField(blank=True, null=True)),
+                ('data_entry_status', models.TextField(blank=True, null=True)),
+                ('form_entry_started', models.TextField(blank=True, null=True)),
+                ('final_opt_decision', models.TextField(blank=True, null=True)),
+                ('doc_letter', models.TextField(blank=True, null=True)),
+                ('letter_group', models.TextField(blank=True, null=True)),
+                ('total_in_group', models.IntegerField(blank=True, null=True)),
+                ('firm_clean', models.TextField(blank=True, null=True)),
+                ('pws_ein', models.TextField(blank=True, null=True)),
+                ('pfas_qc', models.BooleanField(blank=True, null=True)),
+                ('production_qc', models.BooleanField(blank=True, null=True)),
+                ('baseline_qc', models.BooleanField(blank=True, null=True)),
+                ('date_reviewed', models.DateField(blank=True, null=True)),
+                ('data_origin', models.TextField(blank=True, null=True)),
+                ('abs_3m', models.FloatField(blank=True, null=True)),
+                ('abs_dupont', models.FloatField(blank=True, null=True)),
+                ('gfe_3m_original', models.FloatField(blank=True, null=True)),
+                ('gfe_dupont_original', models.FloatField(blank=True, null=True)),
+                ('allocation_3m', models.FloatField(blank=True, null=True)),
+                ('allocation_dupont', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pws',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='PwsAddress',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('address', models.TextField(blank=True, null=True)),
+                ('city', models.TextField(blank=True, null=True)),
+                ('state', models.TextField(blank=True, null=True)),
+                ('zip', models.TextField(blank=True, null=True)),
+                ('address_type', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pws_address',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='PwsContact',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('contact_name', models.TextField(blank=True, null=True)),
+                ('contact_title', models.TextField(blank=True, null=True)),
+                ('contact_phone', models.TextField(blank=True, null=True)),
+                ('contact_cell', models.TextField(blank=True, null=True)),
+                ('contact_email', models.TextField(blank=True, null=True)),
+                ('contact_generalemail', models.TextField(blank=True, null=True)),
+                ('contact_type', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pws_contact',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='pwsCreds',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('username', models.TextField(blank=True, null=True)),
+                ('password', models.TextField(blank=True, null=True)),
+                ('consortium_firm', models.TextField(blank=True, null=True)),
+                ('date_of_retention', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'consortium_pws_creds',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='pwsPaymentDist',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('claim_id', models.IntegerField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('law_firm', models.TextField(blank=True, null=True)),
+                ('entity_name', models.TextField(blank=True, null=True)),
+                ('claim_type', models.TextField(blank=True, null=True)),
+                ('current_pws_total_abs', models.FloatField(blank=True, null=True)),
+                ('projected_net_dollars_per_abs_point_value', models.FloatField(blank=True, null=True)),
+                ('anticipated_total_net_settlement_award', models.FloatField(blank=True, null=True)),
+                ('actual_paid', models.FloatField(blank=True, null=True)),
+                ('remaining_balance', models.FloatField(blank=True, null=True)),
+                ('remaining_balance_per_abs_pt', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'pws_payment_dist',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='Source',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('water_source_id', models.BigIntegerField(blank=True, null=True)),
+                ('submit_date', models.DateTimeField(blank=True, null=True)),
+                ('pwsid', models.CharField(max_length=9)),
+                ('form_id', models.TextField(blank=True, null=True)),
+                ('sample_id', models.TextField(blank=True, null=True)),
+                ('source_type_other', models.TextField(blank=True, null=True)),
+                ('pws_owns_source', models.BooleanField(blank=True, null=True)),
+                ('pws_operates_source', models.BooleanField(blank=True, null=True)),
+                ('pws_purchased', models.BooleanField(blank=True, null=True)),
+                ('pws_drinking_water', models.BooleanField(blank=True, null=True)),
+                ('flow_provided', models.BooleanField(blank=True, null=True)),
+                ('no_flow_why', models.TextField(blank=True, null=True)),
+                ('provide_flow_future', models.BooleanField(blank=True, null=True)),
+                ('flow_2022_flow_rate_reduced_pfas', models.BooleanField(blank=True, null=True)),
+                ('pfas_results_available', models.BooleanField(blank=True, null=True)),
+                ('no_pfas_why', models.TextField(blank=True, null=True)),
+                ('provide_pfas_future', models.BooleanField(blank=True, null=True)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('include_form', models.BooleanField(blank=True, null=True)),
+                ('form_type', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('sample_id_from', models.TextField(blank=True, null=True)),
+                ('source_type', models.TextField(blank=True, null=True)),
+                ('source_status', models.TextField(blank=True, null=True)),
+                ('testing_recommendation', models.TextField(blank=True, null=True)),
+                ('testing_status', models.TextField(blank=True, null=True)),
+                ('comment', models.TextField(blank=True, null=True)),
+                ('include_sampling_loc', models.BooleanField(blank=True, null=True)),
+                ('file_source', models.BooleanField(blank=True, null=True)),
+                ('gswc_comments', models.TextField(blank=True, null=True)),
+                ('system_gswc', models.TextField(blank=True, null=True)),
+                ('gswc_loc', models.TextField(blank=True, null=True)),
+                ('afr', models.FloatField(blank=True, null=True)),
+                ('ehe_afr_note', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('pfas_score', models.FloatField(blank=True, null=True)),
+                ('pfas_score_method', models.TextField(blank=True, null=True)),
+                ('reg_bump', models.BooleanField(blank=True, null=True)),
+                ('all_nds', models.BooleanField(blank=True, null=True)),
+                ('hi_candidate', models.BooleanField(blank=True, null=True)),
+                ('ma6_candidate', models.BooleanField(blank=True, null=True)),
+                ('base_score', models.FloatField(blank=True, null=True)),
+                ('gfe_3m', models.FloatField(blank=True, db_column='gfe_3M', null=True)),
+                ('gfe_dupont', models.FloatField(blank=True, db_column='gfe_Dupont', null=True)),
+                ('gfe_total', models.FloatField(blank=True, null=True)),
+                ('gfe_basf', models.FloatField(blank=True, db_column='gfe_BASF', null=True)),
+                ('gfe_tyco', models.FloatField(blank=True, null=True)),
+                ('gfe_total_basf_tyco', models.FloatField(blank=True, null=True)),
+                ('data_origin', models.TextField(blank=True, null=True)),
+                ('abs_3m', models.FloatField(blank=True, null=True)),
+                ('abs_dupont', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'source',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='srcPaymentDist',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('fund_description', models.TextField(blank=True, null=True)),
+                ('batch_id', models.IntegerField(blank=True, null=True)),
+                ('batch_name', models.TextField(blank=True, null=True)),
+                ('claim_id', models.IntegerField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('water_source_id', models.BigIntegerField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('law_firm_id', models.IntegerField(blank=True, null=True)),
+                ('law_firm', models.TextField(blank=True, null=True)),
+                ('entity_id', models.IntegerField(blank=True, null=True)),
+                ('entity_name', models.TextField(blank=True, null=True)),
+                ('recipient_name', models.TextField(blank=True, null=True)),
+                ('batch_adjusted_base_score', models.TextField(blank=True, null=True)),
+                ('batch_dollars_per_abs_points', models.TextField(blank=True, null=True)),
+                ('payment_amount', models.FloatField(blank=True, null=True)),
+                ('payment_id', models.IntegerField(blank=True, null=True)),
+                ('payment_method', models.TextField(blank=True, null=True)),
+                ('total_transaction_value', models.FloatField(blank=True, null=True)),
+                ('payment_date', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'source_payment_dist',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='supplementalSourceTracker',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('claim', models.TextField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('all_nds', models.BooleanField(blank=True, null=True)),
+                ('reg_bump', models.BooleanField(blank=True, null=True)),
+                ('sup_notif_sent', models.BooleanField(blank=True, null=True)),
+                ('notif_datetime', models.DateTimeField(blank=True, null=True)),
+                ('sup_status', models.TextField(blank=True, null=True)),
+                ('completion_date', models.DateField(blank=True, null=True)),
+                ('file_name', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'supplemental_fund_source_tracker',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='TB_ClaimFlowRate',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('water_source_id', models.FloatField(blank=True, null=True)),
+                ('year', models.FloatField(blank=True, null=True)),
+                ('flow_rate_reduced', models.BooleanField(blank=True, null=True)),
+                ('did_not_exist', models.BooleanField(blank=True, null=True)),
+                ('flow_rate', models.FloatField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('flow_rate_gpm', models.FloatField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('source_variable', models.TextField(blank=True, null=True)),
+                ('max_flow_rate_explanation', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+                ('in_consortium', models.BooleanField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'claim_tb_flow_rate',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='TB_ClaimPfasResult',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('water_source_id', models.TextField(blank=True, null=True)),
+                ('water_source_determination', models.TextField(blank=True, null=True)),
+                ('analyte', models.TextField(blank=True, null=True)),
+                ('result_ppt', models.FloatField(blank=True, null=True)),
+                ('lab_sample_id', models.TextField(blank=True, null=True)),
+                ('doc_reference', models.TextField(blank=True, null=True)),
+                ('filename', models.TextField(blank=True, null=True)),
+                ('result', models.TextField(blank=True, null=True)),
+                ('unit', models.TextField(blank=True, null=True)),
+                ('sampling_date', models.DateField(blank=True, null=True)),
+                ('company_of_person_who_took_sample', models.TextField(blank=True, null=True)),
+                ('analysis_date', models.DateField(blank=True, null=True)),
+                ('analysis_method', models.TextField(blank=True, null=True)),
+                ('lab', models.TextField(blank=True, null=True)),
+                ('lab_street_address', models.TextField(blank=True, null=True)),
+                ('lab_city', models.TextField(blank=True, null=True)),
+                ('lab_state', models.TextField(blank=True, null=True)),
+                ('lab_zip', models.TextField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+                ('all_nds', models.BooleanField(blank=True, null=True)),
+                ('in_consortium', models.BooleanField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'claim_tb_pfas_result',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='TB_ClaimSource',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('claim_number', models.FloatField(blank=True, null=True)),
+                ('pwsid', models.TextField(blank=True, null=True)),
+                ('pws_name', models.TextField(blank=True, null=True)),
+                ('needs_recalculation', models.TextField(blank=True, null=True)),
+                ('water_source_id', models.FloatField(blank=True, null=True)),
+                ('source_name', models.TextField(blank=True, null=True)),
+                ('water_source_determination', models.FloatField(blank=True, null=True)),
+                ('source_type', models.TextField(blank=True, null=True)),
+                ('source_type_other', models.TextField(blank=True, null=True)),
+                ('pws_owns_source', models.BooleanField(blank=True, null=True)),
+                ('source_co_owned', models.BooleanField(blank=True, null=True)),
+                ('pws_operates_source', models.BooleanField(blank=True, null=True)),
+                ('source_operated_by', models.BooleanField(blank=True, null=True)),
+                ('pws_purchased', models.BooleanField(blank=True, null=True)),
+                ('source_original_pwsid', models.TextField(blank=True, null=True)),
+                ('pws_drinking_water', models.BooleanField(blank=True, null=True)),
+                ('is_part_of_idws', models.BooleanField(blank=True, null=True)),
+                ('is_idws_cooperating', models.BooleanField(blank=True, null=True)),
+                ('is_idws_responsible_pfas', models.BooleanField(blank=True, null=True)),
+                ('partner_name', models.TextField(blank=True, null=True)),
+                ('partner_pwsid', models.TextField(blank=True, null=True)),
+                ('idws_partner_relationship', models.TextField(blank=True, null=True)),
+                ('claimed_share_percent', models.FloatField(blank=True, null=True)),
+                ('all_nds', models.BooleanField(default=False)),
+                ('in_consortium', models.BooleanField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(blank=True, null=True)),
+                ('data_origin', models.TextField(default='Claims Portal')),
+            ],
+            options={
+                'db_table': 'claim_tb_source',
+                'managed': True,
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.1 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+from clientUpdates.utils.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # The indexes are built with CREATE INDEX CONCURRENTLY, so the claim and update tables stay writable;
+    # that can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('clientUpdates', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='claimflowrate',
+            index=models.Index(fields=['pwsid', 'source_name', 'source_variable', 'year'], name='claim_flow_rate_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='claimpfasresult',
+            index=models.Index(fields=['pwsid', 'source_name', 'analyte'], name='claim_pfas_result_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='claimsource',
+            index=models.Index(fields=['pwsid', 'source_name'], name='claim_source_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='flowrate',
+            index=models.Index(condition=models.Q(('updated_by_water_provider', True)), fields=['pwsid', 'source_name', 'source_variable', 'year', '-submit_date'], name='flow_rate_latest_update_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pfasresult',
+            index=models.Index(condition=models.Q(('updated_by_water_provider', True)), fields=['pwsid', 'source_name', 'analyte', '-submit_date'], name='pfas_result_latest_update_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='phase2annualflow',
+            index=models.Index(fields=['pwsid', 'source_name', 'year'], name='phase2_annual_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='phase2maxflow',
+            index=models.Index(fields=['pwsid', 'source_name'], name='phase2_max_flow_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='phase2pfasresults',
+            index=models.Index(fields=['pwsid', 'source_name', 'analyte'], name='phase2_pfas_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='phase2sourceinfo',
+            index=models.Index(fields=['pwsid', 'source_name'], name='phase2_src_info_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='source',
+            index=models.Index(fields=['pwsid', 'source_name'], name='source_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='tb_claimflowrate',
+            index=models.Index(fields=['pwsid', 'source_name', 'source_variable', 'year'], name='claim_tb_flow_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='tb_claimpfasresult',
+            index=models.Index(fields=['pwsid', 'source_name', 'analyte'], name='claim_tb_pfas_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='tb_claimsource',
+            index=models.Index(fields=['pwsid', 'source_name'], name='claim_tb_source_source_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.1 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientUpdates', '0002_source_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceCurrentState',
+            fields=[
+                ('row_names', models.BigAutoField(primary_key=True, serialize=False)),
+                ('pwsid', models.TextField()),
+                ('source_name', models.TextField()),
+                ('claim_pfas_results', models.JSONField(default=dict)),
+                ('latest_pfas_results', models.JSONField(default=dict)),
+                ('claim_annuals', models.JSONField(default=dict)),
+                ('latest_annuals', models.JSONField(default=dict)),
+                ('claim_vfr', models.FloatField(blank=True, null=True)),
+                ('latest_vfr', models.FloatField(blank=True, null=True)),
+                ('max_pfas_results', models.JSONField(default=dict)),
+                ('max_annuals', models.JSONField(default=dict)),
+                ('max_vfr', models.FloatField(blank=True, null=True)),
+                ('pfoa_result', models.FloatField(default=0)),
+                ('pfos_result', models.FloatField(default=0)),
+                ('max_other_result', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'source_current_state',
+                'managed': True,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sourcecurrentstate',
+            constraint=models.UniqueConstraint(fields=('pwsid', 'source_name'), name='source_current_state_source_uniq'),
+        ),
+    ]
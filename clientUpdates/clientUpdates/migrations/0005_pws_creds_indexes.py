@@ -0,0 +1,25 @@
+# Generated by Django 4.1 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+from clientUpdates.utils.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # Built with CREATE INDEX CONCURRENTLY so logins aren't blocked; that can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('clientUpdates', '0004_background_job'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pwscreds',
+            index=models.Index(fields=['username'], name='pws_creds_username_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pwscreds',
+            index=models.Index(fields=['pwsid'], name='pws_creds_pwsid_idx'),
+        ),
+    ]
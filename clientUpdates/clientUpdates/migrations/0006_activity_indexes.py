@@ -0,0 +1,25 @@
+# Generated by Django 4.1 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+from clientUpdates.utils.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # Built with CREATE INDEX CONCURRENTLY so updates can still be submitted; that can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('clientUpdates', '0005_pws_creds_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='flowrate',
+            index=models.Index(fields=['pwsid', '-submit_date', '-row_names'], name='flow_rate_pwsid_submit_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pfasresult',
+            index=models.Index(fields=['pwsid', '-submit_date', '-row_names'], name='pfas_result_pwsid_submit_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1 on 2026-10-18 17:07
+
+from django.db import migrations, models
+
+from clientUpdates.utils.migration_operations import AddIndexConcurrentlyOnPostgres, RemoveIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    # The latest-update indexes gain row_names, the tie-breaker of get_latest_entries. The new indexes are built
+    # before the old ones are dropped, concurrently so updates can still be submitted; that can't run inside a
+    # transaction
+    atomic = False
+
+    dependencies = [
+        ('clientUpdates', '0006_activity_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='flowrate',
+            index=models.Index(condition=models.Q(('updated_by_water_provider', True)), fields=['pwsid', 'source_name', 'source_variable', 'year', '-submit_date', '-row_names'], name='flow_rate_latest_rev_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='pfasresult',
+            index=models.Index(condition=models.Q(('updated_by_water_provider', True)), fields=['pwsid', 'source_name', 'analyte', '-submit_date', '-row_names'], name='pfas_result_latest_rev_idx'),
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='flowrate',
+            name='flow_rate_latest_update_idx',
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='pfasresult',
+            name='pfas_result_latest_update_idx',
+        ),
+    ]
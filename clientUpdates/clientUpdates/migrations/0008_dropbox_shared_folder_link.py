@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clientUpdates', '0007_latest_update_tie_break_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dropboxlinks',
+            name='url_shared_folder',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
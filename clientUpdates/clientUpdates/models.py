@@ -303,6 +303,9 @@ class Source(models.Model):
     class Meta:
         managed = True
         db_table = 'source'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name'], name='source_source_idx'),
+        ]
 
 
 class FlowRate(models.Model):
@@ -335,6 +338,14 @@ class FlowRate(models.Model):
     class Meta:
         managed = True
         db_table = 'flow_rate'
+        indexes = [
+            # Activity log, newest first (utils.activity.get_activity_page)
+            models.Index(fields=['pwsid', '-submit_date', '-row_names'], name='flow_rate_pwsid_submit_idx'),
+            # Latest water provider update per year / VFR (get_latest_entries)
+            models.Index(fields=['pwsid', 'source_name', 'source_variable', 'year', '-submit_date', '-row_names'],
+                         name='flow_rate_latest_rev_idx',
+                         condition=models.Q(updated_by_water_provider=True)),
+        ]
 
 
 class PfasResult(models.Model):
@@ -371,6 +382,45 @@ class PfasResult(models.Model):
     class Meta:
         managed = True
         db_table = 'pfas_result'
+        indexes = [
+            # Activity log, newest first (utils.activity.get_activity_page)
+            models.Index(fields=['pwsid', '-submit_date', '-row_names'], name='pfas_result_pwsid_submit_idx'),
+            # Latest water provider update per analyte (get_latest_entries)
+            models.Index(fields=['pwsid', 'source_name', 'analyte', '-submit_date', '-row_names'],
+                         name='pfas_result_latest_rev_idx',
+                         condition=models.Q(updated_by_water_provider=True)),
+        ]
+
+
+class SourceCurrentState(models.Model):
+    """
+    Denormalized current PFAS and flow state of a source, keyed by (pwsid, source_name).
+    Keeps the claim maxima and the latest water provider update per analyte / year so that
+    it can be updated incrementally (see utils/source_state.py).
+    """
+    row_names = models.BigAutoField(primary_key=True)
+    pwsid = models.TextField()
+    source_name = models.TextField()
+    claim_pfas_results = models.JSONField(default=dict)  # {analyte: max claim result_ppt}
+    latest_pfas_results = models.JSONField(default=dict)  # {analyte: latest update result_ppt}
+    claim_annuals = models.JSONField(default=dict)  # {year: max claim flow_rate_gpm}
+    latest_annuals = models.JSONField(default=dict)  # {year: latest update flow_rate_gpm}
+    claim_vfr = models.FloatField(blank=True, null=True)
+    latest_vfr = models.FloatField(blank=True, null=True)
+    max_pfas_results = models.JSONField(default=dict)
+    max_annuals = models.JSONField(default=dict)
+    max_vfr = models.FloatField(blank=True, null=True)
+    pfoa_result = models.FloatField(default=0)
+    pfos_result = models.FloatField(default=0)
+    max_other_result = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = 'source_current_state'
+        constraints = [
+            models.UniqueConstraint(fields=['pwsid', 'source_name'], name='source_current_state_source_uniq'),
+        ]
 
 
 ## Filenames ##
@@ -425,6 +475,8 @@ class DropboxLinks(models.Model):
     row_names = models.BigAutoField(primary_key=True)
     pwsid = models.TextField(blank=True, null=True)
     url_file_request = models.TextField(blank=True, null=True)
+    # Shared link to the PWS's upload folder, resolved by get_dropbox_link
+    url_shared_folder = models.TextField(blank=True, null=True)
 
     class Meta:
         managed = True
@@ -478,6 +530,9 @@ class ClaimFlowRate(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_flow_rate'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'source_variable', 'year'], name='claim_flow_rate_source_idx'),
+        ]
 
 
 class ClaimPfasResult(models.Model):
@@ -509,6 +564,9 @@ class ClaimPfasResult(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_pfas_result'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'analyte'], name='claim_pfas_result_source_idx'),
+        ]
 
 
 class ClaimPws(models.Model):
@@ -612,6 +670,9 @@ class ClaimSource(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_source'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name'], name='claim_source_source_idx'),
+        ]
 
 
 class paymentInfo(models.Model):
@@ -680,6 +741,9 @@ class TB_ClaimPfasResult(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_tb_pfas_result'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'analyte'], name='claim_tb_pfas_source_idx'),
+        ]
 
 
 class TB_ClaimFlowRate(models.Model):
@@ -704,6 +768,9 @@ class TB_ClaimFlowRate(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_tb_flow_rate'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'source_variable', 'year'], name='claim_tb_flow_source_idx'),
+        ]
 
 
 class supplementalSourceTracker(models.Model):
@@ -758,6 +825,9 @@ class TB_ClaimSource(models.Model):
     class Meta:
         managed = True
         db_table = 'claim_tb_source'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name'], name='claim_tb_source_source_idx'),
+        ]
 
 
 class pwsPaymentDist(models.Model):
@@ -832,6 +902,10 @@ class pwsCreds(models.Model):
     class Meta:
         managed = True
         db_table = 'consortium_pws_creds'
+        indexes = [
+            models.Index(fields=['username'], name='pws_creds_username_idx'),
+            models.Index(fields=['pwsid'], name='pws_creds_pwsid_idx'),
+        ]
 
 
 class phase2PwsInfo(models.Model):
@@ -841,11 +915,11 @@ class phase2PwsInfo(models.Model):
     ein = models.TextField(blank=True, null=True)
     facility_address = models.TextField(blank=True, null=True)
     facility_city = models.TextField(blank=True, null=True)
-    facility_state = models.CharField(blank=True, choices=us_states.STATE_CHOICES, null=True)
+    facility_state = models.CharField(max_length=2, blank=True, choices=us_states.STATE_CHOICES, null=True)
     facility_zip = models.TextField(blank=True, null=True)
     mailing_address = models.TextField(blank=True, null=True)
     mailing_city = models.TextField(blank=True, null=True)
-    mailing_state = models.CharField(blank=True, choices=us_states.STATE_CHOICES, null=True)
+    mailing_state = models.CharField(max_length=2, blank=True, choices=us_states.STATE_CHOICES, null=True)
     mailing_zip = models.TextField(blank=True, null=True)
     primary_contact_name = models.TextField(blank=True, null=True)
     primary_contact_title = models.TextField(blank=True, null=True)
@@ -918,6 +992,9 @@ class phase2SourceInfo(models.Model):
     class Meta:
         managed = True
         db_table = 'phase2_source_info'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name'], name='phase2_src_info_source_idx'),
+        ]
 
 
 class phase2MaxFlow(models.Model):
@@ -936,6 +1013,9 @@ class phase2MaxFlow(models.Model):
     class Meta:
         managed = True
         db_table = 'phase2_max_flow'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name'], name='phase2_max_flow_source_idx'),
+        ]
 
 
 class phase2AnnualFlow(models.Model):
@@ -957,6 +1037,9 @@ class phase2AnnualFlow(models.Model):
     class Meta:
         managed = True
         db_table = 'phase2_annual_flow'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'year'], name='phase2_annual_source_idx'),
+        ]
 
 
 class phase2PfasResults(models.Model):
@@ -975,4 +1058,43 @@ class phase2PfasResults(models.Model):
 
     class Meta:
         managed = True
-        db_table = 'phase2_pfas_results'
\ No newline at end of file
+        db_table = 'phase2_pfas_results'
+        indexes = [
+            models.Index(fields=['pwsid', 'source_name', 'analyte'], name='phase2_pfas_source_idx'),
+        ]
+
+
+## Background jobs ##
+class BackgroundJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    id = models.BigAutoField(primary_key=True)
+    job_type = models.TextField()
+    dedup_key = models.TextField()
+    pwsid = models.TextField(blank=True, null=True)
+    source_name = models.TextField(blank=True, null=True)
+    payload = models.JSONField(default=dict)
+    status = models.TextField(choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField()
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = 'background_job'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='background_job_queue_idx'),
+        ]
+        constraints = [
+            # At most one pending job per dedup key, e.g. one recompute per (pwsid, source_name)
+            models.UniqueConstraint(fields=['dedup_key'], condition=models.Q(status='pending'),
+                                    name='background_job_pending_uniq'),
+        ]
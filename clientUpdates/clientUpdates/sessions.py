@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBSessionStore
+
+
+class SessionStore(CachedDBSessionStore):
+    """
+    cached_db session store that doesn't write the database on every request.
+
+    With SESSION_SAVE_EVERY_REQUEST, an unmodified session is saved on each request only to slide its expiry.
+    This store slides the expiry of the cached copy instead, and writes the new expiry to the database once it
+    has moved more than SESSION_DB_WRITE_THRESHOLD seconds. Modified sessions are always written through.
+
+    If the cached copy is lost, the session falls back to the database row, whose expiry may be up to
+    SESSION_DB_WRITE_THRESHOLD seconds earlier than the sliding expiry.
+    """
+    db_written_at_key = '_db_written_at'
+
+    def _db_write_due(self):
+        written_at = self._get_session().get(self.db_written_at_key, 0)
+        return time.time() - written_at >= settings.SESSION_DB_WRITE_THRESHOLD
+
+    def save(self, must_create=False):
+        if (not must_create and self.session_key and not self.modified and not self._db_write_due()
+                and self._cache.touch(self.cache_key, self.get_expiry_age())):
+            return
+
+        self._get_session()[self.db_written_at_key] = int(time.time())
+        super().save(must_create=must_create)
@@ -28,8 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'django.middleware.cache.UpdateCacheMiddleware', 
-    'django.middleware.cache.FetchFromCacheMiddleware',
+    # First, so it times the whole request including the other middleware
+    'clientUpdates.middleware.DebugHeadersMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -89,6 +89,10 @@ LOGIN_REDIRECT_URL = 'landing_page'
 SESSION_COOKIE_AGE = 30 * 60
 SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+# Sessions are read from the cache, and the sliding expiry is only written back to the database
+# once it has moved more than SESSION_DB_WRITE_THRESHOLD seconds (see clientUpdates.sessions)
+SESSION_ENGINE = 'clientUpdates.sessions'
+SESSION_DB_WRITE_THRESHOLD = int(os.getenv('SESSION_DB_WRITE_THRESHOLD', '300'))
 
 DATABASES = {
     'default': {
@@ -98,15 +102,80 @@ DATABASES = {
         'PASSWORD': os.getenv('DATABASE_PASSWORD'),
         'HOST': os.getenv('DATABASE_HOST'),
         'PORT': os.getenv('DATABASE_PORT', '5432'),
+        # Keep connections open between requests instead of reconnecting (and redoing TLS) every time.
+        # 0 closes the connection after each request, None keeps it open indefinitely.
+        'CONN_MAX_AGE': int(os.getenv('DATABASE_CONN_MAX_AGE', '60')),
+        # Check a persistent connection before reusing it for a new request
+        'CONN_HEALTH_CHECKS': os.getenv('DATABASE_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+# Set DATABASE_POOLER=pgbouncer when connecting through pgbouncer in transaction pooling mode: the
+# pooler owns the connections, so Django closes its side after each request and avoids server-side
+# cursors, which don't survive a transaction boundary there.
+if os.getenv('DATABASE_POOLER') == 'pgbouncer':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
 DROPBOX = {
     'app_key': os.getenv('DROPBOX_APP_KEY'),
     'app_secret': os.getenv('DROPBOX_APP_SECRET'),
     'refresh_token': os.getenv('REFRESH_TOKEN'),
     'access_token': '',
+    # Refresh the access token this long before it expires
+    'token_refresh_margin_seconds': int(os.getenv('DROPBOX_TOKEN_REFRESH_MARGIN_SECONDS', '300')),
+    # Size of the connection pool shared by all Dropbox calls in a process
+    'max_connections': int(os.getenv('DROPBOX_MAX_CONNECTIONS', '8')),
+    # How long a worker process serves shared folder links from memory before re-reading dropbox_links
+    'link_cache_ttl_seconds': int(os.getenv('DROPBOX_LINK_CACHE_TTL_SECONDS', '3600')),
+    # Minimum time between two checks that the stored shared folder link of a PWS wasn't revoked
+    'link_check_interval_seconds': int(os.getenv('DROPBOX_LINK_CHECK_INTERVAL_SECONDS', '86400')),
+    # Files larger than this are sent in chunks of this size through an upload session
+    'upload_chunk_size': int(os.getenv('DROPBOX_UPLOAD_CHUNK_SIZE', str(8 * 1024 * 1024))),
+}
+
+BACKGROUND_JOBS = {
+    'workers': int(os.getenv('BACKGROUND_JOB_WORKERS', '2')),
+    'max_attempts': int(os.getenv('BACKGROUND_JOB_MAX_ATTEMPTS', '5')),
+    'retry_backoff_seconds': int(os.getenv('BACKGROUND_JOB_RETRY_BACKOFF_SECONDS', '30')),
+    'poll_interval_seconds': float(os.getenv('BACKGROUND_JOB_POLL_INTERVAL_SECONDS', '2')),
+    'stale_after_seconds': int(os.getenv('BACKGROUND_JOB_STALE_AFTER_SECONDS', '1800')),
+}
+
+# Shared cache for all worker processes: a file cache on the local disk (default), or a database
+# table for deployments with several hosts (create it with `python manage.py createcachetable`)
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_DIR),
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    } if os.getenv('CACHE_BACKEND', 'file') == 'file' else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
 }
 
+# Seconds a read-only page (see utils.cache_utils.cache_per_user) is cached per user
+USER_PAGE_CACHE_TIMEOUT = int(os.getenv('USER_PAGE_CACHE_TIMEOUT', '600'))
+
+# Request timing and query counts, recorded by clientUpdates.middleware.DebugHeadersMiddleware
+REQUEST_METRICS = {
+    # Requests taking longer than this are logged as warnings
+    'slow_request_ms': int(os.getenv('SLOW_REQUEST_MS', '1000')),
+    # Add a Server-Timing header (total, db and app time) to every response
+    'server_timing_header': os.getenv('SERVER_TIMING_HEADER', 'True') == 'True',
+    # Each worker process writes the timings of its latest requests per URL name to a file in this directory
+    'directory': os.getenv('REQUEST_METRICS_DIR', os.path.join(BASE_DIR, 'metrics')),
+    'sample_size': int(os.getenv('REQUEST_METRICS_SAMPLE_SIZE', '1000')),
+    'flush_interval_seconds': int(os.getenv('REQUEST_METRICS_FLUSH_INTERVAL_SECONDS', '60')),
+}
+
+# Seconds the Pws / ClaimPws rows of a user are cached for the info bar and views
+PWS_PROFILE_CACHE_TIMEOUT = int(os.getenv('PWS_PROFILE_CACHE_TIMEOUT', '300'))
+
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
\ No newline at end of file
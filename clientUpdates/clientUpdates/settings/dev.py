@@ -20,7 +20,10 @@ LOGGING = {
         'verbose': {
             'format': '{levelname}; {asctime}; logger name: {name}; module: {module}; msg: {message}',
             'style': '{',
-        }
+        },
+        'json': {
+            '()': 'clientUpdates.utils.log_utils.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
@@ -32,17 +35,22 @@ LOGGING = {
             'level': 'INFO',
             'class': 'logging.FileHandler',
             'filename': os.path.join(LOG_DIR, 'development.log'),
-            'formatter': 'verbose',
+            'formatter': 'json',
+        },
+        # Console and file output are written by a background thread; see QueueListenerHandler
+        'queue': {
+            '()': 'clientUpdates.utils.log_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'ERROR',
             'propagate': True,
         },
         'clientUpdates': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'DEBUG',
             'propagate': False,
         }
@@ -26,8 +26,6 @@ EMAIL_RECIPIENTS = os.getenv('EMAIL_RECIPIENTS', '').split(',')
 # SERVER_EMAIL = DEFAULT_FROM_EMAIL
 # EMAIL_RECIPIENTS = os.getenv("EMAIL_RECIPIENTS", "").split(",")
 
-MIDDLEWARE += ['clientUpdates.middleware.DebugHeadersMiddleware']
-
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -35,7 +33,10 @@ LOGGING = {
         'verbose': {
             'format': '{levelname}; {asctime}; logger name: {name}; module: {module}; msg: {message}',
             'style': '{',
-        }
+        },
+        'json': {
+            '()': 'clientUpdates.utils.log_utils.JsonFormatter',
+        },
     },
     'handlers': {
         'console': {
@@ -47,7 +48,12 @@ LOGGING = {
             'level': 'INFO',
             'class': 'logging.FileHandler',
             'filename': os.path.join(LOG_DIR, 'production.log'),
-            'formatter': 'verbose'
+            'formatter': 'json'
+        },
+        # Console and file output are written by a background thread; see QueueListenerHandler
+        'queue': {
+            '()': 'clientUpdates.utils.log_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
         },
         'mail_admins': {
                 'level': 'ERROR',
@@ -63,17 +69,17 @@ LOGGING = {
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'ERROR',
             'propagate': True,
         },
         'clientUpdates': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False,
         },
         "django.request": {
-            'handlers': ['file', 'console', 'mail_admins'],
+            'handlers': ['queue', 'mail_admins'],
             "level": "ERROR",
             "propagate": False,
         },
@@ -1,15 +1,29 @@
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .models import Pws, ClaimPws
+from .utils.pws_profile import invalidate_pws_profiles, invalidate_pws_profiles_for_pwsids
 import logging
 
 logger = logging.getLogger('clientUpdates')
 
 
 @receiver(user_logged_in)
-def log_user_login(sender, request, **kwargs):
-    logger.info(f"{request.user.username} has logged in.")
+def log_user_login(sender, request, user, **kwargs):
+    logger.info(f"{user.username} has logged in.")
 
 
 @receiver(user_logged_out)
 def log_user_logout(sender, request, **kwargs):
     logger.info(f"{request.user.username} has logged out.")
+
+
+@receiver([post_save, post_delete], sender=Pws)
+def invalidate_pws_profile(sender, instance, **kwargs):
+    invalidate_pws_profiles_for_pwsids([instance.pwsid])
+    invalidate_pws_profiles([instance.form_userid])
+
+
+@receiver([post_save, post_delete], sender=ClaimPws)
+def invalidate_claim_pws_profile(sender, instance, **kwargs):
+    invalidate_pws_profiles_for_pwsids([instance.pwsid])
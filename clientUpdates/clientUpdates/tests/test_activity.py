@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from clientUpdates.models import PfasResult, FlowRate
+from clientUpdates.utils.activity import (get_activity_page, format_activity_row, PFAS_RESULT_RANK,
+                                          FLOW_RATE_RANK)
+
+PWSID = 'TX0000001'
+SUBMIT_DATE = timezone.make_aware(datetime(2024, 1, 1))
+
+
+class ActivityFeedTests(TestCase):
+    """ Paging through the activity feed returns every row once, in order, also when submit dates are tied. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username=PWSID)
+        # Most rows of both tables share one submit date, so page boundaries fall inside the tie
+        submit_dates = [SUBMIT_DATE + timedelta(days=1)] + [SUBMIT_DATE] * 5 + [SUBMIT_DATE - timedelta(days=1)]
+        for k, submit_date in enumerate(submit_dates):
+            for pwsid in (PWSID, 'TX0000002'):
+                PfasResult.objects.create(pwsid=pwsid, source_name='Well 1', submit_date=submit_date,
+                                          analyte='PFOA', result_ppt=float(k))
+                FlowRate.objects.create(pwsid=pwsid, source_name='Well 1', submit_date=submit_date,
+                                        source_variable='AFR', year=2020, flow_rate=float(k), unit='gpm')
+        # Rows without a submit date aren't part of the feed
+        PfasResult.objects.create(pwsid=PWSID, source_name='Well 1', analyte='PFOS', result_ppt=1.0)
+
+    def expected_rows(self):
+        rows = [(row.submit_date, PFAS_RESULT_RANK, row.row_names, row.source_name, row.analyte, None,
+                 row.result_ppt, row.unit)
+                for row in PfasResult.objects.filter(pwsid=PWSID, submit_date__isnull=False)]
+        rows += [(row.submit_date, FLOW_RATE_RANK, row.row_names, row.source_name, row.source_variable, row.year,
+                  row.flow_rate, row.unit)
+                 for row in FlowRate.objects.filter(pwsid=PWSID)]
+        rows.sort(key=lambda row: row[:3], reverse=True)
+        return [format_activity_row(rank, submit_date, *row) for submit_date, rank, _, *row in rows]
+
+    def read_all_pages(self, page_size, max_rows):
+        rows, cursor = [], None
+        # A cursor that doesn't move past its row would page forever
+        while len(rows) <= max_rows:
+            page = get_activity_page(PWSID, cursor=cursor, page_size=page_size)
+            self.assertLessEqual(len(page['activity_logs']), page_size)
+            rows += page['activity_logs']
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        return rows
+
+    def test_pages_cover_every_row_once(self):
+        expected = self.expected_rows()
+        self.assertEqual(len(expected), 14)
+        for page_size in range(1, len(expected) + 2):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.read_all_pages(page_size, len(expected)), expected)
+
+    def test_malformed_cursor_returns_the_newest_page(self):
+        self.assertEqual(get_activity_page(PWSID, cursor='not a cursor', page_size=3),
+                         get_activity_page(PWSID, page_size=3))
+
+    def test_activity_page_links(self):
+        with self.assertLogs('clientUpdates', 'INFO'):
+            self.client.force_login(self.user)
+        # All 14 rows fit on the newest page
+        newest = self.client.get(reverse('activity'))
+        self.assertNotContains(newest, 'Older changes')
+        self.assertNotContains(newest, 'Newest changes')
+
+        older = self.client.get(reverse('activity'), {'cursor': get_activity_page(PWSID, page_size=3)['next_cursor']})
+        self.assertEqual(len(older.context['activity_logs']), 11)
+        self.assertContains(older, f'href="{reverse("activity")}"')
+        self.assertContains(older, 'Newest changes')
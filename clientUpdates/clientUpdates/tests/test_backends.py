@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate, hashers
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from clientUpdates.models import BackgroundJob, pwsCreds
+from clientUpdates.utils.jobs import claim_next_job, run_job, USER_PASSWORD
+
+PWSID, PASSWORD = 'TX0000001', 'secret'
+BACKGROUND_JOBS = {'workers': 1, 'max_attempts': 3, 'retry_backoff_seconds': 10, 'poll_interval_seconds': 0,
+                   'stale_after_seconds': 600}
+
+
+@override_settings(BACKGROUND_JOBS=BACKGROUND_JOBS)
+class PwsCredsAuthBackendTests(TestCase):
+    """ Logins are checked against pwsCreds, and passwords are hashed by a background job, not the login. """
+
+    @classmethod
+    def setUpTestData(cls):
+        pwsCreds.objects.create(pwsid=PWSID, pws_name='Test Water Supply', username=PWSID, password=PASSWORD)
+
+    def login(self):
+        """ Authenticates with the pwsCreds password, checking that no password is hashed. """
+        with mock.patch.object(hashers, 'get_hasher', wraps=hashers.get_hasher) as get_hasher:
+            user = authenticate(username=PWSID, password=PASSWORD)
+        get_hasher.assert_not_called()
+        return user
+
+    def test_first_login_defers_password_hashing(self):
+        with self.assertLogs('clientUpdates', 'INFO'):
+            user = self.login()
+        self.assertEqual(user.username, PWSID)
+        self.assertFalse(user.has_usable_password())
+        self.assertEqual(list(BackgroundJob.objects.values_list('job_type', 'payload')),
+                         [(USER_PASSWORD, {'username': PWSID})])
+
+        with self.assertLogs('clientUpdates', 'INFO'):
+            job = run_job(claim_next_job())
+        self.assertEqual(job.status, BackgroundJob.DONE)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password(PASSWORD))
+        self.assertEqual(ModelBackend().authenticate(None, username=PWSID, password=PASSWORD), user)
+
+    def test_known_user_logs_in_without_a_job(self):
+        user = User.objects.create_user(username=PWSID, password=PASSWORD)
+        self.assertEqual(self.login(), user)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_wrong_password_is_rejected(self):
+        self.assertIsNone(authenticate(username=PWSID, password='wrong'))
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(BackgroundJob.objects.exists())
@@ -0,0 +1,71 @@
+from django.db import transaction
+from django.test import TestCase
+
+from clientUpdates.models import Pws, Source, ClaimSource, ClaimFlowRate
+from clientUpdates.utils.synthetic_data import load_synthetic_data
+from clientUpdates.utils.updates import (update_ehe_source_table, update_ehe_pws_table, bulk_update_ehe_source_table,
+                                         bulk_update_ehe_pws_table)
+
+SOURCE_SCORE_FIELDS = ('pfas_score', 'pfas_score_method', 'all_nds', 'reg_bump', 'afr', 'ehe_afr_note', 'base_score',
+                       'gfe_tyco', 'gfe_basf', 'gfe_total_basf_tyco', 'data_origin')
+PWS_SCORE_FIELDS = ('gfe_tyco', 'gfe_basf', 'gfe_total_basf_tyco', 'data_origin')
+
+
+class BulkUpdateParityTests(TestCase):
+    """ The bulk recompute stores the same Source and Pws scores as the per-source functions. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.source_keys, _ = load_synthetic_data(60, seed=1, tables=('pws', 'source', 'claim', 'updates'))
+        # A source without a claim keeps its PFAS score and AFR; only its base score and GFEs are recalculated
+        pwsid, source_name = cls.unclaimed = cls.source_keys[-1]
+        ClaimSource.objects.filter(pwsid=pwsid, source_name=source_name).delete()
+        Source.objects.filter(pwsid=pwsid, source_name=source_name).update(pfas_score=12.5, afr=300.0)
+        # A claim annual without a year, which neither path scores
+        pwsid, source_name = cls.source_keys[0]
+        ClaimFlowRate.objects.create(pwsid=pwsid, source_name=source_name, source_variable='AFR', year=None,
+                                     flow_rate_gpm=1e6)
+
+    def scores(self, update):
+        """ Runs update and returns the stored scores, rolling its writes back afterwards. """
+        savepoint = transaction.savepoint()
+        try:
+            update()
+            return (list(Source.objects.order_by('pwsid', 'source_name').values_list('pwsid', 'source_name',
+                                                                                     *SOURCE_SCORE_FIELDS)),
+                    list(Pws.objects.order_by('pwsid').values_list('pwsid', *PWS_SCORE_FIELDS)))
+        finally:
+            transaction.savepoint_rollback(savepoint)
+
+    def per_source_update(self):
+        # The per-source functions log each step, and log rather than raise their errors
+        with self.assertLogs('clientUpdates', 'INFO') as logs:
+            for pwsid, source_name in self.source_keys:
+                update_ehe_source_table(pwsid, source_name)
+            for pwsid in sorted({pwsid for pwsid, _ in self.source_keys}):
+                update_ehe_pws_table(pwsid)
+        self.assertFalse([line for line in logs.output if line.startswith('ERROR')])
+
+    def bulk_update(self):
+        bulk_update_ehe_source_table()
+        bulk_update_ehe_pws_table()
+
+    def test_same_scores(self):
+        expected_sources, expected_pws = self.scores(self.per_source_update)
+        sources, pws = self.scores(self.bulk_update)
+
+        self.assertEqual(len(sources), len(self.source_keys))
+        for source, expected in zip(sources, expected_sources):
+            self.assertEqual(source, expected)
+        self.assertEqual(pws, expected_pws)
+
+        unclaimed = next(source for source in sources if source[:2] == self.unclaimed)
+        self.assertEqual(unclaimed[2], 12.5)
+        self.assertGreater(sum(1 for source in sources if source[2]), len(sources) // 2)
+
+    def test_same_scores_from_state(self):
+        from clientUpdates.utils.source_state import rebuild_source_state
+
+        expected = self.scores(self.per_source_update)
+        self.assertEqual(self.scores(lambda: (rebuild_source_state(), bulk_update_ehe_source_table(from_state=True),
+                                              bulk_update_ehe_pws_table())), expected)
@@ -0,0 +1,134 @@
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.test import Client, TestCase, RequestFactory, override_settings
+from django.urls import reverse
+
+from clientUpdates.models import pwsCreds
+from clientUpdates.utils.cache_utils import cache_per_user, invalidates_user_pages, invalidate_user_pages
+
+
+class CachePerUserTests(TestCase):
+    """ Pages are cached per user and session in the shared file cache, and dropped after the user writes. """
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.enterContext(override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir.name}}))
+        self.renders = []
+
+        @cache_per_user()
+        def page(request):
+            self.renders.append(request.user.username)
+            return HttpResponse(f"page {len(self.renders)} of {request.user.username}",
+                                status=int(request.GET.get('status', 200)))
+
+        @invalidates_user_pages
+        def write(request):
+            return HttpResponse(status=302)
+
+        self.page, self.write = page, write
+        self.alice = User(username='TX0000001')
+        self.bob = User(username='TX0000002')
+
+    def request(self, view, user, method='get', path='/page/', session_key='session-1'):
+        request = getattr(RequestFactory(), method)(path)
+        request.user = user
+        request.session = SimpleNamespace(session_key=session_key)
+        return view(request)
+
+    def get(self, user, **kwargs):
+        return self.request(self.page, user, **kwargs).content.decode()
+
+    def test_users_never_get_each_others_pages(self):
+        self.assertEqual(self.get(self.alice), 'page 1 of TX0000001')
+        self.assertEqual(self.get(self.bob, session_key='session-2'), 'page 2 of TX0000002')
+        # Even with the same session key and path, each user gets their own page
+        self.assertEqual(self.get(self.bob), 'page 3 of TX0000002')
+
+        self.assertEqual(self.get(self.alice), 'page 1 of TX0000001')
+        self.assertEqual(self.get(self.bob, session_key='session-2'), 'page 2 of TX0000002')
+        self.assertEqual(self.renders, ['TX0000001', 'TX0000002', 'TX0000002'])
+
+    def test_pages_are_cached_per_session_and_path(self):
+        self.get(self.alice)
+        self.assertEqual(self.get(self.alice, session_key='session-2'), 'page 2 of TX0000001')
+        self.assertEqual(self.get(self.alice, path='/page/?claim=Tyco_BASF'), 'page 3 of TX0000001')
+        self.assertEqual(self.get(self.alice), 'page 1 of TX0000001')
+
+    def test_write_invalidates_the_users_pages(self):
+        self.get(self.alice)
+        self.get(self.bob, session_key='session-2')
+
+        # A GET through a writing view doesn't invalidate
+        self.request(self.write, self.alice)
+        self.assertEqual(self.get(self.alice), 'page 1 of TX0000001')
+
+        self.request(self.write, self.alice, method='post')
+        self.assertEqual(self.get(self.alice), 'page 3 of TX0000001')
+        # Other users keep their pages
+        self.assertEqual(self.get(self.bob, session_key='session-2'), 'page 2 of TX0000002')
+
+        invalidate_user_pages(self.bob.username)
+        self.assertEqual(self.get(self.bob, session_key='session-2'), 'page 4 of TX0000002')
+
+    def test_only_successful_pages_of_authenticated_users_are_cached(self):
+        anonymous = AnonymousUser()
+        self.assertEqual(self.get(anonymous), 'page 1 of ')
+        self.assertEqual(self.get(anonymous), 'page 2 of ')
+
+        self.assertEqual(self.get(self.alice, path='/page/?status=404'), 'page 3 of TX0000001')
+        self.assertEqual(self.get(self.alice, path='/page/?status=404'), 'page 4 of TX0000001')
+
+        self.assertEqual(self.request(self.page, self.alice, method='post').content.decode(), 'page 5 of TX0000001')
+        self.assertEqual(self.request(self.page, self.alice, method='post').content.decode(), 'page 6 of TX0000001')
+
+    def test_cached_pages_are_private(self):
+        for _ in range(2):
+            self.assertIn('private', self.request(self.page, self.alice)['Cache-Control'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedViewTests(TestCase):
+    """ The cached views render once per user until the user submits an update. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create(username='TX0000001')
+        cls.bob = User.objects.create(username='TX0000002')
+        pwsCreds.objects.create(pwsid='TX0000002', pws_name='Test Water Supply', username='TX0000002')
+
+    def setUp(self):
+        cache.clear()
+        # One logged-in session per user; a new login starts from a fresh page
+        self.clients = {}
+        for user in (self.alice, self.bob):
+            self.clients[user] = Client()
+            self.clients[user].force_login(user)
+
+    def get(self, user):
+        response = self.clients[user].get(reverse('supplemental_info'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_are_rendered_once_per_user_until_an_update(self):
+        with mock.patch('clientUpdates.views.render', wraps=render) as rendered:
+            def page_renders():
+                return sum(1 for call in rendered.call_args_list if call.args[1] == 'supplemental_info.html')
+
+            for user in (self.alice, self.bob, self.alice, self.bob):
+                self.get(user)
+            self.assertEqual(page_renders(), 2)
+
+            # Bob's rejected source form still counts as a write
+            self.clients[self.bob].post(reverse('source-form-create'), {'source_name': ''})
+            self.get(self.alice)
+            self.assertEqual(page_renders(), 2)
+            self.get(self.bob)
+            self.get(self.bob)
+            self.assertEqual(page_renders(), 3)
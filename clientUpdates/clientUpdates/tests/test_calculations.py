@@ -0,0 +1,113 @@
+import random
+
+from django.test import SimpleTestCase
+
+from clientUpdates.utils.calculations import (
+    calc_pfas_score_and_method, calc_pfas_score_and_method_batch, get_top_annuals, calc_afr_and_note, calc_afr_batch,
+    calc_capital_costs, calc_capital_costs_batch, calc_om_costs, calc_om_costs_batch, calc_base_score,
+    calc_base_score_batch, calc_gfes, calc_gfes_batch, calc_scores_batch,
+)
+
+
+class BatchScoringParityTests(SimpleTestCase):
+    """ The batch functions return exactly what the scalar functions return for every source. """
+
+    n_sources = 20_000
+
+    def setUp(self):
+        rng = random.Random(0)
+
+        def value(scale):
+            # A share of zeros, as for non-detects and sources without flow data
+            return 0.0 if rng.random() < 0.1 else rng.lognormvariate(0, 2) * scale
+
+        self.pfoa_results = [value(10) for _ in range(self.n_sources)]
+        self.pfos_results = [value(10) for _ in range(self.n_sources)]
+        self.max_other_results = [value(100) for _ in range(self.n_sources)]
+        self.annuals = [[{'flow_rate_gpm': value(500)} for _ in range(rng.randint(0, 6))]
+                        for _ in range(self.n_sources)]
+        self.vfrs = [None if rng.random() < 0.1 else value(500) for _ in range(self.n_sources)]
+
+    def test_pfas_scores(self):
+        pfas_scores, methods = calc_pfas_score_and_method_batch(self.pfoa_results, self.pfos_results,
+                                                                self.max_other_results)
+        expected = [calc_pfas_score_and_method(*inputs)
+                    for inputs in zip(self.pfoa_results, self.pfos_results, self.max_other_results)]
+        self.assertEqual(list(zip(pfas_scores.tolist(), methods.tolist())), expected)
+
+    def test_afrs(self):
+        afrs = calc_afr_batch([get_top_annuals(annuals) for annuals in self.annuals],
+                              [float('nan') if vfr is None else vfr for vfr in self.vfrs])
+        expected = [calc_afr_and_note(annuals, vfr)[0] for annuals, vfr in zip(self.annuals, self.vfrs)]
+        self.assertEqual(afrs.tolist(), expected)
+
+    def test_costs_and_base_scores(self):
+        pfas_scores, afrs = self.pfoa_results, self.max_other_results
+        self.assertEqual(calc_capital_costs_batch(afrs).tolist(), [calc_capital_costs(afr) for afr in afrs])
+        self.assertEqual(calc_om_costs_batch(pfas_scores, afrs).tolist(),
+                         [calc_om_costs(pfas_score, afr) for pfas_score, afr in zip(pfas_scores, afrs)])
+        self.assertEqual(calc_base_score_batch(pfas_scores, afrs).tolist(),
+                         [calc_base_score(pfas_score, afr) for pfas_score, afr in zip(pfas_scores, afrs)])
+
+    def test_gfes(self):
+        pfas_scores, afrs = self.pfoa_results, self.max_other_results
+        for defendant in ('Tyco', 'BASF'):
+            self.assertEqual(calc_gfes_batch(pfas_scores, afrs, defendant).tolist(),
+                             [calc_gfes(pfas_score, afr, defendant) for pfas_score, afr in zip(pfas_scores, afrs)])
+
+    def test_scores(self):
+        scores = calc_scores_batch(self.pfoa_results, self.pfos_results, self.max_other_results,
+                                   [get_top_annuals(annuals) for annuals in self.annuals],
+                                   [float('nan') if vfr is None else vfr for vfr in self.vfrs])
+        for i in range(self.n_sources):
+            pfas_score, method = calc_pfas_score_and_method(self.pfoa_results[i], self.pfos_results[i],
+                                                            self.max_other_results[i])
+            afr, _ = calc_afr_and_note(self.annuals[i], self.vfrs[i])
+            gfe_tyco, gfe_basf = calc_gfes(pfas_score, afr, 'Tyco'), calc_gfes(pfas_score, afr, 'BASF')
+            self.assertEqual(
+                [scores[column][i] for column in ('pfas_score', 'pfas_score_method', 'afr', 'base_score',
+                                                  'gfe_tyco', 'gfe_basf', 'gfe_total_basf_tyco')],
+                [pfas_score, method, afr, calc_base_score(pfas_score, afr), gfe_tyco, gfe_basf, gfe_tyco + gfe_basf])
+
+
+class InvalidInputTests(SimpleTestCase):
+    """ The scalar functions wrap the batch functions, so invalid inputs behave the same in both. """
+
+    def test_missing_results_raise(self):
+        with self.assertRaises(TypeError):
+            calc_pfas_score_and_method(None, 1.0, 1.0)
+        with self.assertRaises(TypeError):
+            calc_pfas_score_and_method_batch([1.0, float('nan')], [1.0, 1.0], [1.0, 1.0])
+        with self.assertRaises(TypeError):
+            calc_afr_and_note([{'flow_rate_gpm': None}, {'flow_rate_gpm': 1.0}], 1.0)
+
+    def test_negative_inputs(self):
+        with self.assertRaises(TypeError):
+            calc_pfas_score_and_method(0.0, 0.0, -4.0)
+        with self.assertRaises(TypeError):
+            calc_pfas_score_and_method_batch([0.0], [0.0], [-4.0])
+        with self.assertRaises(TypeError):
+            calc_capital_costs(-1.0)
+        with self.assertRaises(TypeError):
+            calc_capital_costs_batch([-1.0])
+        self.assertEqual(calc_gfes(-1.0, 10.0, 'Tyco'), 0)
+        self.assertEqual(calc_gfes_batch([-1.0], [10.0], 'Tyco').tolist(), [0.0])
+
+    def test_missing_scores_and_afrs(self):
+        self.assertEqual(calc_capital_costs(None), 0)
+        self.assertEqual(calc_om_costs(None, 10.0), 0)
+        self.assertEqual(calc_base_score(0, None), 0)
+        self.assertEqual(calc_gfes(None, 10.0, 'BASF'), 0)
+
+    def test_missing_vfr(self):
+        # A NaN VFR counts as missing, as None does
+        for vfr in (None, float('nan'), 'unknown'):
+            with self.subTest(vfr=vfr):
+                self.assertEqual(calc_afr_and_note([{'flow_rate_gpm': 6.0}] * 3, vfr),
+                                 (3.0, "vfr missing or invalid"))
+
+    def test_unknown_defendant(self):
+        with self.assertLogs('clientUpdates', 'WARNING'):
+            self.assertIsNone(calc_gfes(1.0, 10.0, 'Other'))
+        with self.assertLogs('clientUpdates', 'WARNING'):
+            self.assertIsNone(calc_gfes_batch([1.0], [10.0], 'Other'))
@@ -0,0 +1,271 @@
+import io
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from dropbox.exceptions import ApiError, AuthError
+
+from clientUpdates.models import BackgroundJob, DropboxLinks
+from clientUpdates.utils import dropbox_utils
+from clientUpdates.utils.dropbox_utils import (DropboxClientManager, DropboxTokenError, stream_to_dropbox,
+                                               get_dropbox_link, check_dropbox_link)
+from clientUpdates.utils.jobs import DROPBOX_LINK_CHECK
+
+CHUNK_SIZE = 16
+DROPBOX_PATH = '/uploads/TX0000001/PFAS Results/report.pdf'
+PWSID = 'TX0000001'
+DROPBOX = {'app_key': 'key', 'app_secret': 'secret', 'refresh_token': 'refresh', 'access_token': '',
+           'token_refresh_margin_seconds': 300, 'max_connections': 2, 'link_cache_ttl_seconds': 3600,
+           'link_check_interval_seconds': 86400, 'upload_chunk_size': CHUNK_SIZE}
+
+
+class FakeDropbox:
+    """ Records the upload calls of a Dropbox client and keeps the uploaded files in memory. """
+
+    def __init__(self):
+        self.calls = []
+        self.sessions = {}
+        self.files = {}
+
+    def files_upload(self, data, path, mode=None):
+        self.calls.append(('files_upload', len(data)))
+        self.files[path] = data
+        return SimpleNamespace(path_display=path, size=len(data))
+
+    def files_upload_session_start(self, data):
+        session_id = f"session-{len(self.sessions)}"
+        self.calls.append(('files_upload_session_start', len(data)))
+        self.sessions[session_id] = bytearray(data)
+        return SimpleNamespace(session_id=session_id)
+
+    def _check_offset(self, cursor):
+        # Dropbox rejects a chunk whose offset isn't the number of bytes received so far
+        uploaded = len(self.sessions[cursor.session_id])
+        if cursor.offset != uploaded:
+            raise AssertionError(f"incorrect offset {cursor.offset}, expected {uploaded}")
+
+    def files_upload_session_append_v2(self, data, cursor):
+        self._check_offset(cursor)
+        self.calls.append(('files_upload_session_append_v2', cursor.offset, len(data)))
+        self.sessions[cursor.session_id] += data
+
+    def files_upload_session_finish(self, data, cursor, commit):
+        self._check_offset(cursor)
+        self.calls.append(('files_upload_session_finish', cursor.offset, len(data)))
+        self.files[commit.path] = bytes(self.sessions.pop(cursor.session_id) + data)
+        return SimpleNamespace(path_display=commit.path, size=len(self.files[commit.path]))
+
+
+class StreamToDropboxTests(SimpleTestCase):
+
+    def upload(self, size):
+        data = os.urandom(size)
+        dbx = FakeDropbox()
+        metadata = stream_to_dropbox(dbx, io.BytesIO(data), DROPBOX_PATH, chunk_size=CHUNK_SIZE)
+        self.assertEqual(dbx.files[DROPBOX_PATH], data)
+        self.assertEqual(metadata.size, size)
+        self.assertFalse(dbx.sessions)
+        return dbx.calls
+
+    def test_smaller_than_one_chunk(self):
+        self.assertEqual(self.upload(CHUNK_SIZE - 1), [('files_upload', CHUNK_SIZE - 1)])
+
+    def test_empty_file(self):
+        self.assertEqual(self.upload(0), [('files_upload', 0)])
+
+    def test_exactly_one_chunk(self):
+        self.assertEqual(self.upload(CHUNK_SIZE), [('files_upload', CHUNK_SIZE)])
+
+    def test_exactly_two_chunks(self):
+        self.assertEqual(self.upload(2 * CHUNK_SIZE), [
+            ('files_upload_session_start', CHUNK_SIZE),
+            ('files_upload_session_finish', CHUNK_SIZE, CHUNK_SIZE),
+        ])
+
+    def test_one_byte_over_a_chunk(self):
+        self.assertEqual(self.upload(CHUNK_SIZE + 1), [
+            ('files_upload_session_start', CHUNK_SIZE),
+            ('files_upload_session_finish', CHUNK_SIZE, 1),
+        ])
+
+    def test_several_chunks_and_a_remainder(self):
+        self.assertEqual(self.upload(4 * CHUNK_SIZE + 1), [
+            ('files_upload_session_start', CHUNK_SIZE),
+            ('files_upload_session_append_v2', CHUNK_SIZE, CHUNK_SIZE),
+            ('files_upload_session_append_v2', 2 * CHUNK_SIZE, CHUNK_SIZE),
+            ('files_upload_session_append_v2', 3 * CHUNK_SIZE, CHUNK_SIZE),
+            ('files_upload_session_finish', 4 * CHUNK_SIZE, 1),
+        ])
+
+
+class FakeTokenSession:
+    """ Stands in for the pooled requests.Session: answers token refreshes with a new token each time. """
+
+    def __init__(self, expires_in, delay=0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.refreshes = 0
+
+    def post(self, url, data, auth):
+        time.sleep(self.delay)
+        self.refreshes += 1
+        return mock.Mock(json=mock.Mock(return_value={'access_token': f'token-{self.refreshes}',
+                                                      'expires_in': self.expires_in}))
+
+
+class DropboxClientManagerTests(SimpleTestCase):
+    """ One pooled session per process, and tokens refreshed ahead of expiry by a single caller. """
+
+    def setUp(self):
+        # The manager writes the current token back to settings.DROPBOX
+        self.enterContext(override_settings(DROPBOX=dict(DROPBOX)))
+        self.create_session = self.enterContext(mock.patch.object(dropbox_utils.dropbox, 'create_session'))
+        self.enterContext(mock.patch.object(dropbox_utils.dropbox, 'Dropbox',
+                                            lambda token, session: SimpleNamespace(token=token, session=session)))
+
+    def manager(self, expires_in=14400, delay=0):
+        self.session = self.create_session.return_value = FakeTokenSession(expires_in, delay)
+        return DropboxClientManager()
+
+    def test_clients_share_one_session(self):
+        manager = self.manager()
+        client = manager.get_client()
+        self.assertIs(manager.get_client(), client)
+        self.assertIs(client.session, self.session)
+        self.create_session.assert_called_once_with(max_connections=2)
+        self.assertEqual(self.session.refreshes, 1)
+
+    def test_token_is_refreshed_ahead_of_expiry(self):
+        # A token expiring within the refresh margin is replaced before it is used again
+        manager = self.manager(expires_in=200)
+        self.assertEqual(manager.get_client().token, 'token-1')
+        self.assertEqual(manager.get_client().token, 'token-2')
+
+    def test_concurrent_callers_refresh_once(self):
+        manager = self.manager(delay=0.05)
+        barrier = threading.Barrier(8)
+        clients = []
+
+        def get_client():
+            barrier.wait()
+            clients.append(manager.get_client())
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.session.refreshes, 1)
+        self.assertEqual({client.token for client in clients}, {'token-1'})
+
+    def test_rejected_token_is_refreshed_and_the_call_retried_once(self):
+        manager = self.manager()
+        tokens = []
+
+        def call(dbx):
+            tokens.append(dbx.token)
+            if len(tokens) == 1:
+                raise AuthError('request-id', 'expired_access_token')
+            return 'result'
+
+        self.assertEqual(manager.call(call), 'result')
+        self.assertEqual(tokens, ['token-1', 'token-2'])
+
+        with self.assertRaises(AuthError):
+            manager.call(mock.Mock(side_effect=AuthError('request-id', 'invalid_access_token')))
+        self.assertEqual(self.session.refreshes, 3)
+
+    def test_environment_token_is_used_until_rejected(self):
+        manager = self.manager()
+        with override_settings(DROPBOX={**DROPBOX, 'access_token': 'env-token'}):
+            self.assertEqual(manager.get_client().token, 'env-token')
+        self.assertEqual(self.session.refreshes, 0)
+
+    def test_failed_refresh_raises_token_error(self):
+        manager = self.manager()
+        self.session.post = mock.Mock(side_effect=dropbox_utils.requests.exceptions.ConnectionError)
+        with self.assertRaises(DropboxTokenError), self.assertLogs('clientUpdates', 'ERROR'):
+            manager.get_client()
+
+
+@override_settings(DROPBOX=DROPBOX, CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DropboxLinkTests(TestCase):
+    """ Shared folder links are served from the process cache and DropboxLinks, and resolved when missing. """
+
+    def setUp(self):
+        cache.clear()
+        self.enterContext(mock.patch.dict(dropbox_utils._link_cache, clear=True))
+        self.dropbox_link = self.enterContext(
+            mock.patch.object(dropbox_utils, 'dropboxLink', return_value='https://dropbox.test/new'))
+
+    def link_checks(self):
+        return BackgroundJob.objects.filter(job_type=DROPBOX_LINK_CHECK).count()
+
+    def test_stored_link_is_served_without_dropbox(self):
+        DropboxLinks.objects.create(pwsid=PWSID, url_shared_folder='https://dropbox.test/stored')
+        with self.assertLogs('clientUpdates', 'INFO'):
+            self.assertEqual(get_dropbox_link(PWSID), 'https://dropbox.test/stored')
+        self.assertEqual(self.link_checks(), 1)
+
+        # Then from the process cache
+        with self.assertNumQueries(0):
+            self.assertEqual(get_dropbox_link(PWSID), 'https://dropbox.test/stored')
+        self.dropbox_link.assert_not_called()
+
+    def test_link_checks_are_rate_limited(self):
+        DropboxLinks.objects.create(pwsid=PWSID, url_shared_folder='https://dropbox.test/stored')
+        with self.assertLogs('clientUpdates', 'INFO'):
+            get_dropbox_link(PWSID)
+        BackgroundJob.objects.update(status=BackgroundJob.DONE)
+
+        # A process cache miss, e.g. in another worker, doesn't check the link again within the interval
+        dropbox_utils._link_cache.clear()
+        self.assertEqual(get_dropbox_link(PWSID), 'https://dropbox.test/stored')
+        self.assertEqual(self.link_checks(), 1)
+
+    def test_missing_link_is_stored_on_the_newest_row(self):
+        older = DropboxLinks.objects.create(pwsid=PWSID, url_file_request='https://dropbox.test/request-1')
+        newest = DropboxLinks.objects.create(pwsid=PWSID, url_file_request='https://dropbox.test/request-2')
+        with self.assertLogs('clientUpdates', 'INFO'):
+            self.assertEqual(get_dropbox_link(PWSID), 'https://dropbox.test/new')
+
+        # File request URLs are kept
+        self.assertEqual(list(DropboxLinks.objects.order_by('row_names').values_list(
+            'row_names', 'url_file_request', 'url_shared_folder')), [
+            (older.pk, 'https://dropbox.test/request-1', None),
+            (newest.pk, 'https://dropbox.test/request-2', 'https://dropbox.test/new'),
+        ])
+        self.assertEqual(self.link_checks(), 0)
+
+    def test_missing_link_creates_a_row(self):
+        with self.assertLogs('clientUpdates', 'INFO'):
+            get_dropbox_link(PWSID)
+        self.assertEqual(list(DropboxLinks.objects.values_list('pwsid', 'url_file_request', 'url_shared_folder')),
+                         [(PWSID, None, 'https://dropbox.test/new')])
+
+    def test_unresolved_link_is_none(self):
+        self.dropbox_link.side_effect = DropboxTokenError
+        with self.assertLogs('clientUpdates', 'ERROR'):
+            self.assertIsNone(get_dropbox_link(PWSID))
+
+    def test_check_keeps_a_valid_link(self):
+        DropboxLinks.objects.create(pwsid=PWSID, url_shared_folder='https://dropbox.test/stored')
+        with mock.patch.object(dropbox_utils.dropbox_clients, 'call') as call:
+            self.assertEqual(check_dropbox_link(PWSID), 'https://dropbox.test/stored')
+        call.assert_called_once()
+        self.dropbox_link.assert_not_called()
+
+    def test_check_replaces_a_revoked_link(self):
+        DropboxLinks.objects.create(pwsid=PWSID, url_file_request='https://dropbox.test/request',
+                                    url_shared_folder='https://dropbox.test/revoked')
+        with mock.patch.object(dropbox_utils.dropbox_clients, 'call',
+                               side_effect=ApiError('request-id', 'shared_link_not_found', None, None)), \
+                self.assertLogs('clientUpdates', 'INFO'):
+            self.assertEqual(check_dropbox_link(PWSID), 'https://dropbox.test/new')
+        self.assertEqual(list(DropboxLinks.objects.values_list('url_file_request', 'url_shared_folder')),
+                         [('https://dropbox.test/request', 'https://dropbox.test/new')])
+        self.assertEqual(get_dropbox_link(PWSID), 'https://dropbox.test/new')
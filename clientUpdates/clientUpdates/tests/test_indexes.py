@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from clientUpdates.models import (Source, PfasResult, FlowRate, ClaimSource, ClaimPfasResult, ClaimFlowRate,
+                                  TB_ClaimSource, TB_ClaimPfasResult, TB_ClaimFlowRate, phase2AnnualFlow,
+                                  phase2PfasResults, pwsCreds)
+from clientUpdates.utils.activity import ACTIVITY_PAGE_SIZE
+from clientUpdates.utils.tables_utils import get_latest_entries
+
+PWSID, SOURCE_NAME = 'TX0000001', 'Well 1'
+
+
+class IndexTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # A PWS with a few years of water provider updates on many sources, so the planner picks between the
+        # per-source and the per-PWS indexes on realistic statistics rather than on empty tables
+        submit_date = timezone.make_aware(datetime(2024, 1, 1))
+        pfas_results, flow_rates = [], []
+        for k in range(30):
+            source_name = f"Well {k}"
+            for revision in range(2):
+                updated = {'pwsid': PWSID, 'source_name': source_name, 'updated_by_water_provider': True,
+                           'submit_date': submit_date + timedelta(days=k, hours=revision)}
+                pfas_results += [PfasResult(analyte=analyte, result_ppt=1.0, **updated)
+                                 for analyte in ('PFOA', 'PFOS', 'PFNA', 'PFHxS', 'GenX')]
+                flow_rates += [FlowRate(source_variable='AFR', year=year, flow_rate_gpm=10.0, **updated)
+                               for year in range(2014, 2024)]
+                flow_rates.append(FlowRate(source_variable='VFR', flow_rate_gpm=20.0, **updated))
+        PfasResult.objects.bulk_create(pfas_results)
+        FlowRate.objects.bulk_create(flow_rates)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE pfas_result, flow_rate")
+
+    def explain(self, queryset):
+        # The test tables are tiny, so the planner would pick a sequential scan whatever the indexes
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, f"{index_name} isn't used by:\n{queryset.query}\n{plan}")
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN plans are checked on PostgreSQL only")
+class SourceDetailIndexTests(IndexTestCase):
+    """ The per-source queries of the source detail and form pages can use the (pwsid, source_name) indexes. """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for k in range(3):
+            source_name = f"Well {k}"
+            ClaimSource.objects.create(pwsid=PWSID, source_name=source_name)
+            ClaimPfasResult.objects.create(pwsid=PWSID, source_name=source_name, analyte='PFOA', result_ppt=1.0)
+            ClaimFlowRate.objects.create(pwsid=PWSID, source_name=source_name, source_variable='AFR', year=2020)
+
+    def test_claim_queries(self):
+        for claim_source, claim_pfas_result, claim_flow_rate, prefix in (
+                (ClaimSource, ClaimPfasResult, ClaimFlowRate, 'claim'),
+                (TB_ClaimSource, TB_ClaimPfasResult, TB_ClaimFlowRate, 'claim_tb')):
+            source_filter = {'pwsid': PWSID, 'source_name': SOURCE_NAME}
+            self.assertUsesIndex(claim_source.objects.filter(**source_filter), f'{prefix}_source_source_idx')
+            self.assertUsesIndex(
+                claim_pfas_result.objects.filter(**source_filter).exclude(analyte__isnull=True).order_by('-analyte'),
+                'claim_pfas_result_source_idx' if prefix == 'claim' else 'claim_tb_pfas_source_idx')
+            self.assertUsesIndex(
+                claim_flow_rate.objects.filter(**source_filter),
+                'claim_flow_rate_source_idx' if prefix == 'claim' else 'claim_tb_flow_source_idx')
+
+    def test_latest_update_queries(self):
+        pfas_results = PfasResult.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME, updated_by_water_provider=True)
+        self.assertUsesIndex(get_latest_entries(pfas_results), 'pfas_result_latest_rev_idx')
+
+        flow_rates = FlowRate.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME, updated_by_water_provider=True)
+        self.assertUsesIndex(get_latest_entries(flow_rates, source_variable='AFR'), 'flow_rate_latest_rev_idx')
+        self.assertUsesIndex(get_latest_entries(flow_rates, source_variable='VFR'), 'flow_rate_latest_rev_idx')
+
+    def test_source_and_phase2_queries(self):
+        self.assertUsesIndex(Source.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME), 'source_source_idx')
+        self.assertUsesIndex(phase2AnnualFlow.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME),
+                             'phase2_annual_source_idx')
+        self.assertUsesIndex(phase2PfasResults.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME),
+                             'phase2_pfas_source_idx')
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN plans are checked on PostgreSQL only")
+class PwsCredsIndexTests(IndexTestCase):
+    """ The login and Phase 2 form lookups of consortium_pws_creds use its indexes. """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        pwsCreds.objects.create(pwsid=PWSID, pws_name='Test Water Supply', username=PWSID, password='secret')
+
+    def test_login_lookup(self):
+        self.assertUsesIndex(pwsCreds.objects.filter(username=PWSID).values_list('password', flat=True),
+                             'pws_creds_username_idx')
+
+    def test_pwsid_lookup(self):
+        self.assertUsesIndex(pwsCreds.objects.filter(pwsid=PWSID), 'pws_creds_pwsid_idx')
+
+
+@skipUnless(connection.vendor == 'postgresql', "EXPLAIN plans are checked on PostgreSQL only")
+class ActivityIndexTests(IndexTestCase):
+    """ Each table of the activity feed is read in (pwsid, submit_date, row_names) index order. """
+
+    def test_activity_queries(self):
+        for model, index_name in ((PfasResult, 'pfas_result_pwsid_submit_idx'),
+                                  (FlowRate, 'flow_rate_pwsid_submit_idx')):
+            feed = (model.objects.filter(pwsid=PWSID, submit_date__isnull=False)
+                    .order_by('-submit_date', '-row_names')[:ACTIVITY_PAGE_SIZE + 1])
+            self.assertUsesIndex(feed, index_name)
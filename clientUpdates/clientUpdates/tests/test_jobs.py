@@ -0,0 +1,124 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from clientUpdates.models import BackgroundJob, ClaimSource
+from clientUpdates.utils import jobs
+from clientUpdates.utils.jobs import (enqueue_job, enqueue_source_recompute, claim_next_job, run_job,
+                                      RECOMPUTE_SOURCE, DROPBOX_UPLOAD)
+
+PWSID, SOURCE_NAME = 'TX0000001', 'Well 1'
+BACKGROUND_JOBS = {'workers': 1, 'max_attempts': 3, 'retry_backoff_seconds': 10, 'poll_interval_seconds': 0,
+                   'stale_after_seconds': 600}
+
+
+@override_settings(BACKGROUND_JOBS=BACKGROUND_JOBS)
+class JobQueueTests(TestCase):
+    """ Jobs are deduplicated while pending, retried with backoff and reclaimed when their worker died. """
+
+    def enqueue_failing(self):
+        return enqueue_job('failing', 'failing:1', {})
+
+    def test_pending_jobs_are_deduplicated(self):
+        job = enqueue_source_recompute(PWSID, 'Well 1')
+        self.assertEqual(enqueue_source_recompute(PWSID, 'Well 2'), job)
+        self.assertEqual(BackgroundJob.objects.count(), 1)
+
+        # Once a worker claims the job, an update needs a new one
+        self.assertEqual(claim_next_job(), job)
+        self.assertNotEqual(enqueue_source_recompute(PWSID, 'Well 1'), job)
+        self.assertEqual(BackgroundJob.objects.filter(status=BackgroundJob.PENDING).count(), 1)
+
+    def test_enqueue_retries_when_the_competing_job_was_claimed(self):
+        # The concurrent insert wins and its job is claimed before get_or_create can read it back
+        get_or_create = BackgroundJob.objects.get_or_create
+        calls = []
+
+        def racing_get_or_create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise IntegrityError('duplicate key value violates unique constraint "background_job_pending_uniq"')
+            return get_or_create(**kwargs)
+
+        with mock.patch.object(BackgroundJob.objects, 'get_or_create', side_effect=racing_get_or_create):
+            job = enqueue_source_recompute(PWSID, SOURCE_NAME)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual((job.job_type, job.status), (RECOMPUTE_SOURCE, BackgroundJob.PENDING))
+
+    def test_enqueue_gives_up_after_repeated_conflicts(self):
+        with mock.patch.object(BackgroundJob.objects, 'get_or_create', side_effect=IntegrityError) as mocked:
+            with self.assertRaises(IntegrityError):
+                enqueue_source_recompute(PWSID, SOURCE_NAME)
+        self.assertEqual(mocked.call_count, jobs.ENQUEUE_ATTEMPTS)
+
+    def test_failed_jobs_are_retried_with_backoff(self):
+        self.enqueue_failing()
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'failing': mock.Mock(side_effect=ValueError('boom'))}), \
+                self.assertLogs('clientUpdates', 'WARNING'):
+            for attempt, delay in ((1, 10), (2, 20)):
+                before = timezone.now()
+                job = run_job(claim_next_job())
+                self.assertEqual((job.status, job.attempts, job.last_error),
+                                 (BackgroundJob.PENDING, attempt, 'ValueError: boom'))
+                self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+                self.assertLess(job.run_after, before + timedelta(seconds=delay + 5))
+
+                # Not due until the backoff has passed
+                self.assertIsNone(claim_next_job())
+                BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+            job = run_job(claim_next_job())
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.FAILED, 3))
+        self.assertIsNone(claim_next_job())
+
+    def test_stale_running_jobs_are_reclaimed(self):
+        job = self.enqueue_failing()
+        self.assertEqual(claim_next_job(), job)
+        # A job still locked by a live worker isn't claimed twice
+        self.assertIsNone(claim_next_job())
+
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+        reclaimed = claim_next_job()
+        self.assertEqual((reclaimed, reclaimed.status, reclaimed.attempts), (job, BackgroundJob.RUNNING, 2))
+
+
+@override_settings(BACKGROUND_JOBS=BACKGROUND_JOBS,
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class UpdateJobsTests(TestCase):
+    """ A water provider update returns after enqueueing its recompute and file upload. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username=PWSID)
+        ClaimSource.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, all_nds=False)
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.client.force_login(self.user)
+
+    def test_update_enqueues_recompute_and_upload(self):
+        with mock.patch('clientUpdates.utils.jobs.upload_local_file_to_dropbox') as upload, \
+                self.assertLogs('clientUpdates', 'INFO'):
+            response = self.client.post(reverse('update-max-flow-rate'), {
+                'pwsid': PWSID, 'source_name': SOURCE_NAME, 'flow_rate': '100', 'unit': 'gpm',
+                'filename': SimpleUploadedFile('pump.pdf', b'%PDF-1.4'),
+            })
+        self.assertRedirects(response, reverse('source-detail', args=['3M_DuPont', PWSID, SOURCE_NAME]),
+                             fetch_redirect_response=False)
+        upload.assert_not_called()
+
+        self.assertEqual(sorted(BackgroundJob.objects.values_list('job_type', flat=True)),
+                         [DROPBOX_UPLOAD, RECOMPUTE_SOURCE])
+        local_path = BackgroundJob.objects.get(job_type=DROPBOX_UPLOAD).payload['local_path']
+        self.assertEqual(local_path, f'{PWSID}/Flow Rate/pump.pdf')
+        self.assertTrue(default_storage.exists(local_path))
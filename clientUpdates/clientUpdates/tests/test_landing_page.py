@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clientUpdates.models import Pws, ClaimPws, ClaimSubmission, phase2PwsInfo, phase2SourceInfo
+
+PWSID, PWS_NAME = 'TX0000001', 'Test Water Supply'
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LandingPageQueryTests(TestCase):
+    """
+    The landing page runs the user lookup, the landing page summary and, on a cold cache, the Pws and
+    ClaimPws lookups of the PWS profile, whichever branch it renders.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username=PWSID)
+        Pws.objects.create(pwsid=PWSID, pws_name=PWS_NAME, form_userid=PWSID)
+        ClaimPws.objects.create(pwsid=PWSID, pws_name=PWS_NAME)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get(self):
+        return self.client.get(reverse('landing_page'))
+
+    def test_claim_submission_branch(self):
+        ClaimSubmission.objects.create(pwsid=PWSID, any_claim_submission=True)
+
+        with self.assertNumQueries(4):
+            response = self.get()
+        self.assertTemplateUsed(response, 'landing_page.html')
+        self.assertEqual(response.context['pws'].pwsid, PWSID)
+
+        # The PWS profile is cached for the next requests
+        with self.assertNumQueries(2):
+            self.get()
+
+    def test_phase2_branch(self):
+        phase2PwsInfo.objects.create(pwsid=PWSID, pws_name=PWS_NAME, draft_complete='draft')
+        for source_name in ('Well 1', 'Well 2'):
+            phase2SourceInfo.objects.create(pwsid=PWSID, pws_name=PWS_NAME, source_name=source_name,
+                                            draft_complete='complete')
+
+        with self.assertNumQueries(4):
+            response = self.get()
+        self.assertTemplateUsed(response, 'phase2_landing_page.html')
+        self.assertEqual([(record.pwsid, record.draft_complete) for record in response.context['pwsGenInfo']],
+                         [(PWSID, 'draft')])
+        self.assertEqual([record.source_name for record in response.context['sourceGenInfo']], ['Well 1', 'Well 2'])
+
+        with self.assertNumQueries(2):
+            self.get()
+
+    def test_other_pws_rows_are_ignored(self):
+        ClaimSubmission.objects.create(pwsid='TX0000002')
+        phase2SourceInfo.objects.create(pwsid='TX0000002', source_name='Well 9')
+
+        response = self.get()
+        self.assertTemplateUsed(response, 'phase2_landing_page.html')
+        self.assertEqual((response.context['pwsGenInfo'], response.context['sourceGenInfo']), ([], []))
@@ -0,0 +1,113 @@
+import random
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from clientUpdates.management.commands.benchmark_latest_entries import get_latest_entries_correlated
+from clientUpdates.models import PfasResult, FlowRate
+from clientUpdates.utils.tables_utils import get_latest_entries
+
+PWSID = 'TX0000001'
+SOURCE_NAMES = ('Well 1', 'Well 2', 'Well 3')
+SUBMIT_DATE = timezone.make_aware(datetime(2024, 1, 1))
+TIE_PK = 1_000_000
+
+# (model, source_variable) of the latest-entry lookups
+LOOKUPS = ((PfasResult, None), (FlowRate, 'AFR'), (FlowRate, 'VFR'))
+
+
+class LatestEntriesTests(TestCase):
+    """ get_latest_entries picks the same revisions with DISTINCT ON and with the correlated subquery fallback. """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        # Distinct submit dates, inserted in random order, so the latest revision is never the last row inserted
+        minutes = rng.sample(range(100_000), 400)
+        pfas_results, flow_rates = [], []
+        for source_name in SOURCE_NAMES:
+            for _ in range(4):
+                updated = {'pwsid': PWSID, 'source_name': source_name, 'updated_by_water_provider': True}
+                pfas_results += [
+                    PfasResult(analyte=analyte, result_ppt=rng.uniform(0, 50),
+                               submit_date=SUBMIT_DATE + timedelta(minutes=minutes.pop()), **updated)
+                    for analyte in ('PFOA', 'PFOS', 'GenX')]
+                flow_rates += [
+                    FlowRate(source_variable='AFR', year=year, flow_rate_gpm=rng.uniform(0, 500),
+                             submit_date=SUBMIT_DATE + timedelta(minutes=minutes.pop()), **updated)
+                    for year in (2019, 2020, 2021)]
+                flow_rates.append(FlowRate(source_variable='VFR', flow_rate_gpm=rng.uniform(0, 500),
+                                           submit_date=SUBMIT_DATE + timedelta(minutes=minutes.pop()), **updated))
+        PfasResult.objects.bulk_create(pfas_results)
+        FlowRate.objects.bulk_create(flow_rates)
+
+    def implementations(self):
+        """ Yields the name of each implementation available on this database, while it is the one in use. """
+        if connection.features.can_distinct_on_fields:
+            yield 'DISTINCT ON'
+        with mock.patch.object(connection.features, 'can_distinct_on_fields', False):
+            yield 'correlated subquery'
+
+    def latest(self, queryset, source_variable=None, by_source=False):
+        return sorted(get_latest_entries(queryset, source_variable=source_variable, by_source=by_source)
+                      .values_list('row_names', flat=True))
+
+    def updates(self, model, **filters):
+        return model.objects.filter(pwsid=PWSID, updated_by_water_provider=True, **filters)
+
+    def test_matches_previous_query(self):
+        for model, source_variable in LOOKUPS:
+            for source_name in SOURCE_NAMES:
+                updates = self.updates(model, source_name=source_name)
+                expected = sorted(get_latest_entries_correlated(updates, source_variable)
+                                  .values_list('row_names', flat=True))
+                self.assertEqual(len(expected), 1 if source_variable == 'VFR' else 3)
+                for implementation in self.implementations():
+                    with self.subTest(model=model.__name__, source_variable=source_variable,
+                                      source_name=source_name, implementation=implementation):
+                        self.assertEqual(self.latest(updates, source_variable), expected)
+
+    def test_by_source_matches_per_source(self):
+        for model, source_variable in LOOKUPS:
+            expected = sorted(row_name for source_name in SOURCE_NAMES
+                              for row_name in self.latest(self.updates(model, source_name=source_name),
+                                                          source_variable))
+            for implementation in self.implementations():
+                with self.subTest(model=model.__name__, source_variable=source_variable,
+                                  implementation=implementation):
+                    self.assertEqual(self.latest(self.updates(model), source_variable, by_source=True), expected)
+
+    def test_tied_submit_dates_pick_the_highest_primary_key(self):
+        latest = SUBMIT_DATE + timedelta(days=365)
+        updated = {'pwsid': PWSID, 'source_name': 'Well 1', 'updated_by_water_provider': True, 'submit_date': latest}
+
+        pks = iter(range(TIE_PK, TIE_PK + 10))
+
+        def create_tied(model, **fields):
+            lowest, highest = [model.objects.create(pk=next(pks), **fields, **updated) for _ in range(2)]
+            return highest, lowest
+
+        tied = {
+            (PfasResult, None): create_tied(PfasResult, analyte='PFOA', result_ppt=1.0),
+            (FlowRate, 'AFR'): create_tied(FlowRate, source_variable='AFR', year=2020, flow_rate_gpm=1.0),
+            (FlowRate, 'VFR'): create_tied(FlowRate, source_variable='VFR', flow_rate_gpm=1.0),
+        }
+
+        if connection.vendor == 'postgresql':
+            # A table scan returns the tied rows in insertion order, lowest primary key first, so the ordering of
+            # the query rather than the index on the latest revisions has to pick the highest
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_indexscan = off; SET LOCAL enable_bitmapscan = off")
+
+        for (model, source_variable), (highest, lowest) in tied.items():
+            for implementation in self.implementations():
+                for by_source in (False, True):
+                    with self.subTest(model=model.__name__, source_variable=source_variable,
+                                      implementation=implementation, by_source=by_source):
+                        latest_rows = self.latest(self.updates(model, source_name='Well 1'), source_variable,
+                                                  by_source=by_source)
+                        self.assertIn(highest.pk, latest_rows)
+                        self.assertNotIn(lowest.pk, latest_rows)
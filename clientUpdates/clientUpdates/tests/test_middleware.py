@@ -0,0 +1,69 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+
+from clientUpdates.middleware import DebugHeadersMiddleware
+
+
+class DebugHeadersMiddlewareTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        metrics_settings = override_settings(REQUEST_METRICS={
+            'slow_request_ms': 60_000, 'server_timing_header': True, 'directory': directory.name,
+            'sample_size': 10, 'flush_interval_seconds': 3600,
+        })
+        metrics_settings.enable()
+        self.addCleanup(metrics_settings.disable)
+        self.request = RequestFactory().get('/export/')
+        # As in the test client, closing a response mustn't close the connection of the test transaction
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+
+    def samples(self, middleware):
+        return middleware.metrics.snapshot().get('unresolved', {}).get('samples', [])
+
+    def test_response(self):
+        def view(request):
+            User.objects.count()
+            return HttpResponse("ok")
+
+        middleware = DebugHeadersMiddleware(view)
+        response = middleware(self.request)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        self.assertEqual([query_count for _, _, query_count in self.samples(middleware)], [1])
+
+    def test_streaming_response_is_recorded_when_done(self):
+        def rows():
+            for _ in range(3):
+                yield f"{User.objects.count()}\n"
+
+        middleware = DebugHeadersMiddleware(lambda request: StreamingHttpResponse(rows()))
+        response = middleware(self.request)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.samples(middleware), [])
+
+        # Recorded once the stream is read to the end, and only once when the response is then closed
+        self.assertEqual(b''.join(response.streaming_content), b'0\n0\n0\n')
+        response.close()
+
+        (wall_ms, db_ms, query_count), = self.samples(middleware)
+        self.assertEqual(query_count, 3)
+        self.assertGreaterEqual(wall_ms, db_ms)
+
+        # Queries after the stream is closed aren't counted for it
+        User.objects.count()
+        self.assertEqual(self.samples(middleware)[0][2], 3)
+
+    def test_streaming_response_closed_early(self):
+        middleware = DebugHeadersMiddleware(lambda request: StreamingHttpResponse(iter([b'a', b'b'])))
+        response = middleware(self.request)
+        next(iter(response))
+        response.close()
+        self.assertEqual(len(self.samples(middleware)), 1)
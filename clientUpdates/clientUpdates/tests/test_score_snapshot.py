@@ -0,0 +1,64 @@
+import tempfile
+
+from django.test import TestCase
+
+from clientUpdates.models import Source, ClaimSource, ClaimPfasResult, ClaimFlowRate
+from clientUpdates.utils.score_snapshot import (write_score_snapshot, read_score_snapshot, rescore_snapshot,
+                                                compare_scores, STORED_SCORE_COLUMNS)
+from clientUpdates.utils.updates import bulk_update_ehe_source_table
+
+PWSID = 'TX0000001'
+
+
+class ScoreSnapshotTests(TestCase):
+    """ The 3M/DuPont partition freezes the stored Source scores, and a rescore reports how they differ. """
+
+    @classmethod
+    def setUpTestData(cls):
+        ClaimSource.objects.create(pwsid=PWSID, source_name='Well 1', all_nds=False)
+        ClaimPfasResult.objects.create(pwsid=PWSID, source_name='Well 1', analyte='PFOA', result_ppt=4.0)
+        ClaimFlowRate.objects.create(pwsid=PWSID, source_name='Well 1', source_variable='VFR', flow_rate_gpm=100.0)
+        for year in (2019, 2020, 2021):
+            ClaimFlowRate.objects.create(pwsid=PWSID, source_name='Well 1', source_variable='AFR', year=year,
+                                         flow_rate_gpm=50.0)
+        # Stale stored scores for the claimed source, and a source without claim rows
+        Source.objects.create(pwsid=PWSID, source_name='Well 1', pfas_score=1.0, pfas_score_method='stale', afr=1.0,
+                              base_score=1.0, gfe_tyco=1.0, gfe_basf=1.0, gfe_total_basf_tyco=2.0, all_nds=False,
+                              reg_bump=False)
+        Source.objects.create(pwsid=PWSID, source_name='Well 2', pfas_score=3.0, pfas_score_method='kept', afr=20.0,
+                              ehe_afr_note='kept note', base_score=0.0, gfe_tyco=0.0, gfe_basf=0.0,
+                              gfe_total_basf_tyco=0.0, all_nds=False, reg_bump=True)
+
+    def snapshot(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.assertEqual(write_score_snapshot(directory.name, claims=['3M_DuPont']), {'3M_DuPont': 2})
+        return read_score_snapshot(directory.name)
+
+    def stored_scores(self):
+        return [[getattr(source, column) for column in STORED_SCORE_COLUMNS]
+                for source in Source.objects.order_by('source_name')]
+
+    def test_snapshot_holds_stored_scores_and_recomputed_inputs(self):
+        table = self.snapshot()
+        self.assertEqual([[table[column][i].as_py() for column in STORED_SCORE_COLUMNS] for i in range(2)],
+                         self.stored_scores())
+        self.assertEqual(table['claimed'].to_pylist(), [True, False])
+        self.assertEqual(table['pfoa_result'].to_pylist()[0], 4.0)
+        self.assertEqual(table['max_vfr'].to_pylist(), [100.0, None])
+
+    def test_rescore_reports_diffs_against_stored_scores(self):
+        before = self.snapshot()
+        after = rescore_snapshot(before)
+        comparison = compare_scores(before, after)
+        # The claimed source is rescored; the other keeps its PFAS score and AFR but gets its base score and GFEs
+        self.assertEqual({column: change['changed'] for column, change in comparison.items()}, {
+            'pfas_score': 1, 'afr': 1, 'base_score': 2, 'gfe_tyco': 2, 'gfe_basf': 2, 'gfe_total_basf_tyco': 2,
+        })
+        self.assertEqual(comparison['pfas_score']['total_before'], 4.0)
+
+        # The rescore is what bulk_update_ehe_source_table stores
+        bulk_update_ehe_source_table()
+        self.assertEqual([[after[column][i].as_py() for column in STORED_SCORE_COLUMNS] for i in range(2)],
+                         self.stored_scores())
+        self.assertTrue(all(change['changed'] == 0 for change in compare_scores(self.snapshot(), after).values()))
@@ -0,0 +1,99 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clientUpdates.sessions import SessionStore
+
+THRESHOLD = 300
+
+
+def session_writes(queries):
+    return [query['sql'] for query in queries
+            if query['sql'].startswith(('INSERT', 'UPDATE')) and 'django_session' in query['sql']]
+
+
+@override_settings(SESSION_DB_WRITE_THRESHOLD=THRESHOLD,
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SessionStoreTests(TestCase):
+    """ Unchanged sessions slide their expiry in the cache and write the database once per threshold. """
+
+    def setUp(self):
+        cache.clear()
+        session = SessionStore()
+        session['pwsid'] = 'TX0000001'
+        session.save(must_create=True)
+        self.session_key = session.session_key
+        self.written_at = session[SessionStore.db_written_at_key]
+
+    def load(self):
+        session = SessionStore(self.session_key)
+        # Read the session, as a request does before its response saves it
+        session.keys()
+        return session
+
+    def save_after(self, seconds, session=None):
+        """ Saves the session (reloaded if not given) seconds after it was last written to the database. """
+        session = session or self.load()
+        with mock.patch('clientUpdates.sessions.time.time', return_value=self.written_at + seconds), \
+                CaptureQueriesContext(connection) as queries:
+            session.save()
+        return session_writes(queries)
+
+    def db_session(self):
+        return SessionStore().decode(Session.objects.get(session_key=self.session_key).session_data)
+
+    def test_unchanged_session_skips_the_database_within_the_threshold(self):
+        expire_date = Session.objects.get(session_key=self.session_key).expire_date
+        session = self.load()
+        with mock.patch.object(session._cache, 'touch', wraps=session._cache.touch) as touch:
+            self.assertEqual(self.save_after(THRESHOLD - 1, session), [])
+        # The cached copy's expiry slides instead
+        touch.assert_called_once_with(session.cache_key, session.get_expiry_age())
+        self.assertEqual(Session.objects.get(session_key=self.session_key).expire_date, expire_date)
+
+    def test_unchanged_session_is_written_once_the_threshold_has_passed(self):
+        self.assertEqual(len(self.save_after(THRESHOLD)), 1)
+        self.assertEqual(self.db_session()[SessionStore.db_written_at_key], self.written_at + THRESHOLD)
+        # The threshold restarts from the new write
+        self.written_at += THRESHOLD
+        self.assertEqual(self.save_after(1), [])
+
+    def test_modified_session_is_always_written(self):
+        session = self.load()
+        session['source_name'] = 'Well 1'
+        self.assertEqual(len(self.save_after(1, session)), 1)
+        self.assertEqual(self.db_session()['source_name'], 'Well 1')
+
+    def test_session_whose_cached_copy_was_evicted_is_written(self):
+        session = self.load()
+        cache.clear()
+        self.assertEqual(len(self.save_after(1, session)), 1)
+        self.assertEqual(self.load()['pwsid'], 'TX0000001')
+
+
+@override_settings(SESSION_DB_WRITE_THRESHOLD=THRESHOLD,
+                   CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SessionRequestTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create(username='TX0000001'))
+
+    def test_page_views_dont_write_the_session(self):
+        # SESSION_SAVE_EVERY_REQUEST saves the session on every response
+        for _ in range(3):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(reverse('supplemental_info')).status_code, 200)
+            self.assertEqual(session_writes(queries), [])
+
+        with mock.patch('clientUpdates.sessions.time.time', return_value=time.time() + THRESHOLD), \
+                CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('supplemental_info'))
+        self.assertEqual(len(session_writes(queries)), 1)
@@ -0,0 +1,77 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from clientUpdates.models import ClaimSource, ClaimPfasResult, ClaimFlowRate, FlowRate, PfasResult
+from clientUpdates.utils.source_state import rebuild_source_state, get_source_current_state
+
+PWSID, SOURCE_NAME = 'TX0000001', 'Well 1'
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SourceDetailStateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username=PWSID)
+        ClaimSource.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, all_nds=False)
+        ClaimPfasResult.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, analyte='PFOA', result_ppt=4.0,
+                                       analysis_method='537.1', filename='pfoa.pdf')
+        ClaimPfasResult.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, analyte='PFOS', result_ppt=2.0,
+                                       analysis_method='537.1', filename='pfos.pdf')
+        # Water provider updates raising PFOS above the claim, and lowering PFOA below it
+        PfasResult.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, analyte='PFOS', result_ppt=6.0,
+                                  updated_by_water_provider=True)
+        PfasResult.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, analyte='PFOA', result_ppt=1.0,
+                                  updated_by_water_provider=True)
+        ClaimFlowRate.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, source_variable='VFR',
+                                     flow_rate_gpm=100.0, filename='vfr.pdf')
+        for year, flow_rate_gpm in ((2013, 80.0), (2020, 50.0), (2021, 60.0)):
+            ClaimFlowRate.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, source_variable='AFR', year=year,
+                                         flow_rate_gpm=flow_rate_gpm, filename=f'{year}.pdf')
+        # A water provider update raising the 2021 annual above the claim
+        FlowRate.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, source_variable='AFR', year=2021,
+                                flow_rate_gpm=75.0, updated_by_water_provider=True)
+        rebuild_source_state([PWSID])
+
+    def get(self):
+        self.client.force_login(self.user)
+        return self.client.get(reverse('source-detail', args=['3M_DuPont', PWSID, SOURCE_NAME]))
+
+    def test_flow_rates_from_current_state(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+
+        max_flow_rate = response.context['max_flow_rate']
+        self.assertEqual((max_flow_rate['flow_rate_gpm'], max_flow_rate['filename']), (100.0, 'vfr.pdf'))
+        self.assertEqual(max_flow_rate['flow_rate_gpy'], 100.0 * 1440 * 365)
+
+        # 2013 isn't scored, so it isn't in the state and is listed as claimed
+        self.assertEqual([(annual['year'], annual['flow_rate_gpm'], annual['filename'])
+                          for annual in response.context['annuals']],
+                         [(2013.0, 80.0, '2013.pdf'), (2020.0, 50.0, '2020.pdf'), (2021.0, 75.0, None)])
+
+    def test_pfas_results_from_current_state(self):
+        # The values the scores use: the claim PFOA, which the lower update doesn't replace, and the updated PFOS
+        self.assertEqual([(result['analyte'], result['result_ppt'], result['analysis_method'], result['filename'])
+                          for result in self.get().context['pfas_results']],
+                         [('PFOS', 6.0, None, None), ('PFOA', 4.0, '537.1', 'pfoa.pdf')])
+
+    def test_claim_annual_without_year_is_skipped(self):
+        ClaimFlowRate.objects.create(pwsid=PWSID, source_name=SOURCE_NAME, source_variable='AFR', year=None,
+                                     flow_rate_gpm=500.0)
+        rebuild_source_state([PWSID])
+        self.assertEqual(get_source_current_state(PWSID, SOURCE_NAME)['max_annuals'],
+                         {'2020.0': 50.0, '2021.0': 75.0})
+
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([annual['year'] for annual in response.context['annuals']], [2013.0, 2020.0, 2021.0])
+
+    def test_source_without_state_row(self):
+        from clientUpdates.models import SourceCurrentState
+
+        SourceCurrentState.objects.all().delete()
+        annuals = self.get().context['annuals']
+        self.assertEqual([annual['flow_rate_gpm'] for annual in annuals], [80.0, 50.0, 75.0])
+        self.assertFalse(SourceCurrentState.objects.exists())
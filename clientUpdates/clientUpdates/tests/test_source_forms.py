@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clientUpdates.models import pwsCreds, phase2SourceInfo, phase2MaxFlow, phase2AnnualFlow, phase2PfasResults
+from clientUpdates.utils.form_options import years, pfasInitialData
+from clientUpdates.utils.form_utils import set_per_instance
+from clientUpdates.views import SOURCE_FORM_INVALID, SOURCE_FORM_MISMATCH
+
+PWSID, PWS_NAME, SOURCE_NAME = 'TX0000001', 'Test Water Supply', 'Well 1'
+
+
+def management_form(prefix, total, initial=0):
+    return {f'{prefix}-TOTAL_FORMS': str(total), f'{prefix}-INITIAL_FORMS': str(initial),
+            f'{prefix}-MIN_NUM_FORMS': '0', f'{prefix}-MAX_NUM_FORMS': '1000'}
+
+
+def source_form_data(annual_ids=(), pfas_ids=(), n_years=len(years), flow_rate=100.0):
+    """ POST data of a full source form submission; pass the row ids of an existing source to edit it. """
+    data = {
+        'source_name': SOURCE_NAME, 'source_type': 'Well', 'draft_complete': 'complete',
+        'comments_annual_flow': 'annual comments', 'comments_pfas': 'pfas comments',
+        'maxflow-flow_rate': '500', 'maxflow-units': 'GPM', 'maxflow-flow_determination': 'Pump capacity',
+    }
+
+    data.update(management_form('annualflow', n_years, len(annual_ids)))
+    for i in range(n_years):
+        data.update({f'annualflow-{i}-year': years[i % len(years)], f'annualflow-{i}-flow_rate': str(flow_rate),
+                     f'annualflow-{i}-units': 'GPM'})
+        if i < len(annual_ids):
+            data[f'annualflow-{i}-id'] = annual_ids[i]
+
+    data.update(management_form('pfas', len(pfasInitialData), len(pfas_ids)))
+    for i, initial in enumerate(pfasInitialData):
+        data.update({f'pfas-{i}-analyte': initial['analyte'], f'pfas-{i}-result': '2.5', f'pfas-{i}-units': 'ppt'})
+        if pfas_ids:
+            data[f'pfas-{i}-id'] = pfas_ids[i]
+    return data
+
+
+def write_queries(queries):
+    return [query['sql'].split()[0] + ' ' + query['sql'].split('"')[1] for query in queries
+            if query['sql'].startswith(('INSERT', 'UPDATE'))]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SourceFormSubmissionTests(TestCase):
+    """ A full source form submission writes each Phase 2 table with a single statement. """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username=PWSID)
+        pwsCreds.objects.create(pwsid=PWSID, pws_name=PWS_NAME, username=PWSID)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create(self, **kwargs):
+        return self.client.post(reverse('source-form-create'), source_form_data(**kwargs))
+
+    def test_create(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.create()
+        self.assertTemplateUsed(response, 'form_success.html')
+        self.assertEqual(write_queries(queries), [
+            'INSERT phase2_source_info', 'INSERT phase2_max_flow', 'INSERT phase2_annual_flow',
+            'INSERT phase2_pfas_results',
+        ])
+
+        annuals = phase2AnnualFlow.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME).order_by('year')
+        self.assertEqual(list(annuals.values_list('year', flat=True)), years)
+        self.assertEqual(set(annuals.values_list('pws_name', 'comments', 'draft_complete')),
+                         {(PWS_NAME, 'annual comments', 'complete')})
+        self.assertEqual(phase2PfasResults.objects.filter(pwsid=PWSID, source_name=SOURCE_NAME).count(),
+                         len(pfasInitialData))
+
+    def test_create_query_count(self):
+        # user, pwsCreds, SAVEPOINT, 4 INSERTs, RELEASE SAVEPOINT
+        with self.assertNumQueries(8):
+            self.create()
+
+    def test_edit(self):
+        self.create()
+        annual_ids = list(phase2AnnualFlow.objects.order_by('year').values_list('id', flat=True))
+        pfas_ids = list(phase2PfasResults.objects.order_by('id').values_list('id', flat=True))
+        url = reverse('source-form-edit', args=[PWSID, SOURCE_NAME])
+        data = source_form_data(annual_ids, pfas_ids, flow_rate=250.0)
+
+        # user, source info, max flow, pwsCreds, SAVEPOINT, 4 UPDATEs, RELEASE SAVEPOINT, and one SELECT per
+        # annual flow and PFAS row from formset validation of the hidden id field
+        with self.assertNumQueries(8 + len(annual_ids) + len(pfas_ids) + 4), \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data)
+        self.assertTemplateUsed(response, 'form_success.html')
+        self.assertEqual(write_queries(queries), [
+            'UPDATE phase2_source_info', 'UPDATE phase2_max_flow', 'UPDATE phase2_annual_flow',
+            'UPDATE phase2_pfas_results',
+        ])
+
+        self.assertEqual(set(phase2AnnualFlow.objects.values_list('flow_rate', flat=True)), {250.0})
+        self.assertEqual(phase2AnnualFlow.objects.count(), len(years))
+        self.assertEqual((phase2SourceInfo.objects.count(), phase2MaxFlow.objects.count()), (1, 1))
+
+    def test_annual_rows_must_match_years(self):
+        # One annual flow row too many used to be dropped silently; now the save fails, nothing is written and
+        # the form is shown again with an error
+        with self.assertLogs('clientUpdates', 'ERROR') as logs:
+            response = self.create(n_years=len(years) + 1)
+        self.assertIn(f"Expected {len(years)} year values to match {len(years) + 1} form rows.", logs.output[0])
+        self.assertTemplateUsed(response, 'source_form.html')
+        self.assertEqual(response.context['formError'], SOURCE_FORM_MISMATCH)
+        self.assertContains(response, 'alert-danger')
+        self.assertFalse(phase2SourceInfo.objects.exists())
+        self.assertFalse(phase2AnnualFlow.objects.exists())
+
+    @mock.patch('clientUpdates.views.get_dropbox_link', return_value='https://dropbox.test/folder')
+    def test_edit_annual_rows_must_match_years(self, get_dropbox_link):
+        self.create()
+        annual_ids = list(phase2AnnualFlow.objects.order_by('year').values_list('id', flat=True))
+        pfas_ids = list(phase2PfasResults.objects.order_by('id').values_list('id', flat=True))
+        data = source_form_data(annual_ids, pfas_ids, n_years=len(years) + 1, flow_rate=250.0)
+
+        with self.assertLogs('clientUpdates', 'ERROR'):
+            response = self.client.post(reverse('source-form-edit', args=[PWSID, SOURCE_NAME]), data)
+        self.assertTemplateUsed(response, 'source_form.html')
+        self.assertEqual(response.context['formError'], SOURCE_FORM_MISMATCH)
+        self.assertEqual(response.context['action'], f"url source-form-edit {PWSID} {SOURCE_NAME}")
+        self.assertEqual(set(phase2AnnualFlow.objects.values_list('flow_rate', flat=True)), {100.0})
+        self.assertEqual(phase2AnnualFlow.objects.count(), len(years))
+
+    def test_invalid_form_is_shown_again(self):
+        data = source_form_data()
+        data['maxflow-flow_rate'] = 'not a number'
+        response = self.client.post(reverse('source-form-create'), data)
+        self.assertTemplateUsed(response, 'source_form.html')
+        self.assertEqual(response.context['formError'], SOURCE_FORM_INVALID)
+        self.assertFalse(phase2SourceInfo.objects.exists())
+
+
+class SetPerInstanceTests(TestCase):
+
+    def test_sets_values_in_order(self):
+        instances = [phase2AnnualFlow(), phase2AnnualFlow()]
+        set_per_instance(instances, 'year', [2013, 2014])
+        self.assertEqual([instance.year for instance in instances], [2013, 2014])
+
+    def test_length_mismatch_raises(self):
+        for n_instances in (len(years) - 1, len(years) + 1):
+            with self.subTest(n_instances=n_instances), self.assertRaises(ValueError):
+                set_per_instance([phase2AnnualFlow() for _ in range(n_instances)], 'year', years)
@@ -38,7 +38,9 @@ urlpatterns = [
     path('contact/', views.contact_view, name='contact_default'),
     path('contact/<str:claim>/<path:source_name>/<int:message>', views.contact_view, name='contact_phase1'),
     path('activity/', views.activity_view, name='activity'),
+    path('activity/feed/', views.activity_feed, name='activity-feed'),
     path('source_payment_info/<str:claim>/', views.source_payment_info, name='source_payment_info'),
+    path('export/<str:claim>/<str:dataset>.csv', views.export_data, name='export-data'),
     path('supplemental_info/', views.supplemental_info, name='supplemental_info'),
     path('no_data_landing_page/', views.landing_page, name='no_data_landing_page'),
     path('no_data_contact/', views.no_data_contact_view, name='no_data_contact'),
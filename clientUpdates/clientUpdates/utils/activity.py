@@ -0,0 +1,122 @@
+import base64
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+
+ACTIVITY_PAGE_SIZE = 50
+
+# Tie-breaking rank of each table within rows that share a submit_date
+PFAS_RESULT_RANK = 1
+FLOW_RATE_RANK = 0
+
+
+def encode_activity_cursor(submit_date, rank, row_id):
+    """ Encode the position of an activity row as an opaque, URL-safe cursor. """
+    raw = f"{submit_date.isoformat()}|{rank}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_activity_cursor(cursor):
+    """
+    Returns:
+        tuple: (submit_date, rank, row_id), or None if the cursor is missing or malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        submit_date, rank, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(submit_date), int(rank), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _keyset_filter(rank, cursor):
+    """
+    Rows of a table (with the given rank) that come after the cursor in (submit_date, rank, row_names) DESC order.
+    Since the rank is constant within a table, the comparison reduces to a condition on submit_date and row_names.
+    """
+    if cursor is None:
+        return Q()
+    submit_date, cursor_rank, row_id = cursor
+    if rank < cursor_rank:
+        return Q(submit_date__lte=submit_date)
+    if rank > cursor_rank:
+        return Q(submit_date__lt=submit_date)
+    return Q(submit_date__lt=submit_date) | Q(submit_date=submit_date, row_names__lt=row_id)
+
+
+def format_activity_row(table_rank, submit_date, source_name, label, year, value, unit):
+    """ Format a PfasResult or FlowRate row of the feed the way the activity log displays it. """
+    if table_rank == PFAS_RESULT_RANK:
+        return {
+            'time': submit_date,
+            'source_name': source_name,
+            'table_name': 'PFAS Result',
+            'change': f"{label} value changed to {value} ng/L",
+        }
+    return {
+        'time': submit_date,
+        'source_name': source_name,
+        'table_name': 'Flow Rate',
+        'source_variable': label,  # Keep the original value for logic
+        'change': f"{'Annual Production for ' + str(int(year)) if label == 'AFR' else 'Max Flow Rate'} changed to {value} {unit}",
+    }
+
+
+def get_activity_page(pwsid, cursor=None, page_size=ACTIVITY_PAGE_SIZE):
+    """
+    Read one page of the activity log of a PWS, newest first.
+
+    PfasResult and FlowRate rows are merged in SQL with UNION ALL and ordered by (submit_date, table, row_names)
+    descending. Pages are addressed by a keyset cursor rather than an offset, so with the (pwsid, submit_date)
+    indexes every page costs the same no matter how long the history is.
+
+    Args:
+        pwsid: The PWSID whose changes are listed.
+        cursor: Cursor returned as next_cursor by the previous page, or None for the newest page.
+        page_size: Number of rows per page.
+
+    Returns:
+        dict with 'activity_logs' (list of formatted rows) and 'next_cursor' (None on the last page).
+    """
+    from ..models import PfasResult, FlowRate
+
+    cursor = decode_activity_cursor(cursor) if isinstance(cursor, str) else cursor
+    # Where the backend allows it (PostgreSQL), each table is limited to one page read in index order before the
+    # merge, so only 2 * page_size rows are read no matter how long the history is
+    limit_each_table = connections[PfasResult.objects.db].features.supports_slicing_ordering_in_compound
+
+    def feed_rows(queryset, rank, label, year, value):
+        # Annotations are defined in the same order for both tables so the UNION columns line up
+        rows = queryset.filter(_keyset_filter(rank, cursor), pwsid=pwsid, submit_date__isnull=False).annotate(
+            feed_rank=Value(rank),
+            feed_id=F('row_names'),
+            feed_submit_date=F('submit_date'),
+            feed_source_name=F('source_name'),
+            feed_label=label,
+            feed_year=year,
+            feed_value=value,
+            feed_unit=F('unit'),
+        ).values_list('feed_rank', 'feed_id', 'feed_submit_date', 'feed_source_name',
+                      'feed_label', 'feed_year', 'feed_value', 'feed_unit')
+        if limit_each_table:
+            rows = rows.order_by('-submit_date', '-row_names')[:page_size + 1]
+        return rows
+
+    rows = list(
+        feed_rows(PfasResult.objects.all(), PFAS_RESULT_RANK, F('analyte'),
+                  Value(None, output_field=FloatField()), F('result_ppt'))
+        .union(feed_rows(FlowRate.objects.all(), FLOW_RATE_RANK, F('source_variable'),
+                         F('year'), F('flow_rate')), all=True)
+        .order_by('-feed_submit_date', '-feed_rank', '-feed_id')[:page_size + 1]
+    )
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        rank, row_id, submit_date = rows[-1][:3]
+        next_cursor = encode_activity_cursor(submit_date, rank, row_id)
+
+    activity_logs = [format_activity_row(rank, *row) for rank, _, *row in rows]
+    return {'activity_logs': activity_logs, 'next_cursor': next_cursor}
@@ -0,0 +1,76 @@
+import hashlib
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
+
+
+def user_pages_version_key(username):
+    return f"user_pages_version:{username}"
+
+
+def get_user_pages_version(username):
+    """ Return the current version of a user's cached pages, creating it if needed. """
+    key = user_pages_version_key(username)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user_pages(username):
+    """ Drop every cached page of a user by moving their pages to a new version. """
+    if username:
+        cache.set(user_pages_version_key(username), uuid.uuid4().hex, None)
+
+
+def cache_per_user(timeout=None):
+    """
+    Cache a read-only view per user and per session in the shared cache.
+
+    Only successful GET/HEAD responses of authenticated users are cached, and never while messages are
+    pending for the request. The cache key includes the session key, so a new login (which rotates the
+    CSRF token) starts from a fresh page. Cached pages are dropped by invalidate_user_pages, which the
+    views that write data call through invalidates_user_pages.
+
+    Args:
+        timeout: Seconds to keep a page. Defaults to settings.USER_PAGE_CACHE_TIMEOUT.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD') or not request.user.is_authenticated
+                    or len(messages.get_messages(request))):
+                return view_func(request, *args, **kwargs)
+
+            username = request.user.username
+            path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = (f"user_page:{username}:{request.session.session_key}:"
+                   f"{get_user_pages_version(username)}:{path_hash}")
+
+            response = cache.get(key)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    cache.set(key, response, settings.USER_PAGE_CACHE_TIMEOUT if timeout is None else timeout)
+
+            # Per-user pages must not be stored by shared proxies
+            patch_cache_control(response, private=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidates_user_pages(view_func):
+    """ Drop the cached pages of the user after a view handles a POST (i.e. may have written data). """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        if request.method == 'POST' and request.user.is_authenticated:
+            invalidate_user_pages(request.user.username)
+        return response
+    return wrapper
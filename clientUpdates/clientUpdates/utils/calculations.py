@@ -1,5 +1,10 @@
+import logging
 import math
 
+import numpy as np
+
+logger = logging.getLogger('clientUpdates')
+
 def calc_ppt_result(result, unit):
     """ Returns results after converting from ppm, ppb, or ppt to ppt. """
     if unit == 'ppt':
@@ -34,6 +39,40 @@ def calc_gpm_flow_rate(flow_rate, unit):
 
 
 
+def calc_pfas_score_and_method_batch(pfoa_results, pfos_results, max_other_results):
+    """
+    Vectorized PFAS score calculation for many sources at once.
+
+    Args:
+        pfoa_results: Array-like of PFOA results (ppt), one per source.
+        pfos_results: Array-like of PFOS results (ppt), one per source.
+        max_other_results: Array-like of the highest other analyte result (ppt), one per source.
+
+    Returns:
+        A tuple containing:
+            - Array of PFAS scores.
+            - Array of methods ("max_pfoa_pfos" or "alternate").
+
+    Raises:
+        TypeError: A missing result, or a negative other analyte result, which has no real square root.
+    """
+    pfoa_results = np.asarray(pfoa_results, dtype=float)
+    pfos_results = np.asarray(pfos_results, dtype=float)
+    max_other_results = np.asarray(max_other_results, dtype=float)
+    if np.isnan(pfoa_results).any() or np.isnan(pfos_results).any() or np.isnan(max_other_results).any():
+        raise TypeError("PFOA, PFOS and other analyte results must be numbers.")
+    if (max_other_results < 0).any():
+        raise TypeError("Other analyte results must not be negative.")
+
+    default_scores = pfoa_results + pfos_results
+    alternate_scores = (default_scores + np.sqrt(max_other_results)) / 2
+    use_default = default_scores >= alternate_scores
+
+    pfas_scores = np.where(use_default, default_scores, alternate_scores)
+    pfas_score_methods = np.where(use_default, "max_pfoa_pfos", "alternate").astype(object)
+    return pfas_scores, pfas_score_methods
+
+
 def calc_pfas_score_and_method(pfoa_result, pfos_result, max_other_result):
     """
     Calculate the PFAS score based on PFOA, PFOS, and the highest other analyte result.
@@ -46,11 +85,40 @@ def calc_pfas_score_and_method(pfoa_result, pfos_result, max_other_result):
         - The calculated PFAS score.
         - The method used to determine the score ("max_pfoa_pfos" or "alternate").
     """
-    default_score = pfoa_result + pfos_result
-    alternate_score = (default_score + max_other_result ** 0.5) / 2
-    if default_score >= alternate_score:
-        return default_score, "max_pfoa_pfos"
-    return alternate_score, "alternate"
+    pfas_scores, pfas_score_methods = calc_pfas_score_and_method_batch([pfoa_result], [pfos_result],
+                                                                       [max_other_result])
+    return float(pfas_scores[0]), pfas_score_methods[0]
+
+
+
+def get_top_annuals(annuals):
+    """ Returns the three highest annual flow rates (GPM), padded with zeros. """
+    annual_flow_rates = sorted(
+        [entry.get('flow_rate_gpm', 0) for entry in (annuals or [])],
+        reverse=True
+    )
+    return (annual_flow_rates + [0, 0, 0])[:3]
+
+
+
+def calc_afr_batch(top_annuals, vfrs):
+    """
+    Vectorized AFR (Average Flow Rate) calculation for many sources at once.
+
+    Args:
+        top_annuals: Array-like of shape (n, 3) holding the three highest annual flow rates (GPM) per source,
+            padded with zeros (see get_top_annuals).
+        vfrs: Array-like of maximum VFR values (GPM). Missing values should be passed as NaN and count as zero.
+
+    Returns:
+        Array of AFR values.
+    """
+    top_annuals = np.asarray(top_annuals, dtype=float).reshape(-1, 3)
+    vfrs = np.nan_to_num(np.asarray(vfrs, dtype=float), nan=0.0)
+
+    # Average of top 3 flow rates, summed left to right to match the scalar calculation
+    aafrs = (top_annuals[:, 0] + top_annuals[:, 1] + top_annuals[:, 2]) / 3
+    return (aafrs + vfrs) / 2
 
 
 
@@ -67,35 +135,63 @@ def calc_afr_and_note(annuals, vfr):
             - The calculated AFR value.
             - A note indicating missing data or other observations.
     """
+    afr_note = calc_afr_note(len(annuals or []), vfr)
+
+    # A missing or invalid VFR counts as zero
+    vfr = vfr if isinstance(vfr, (int, float)) else np.nan
+    afr = calc_afr_batch([get_top_annuals(annuals)], [vfr])[0]
+
+    return float(afr), afr_note
+
+
+
+def calc_afr_note(annual_count, vfr):
+    """
+    Generate the AFR note describing missing annual production or VFR data.
+
+    Args:
+        annual_count: The number of years of annual production provided.
+        vfr: The maximum VFR value.
+
+    Returns:
+        The note, or None if nothing is missing.
+    """
     note_parts = []
 
-    # Handle annual flow rates
-    annual_flow_rates = sorted(
-        [entry.get('flow_rate_gpm', 0) for entry in (annuals or [])],
-        reverse=True
-    )
-    annual_flow_rates = (annual_flow_rates + [0, 0, 0])[:3]  # Ensure 3 values
-    
-    if not annuals:
+    if not annual_count:
         note_parts.append("no annual production data provided")
-    elif len(annuals) < 3:
-        note_parts.append(f"only {len(annuals)} years of annual production provided")
+    elif annual_count < 3:
+        note_parts.append(f"only {annual_count} years of annual production provided")
 
-    # Calculate AAFR (average of top 3 flow rates)
-    aafr = sum(annual_flow_rates) / 3
-    
-    # Handle missing VFR
-    if not isinstance(vfr, (int, float)):
-        vfr = 0
+    if not isinstance(vfr, (int, float)) or math.isnan(vfr):
         note_parts.append("vfr missing or invalid")
-    
-    # Calculate AFR (average of AAFR and VFR)
-    afr = (aafr + vfr) / 2
-    
-    # Combine notes
-    afr_note = " and ".join(note_parts) if note_parts else None
 
-    return afr, afr_note
+    return " and ".join(note_parts) if note_parts else None
+
+
+
+def calc_capital_costs_batch(afrs):
+    """
+    Vectorized capital costs component of the base score. Missing (NaN) or zero AFRs yield zero.
+
+    Args:
+        afrs: Array-like of Adjusted Flow Rates.
+
+    Returns:
+        Array of capital costs components.
+
+    Raises:
+        TypeError: A negative AFR, which has no real capital cost.
+    """
+    afrs = np.asarray(afrs, dtype=float)
+    if (afrs < 0).any():
+        raise TypeError("AFRs must not be negative.")
+    has_afr = ~np.isnan(afrs) & (afrs != 0)
+    safe_afrs = np.where(has_afr, afrs, 1.0)
+
+    cost_per_1000_gallons = 7.7245 * np.power(safe_afrs, -0.281)
+    annual_1000_gallon_units = safe_afrs * 60 * 24 * 365 / 1000
+    return np.where(has_afr, cost_per_1000_gallons * annual_1000_gallon_units, 0.0)
 
 
 def calc_capital_costs(afr):
@@ -108,14 +204,27 @@ def calc_capital_costs(afr):
     Returns:
         float: The calculated capital costs component
     """
-    if afr == 0 or afr is None:
-        return 0
-    
-    cost_per_1000_gallons = 7.7245 * (afr ** -0.281)
-    annual_1000_gallon_units = afr * 60 * 24 * 365 / 1000
-    capital_cost = cost_per_1000_gallons * annual_1000_gallon_units
+    return float(calc_capital_costs_batch([afr])[0])
+
+
 
-    return capital_cost
+def calc_om_costs_batch(pfas_scores, afrs):
+    """
+    Vectorized O&M cost component of the base score. Missing (NaN) or zero PFAS scores yield zero.
+
+    Args:
+        pfas_scores: Array-like of PFAS Scores.
+        afrs: Array-like of Adjusted Flow Rates.
+
+    Returns:
+        Array of O&M costs components.
+    """
+    pfas_scores = np.asarray(pfas_scores, dtype=float)
+    has_score = ~np.isnan(pfas_scores) & (pfas_scores != 0)
+    pfas_modifier = 0.005
+    capital_costs = calc_capital_costs_batch(afrs)
+    om_costs = (pfas_modifier * pfas_scores * capital_costs) + capital_costs
+    return np.where(has_score, om_costs, 0.0)
 
 
 def calc_om_costs(pfas_score, afr):
@@ -129,13 +238,24 @@ def calc_om_costs(pfas_score, afr):
     Returns:
         float: The calculated O&M costs component
     """
-    if pfas_score == 0 or pfas_score is None:
-        return 0
-    pfas_modifier = 0.005
-    capital_cost = calc_capital_costs(afr)
-    om_cost = (pfas_modifier * pfas_score * capital_cost) + capital_cost
-    return om_cost
+    return float(calc_om_costs_batch([pfas_score], [afr])[0])
+
+
 
+def calc_base_score_batch(pfas_scores, afrs):
+    """
+    Vectorized base score calculation.
+
+    Args:
+        pfas_scores: Array-like of PFAS Scores.
+        afrs: Array-like of Adjusted Flow Rates.
+
+    Returns:
+        Array of Base Scores.
+    """
+    capital_costs = calc_capital_costs_batch(afrs)
+    om_costs = calc_om_costs_batch(pfas_scores, afrs)
+    return capital_costs + om_costs
 
 
 def calc_base_score(pfas_score, afr):
@@ -149,12 +269,44 @@ def calc_base_score(pfas_score, afr):
     Returns:
         float: The calculated Base Score
     """
-    capital_cost = calc_capital_costs(afr)
-    om_cost = calc_om_costs(pfas_score, afr)
-    base_score = capital_cost + om_cost
-    return base_score 
+    return float(calc_base_score_batch([pfas_score], [afr])[0])
+
 
 
+# Log-linear GFE model coefficients per defendant: (PFAS score, AFR, intercept)
+GFE_COEFFICIENTS = {
+    'Tyco': (0.4403859, 0.6939285, 4.3743621),
+    'BASF': (0.4398083, 0.6938430, 3.5034023),
+}
+
+
+def calc_gfes_batch(pfas_scores, afrs, defendant):
+    """
+    Vectorized GFE (Good Faith Estimate) calculation. Sources with a missing or non-positive
+    PFAS score or AFR get a GFE of zero.
+
+    Args:
+        pfas_scores: Array-like of PFAS scores.
+        afrs: Array-like of AFR (Adjusted Flow Rate) values.
+        defendant: The name of the defendant ('Tyco' or 'BASF').
+
+    Returns:
+        Array of GFE values, or None for an unknown defendant (as calc_gfes).
+    """
+    if defendant not in GFE_COEFFICIENTS:
+        logger.warning(f"Defendant must be Tyco or BASF, got {defendant}.")
+        return
+    score_coef, afr_coef, intercept = GFE_COEFFICIENTS[defendant]
+
+    pfas_scores = np.nan_to_num(np.asarray(pfas_scores, dtype=float), nan=0.0)
+    afrs = np.nan_to_num(np.asarray(afrs, dtype=float), nan=0.0)
+    has_inputs = (pfas_scores > 0) & (afrs > 0)
+
+    log_gfes = (score_coef * np.log(np.where(has_inputs, pfas_scores, 1.0))
+                + afr_coef * np.log(np.where(has_inputs, afrs, 1.0))
+                + intercept)
+    return np.where(has_inputs, np.exp(log_gfes), 0.0)
+
 
 def calc_gfes(pfas_score, afr, defendant):
     """
@@ -166,23 +318,40 @@ def calc_gfes(pfas_score, afr, defendant):
         defendant: The name of the defendant ('Tyco' or 'BASF').
 
     Returns:
-        The calculated GFE value.
+        The calculated GFE value, zero if the PFAS score or AFR is missing, or None for an unknown defendant.
     """
-    pfas_score = max(pfas_score, 0) if pfas_score is not None else 0
-    afr = max(afr, 0) if afr is not None else 0
+    gfes = calc_gfes_batch([pfas_score], [afr], defendant)
+    return None if gfes is None else float(gfes[0])
 
-    if pfas_score == 0 or afr == 0:
-        print(f"Warning: PFAS score or AFR is missing. GFE for {defendant} will be zero.")
-        return 0
 
 
-    if defendant == 'Tyco':
-        log_gfe = 0.4403859 * math.log(pfas_score) + 0.6939285 * math.log(afr) + 4.3743621
-    elif defendant == 'BASF':
-        log_gfe = 0.4398083 * math.log(pfas_score) + 0.6938430 * math.log(afr) + 3.5034023
-    else:
-        print(f"Defendant must be Tyco or BASF")
-        return
+def calc_scores_batch(pfoa_results, pfos_results, max_other_results, top_annuals, vfrs):
+    """
+    Score many sources in one pass from columnar inputs.
+
+    Args:
+        pfoa_results: Array-like of PFOA results (ppt).
+        pfos_results: Array-like of PFOS results (ppt).
+        max_other_results: Array-like of the highest other analyte result (ppt).
+        top_annuals: Array-like of shape (n, 3) with the three highest annual flow rates (GPM), zero padded.
+        vfrs: Array-like of maximum VFR values (GPM), NaN where missing.
+
+    Returns:
+        dict of arrays keyed by 'pfas_score', 'pfas_score_method', 'afr', 'base_score',
+        'gfe_tyco', 'gfe_basf' and 'gfe_total_basf_tyco'.
+    """
+    pfas_scores, pfas_score_methods = calc_pfas_score_and_method_batch(pfoa_results, pfos_results, max_other_results)
+    afrs = calc_afr_batch(top_annuals, vfrs)
+    gfe_tyco = calc_gfes_batch(pfas_scores, afrs, 'Tyco')
+    gfe_basf = calc_gfes_batch(pfas_scores, afrs, 'BASF')
+
+    return {
+        'pfas_score': pfas_scores,
+        'pfas_score_method': pfas_score_methods,
+        'afr': afrs,
+        'base_score': calc_base_score_batch(pfas_scores, afrs),
+        'gfe_tyco': gfe_tyco,
+        'gfe_basf': gfe_basf,
+        'gfe_total_basf_tyco': gfe_tyco + gfe_basf,
+    }
 
-    gfe = math.exp(log_gfe)
-    return gfe
\ No newline at end of file
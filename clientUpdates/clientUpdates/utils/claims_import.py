@@ -0,0 +1,322 @@
+import csv
+import gzip
+import json
+import logging
+import math
+
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from .calculations import calc_ppt_result, calc_gpm_flow_rate
+from .synthetic_data import CopyWriter, COPY_BATCH_SIZE
+
+logger = logging.getLogger('clientUpdates')
+
+# Tables refreshed from the claims portal
+CLAIM_TABLES = ('claim_source', 'claim_pfas_result', 'claim_flow_rate',
+                'claim_tb_source', 'claim_tb_pfas_result', 'claim_tb_flow_rate')
+
+# Claim tables the source_current_state table is built from (utils.source_state)
+SOURCE_STATE_TABLES = ('claim_source', 'claim_pfas_result', 'claim_flow_rate')
+
+IMPORT_MODES = ('merge', 'replace')
+
+BOOLEAN_VALUES = {'true': True, 't': True, 'yes': True, 'y': True, '1': True,
+                  'false': False, 'f': False, 'no': False, 'n': False, '0': False}
+
+# Number of row errors kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+class ClaimImportError(Exception):
+    """ Raised when an import file can't be loaded; nothing is written to the claim tables. """
+
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)
+
+
+def get_claim_model(table):
+    from ..models import (ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource, TB_ClaimPfasResult,
+                          TB_ClaimFlowRate)
+
+    for model in (ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource, TB_ClaimPfasResult, TB_ClaimFlowRate):
+        if model._meta.db_table == table:
+            return model
+    raise ValueError(f"Unknown claim table '{table}'.")
+
+
+def file_format_from_path(path):
+    name = path.lower().removesuffix('.gz')
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    raise ValueError(f"Cannot tell the format of {path}; use a .csv or .ndjson/.jsonl file (optionally .gz).")
+
+
+def read_import_rows(path, file_format=None):
+    """
+    Stream the rows of a CSV (with a header) or newline-delimited JSON export, optionally gzipped.
+
+    Yields:
+        (line number, dict of column -> value) for every row.
+    """
+    file_format = file_format or file_format_from_path(path)
+    opener = gzip.open if path.lower().endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8-sig', newline='') as f:
+        if file_format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ClaimImportError(f"Line {line_number}: invalid JSON ({e}).")
+                if not isinstance(row, dict):
+                    raise ClaimImportError(f"Line {line_number}: expected a JSON object.")
+                yield line_number, row
+
+
+class ClaimRowValidator:
+    """
+    Converts the raw values of an export row to the claim model's field types and checks its units.
+
+    Empty values become NULL, or the field default for NOT NULL fields. The primary key of the export is
+    dropped, since the live table numbers its own rows. PFAS results and flow rates are checked with the
+    conversions the update forms use (calc_ppt_result / calc_gpm_flow_rate): result_ppt and flow_rate_gpm
+    are filled in from the reported value and unit when missing, and must match them when given.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        pk = model._meta.pk
+        self.fields = {field.attname: field for field in model._meta.concrete_fields if field is not pk}
+        self.ignored = {pk.attname, pk.name}
+        # Converters are chosen once per column, since every value of a large export goes through them
+        self.converters = {attname: self.converter(field) for attname, field in self.fields.items()}
+
+    def clean(self, raw):
+        if None in raw:
+            # csv.DictReader puts the values of a row longer than the header under None
+            raise ValueError("more values than columns")
+        unknown = raw.keys() - self.fields.keys() - self.ignored
+        if unknown:
+            raise ValueError(f"unknown column(s) {', '.join(sorted(unknown))}")
+
+        row = {}
+        for attname, value in raw.items():
+            convert = self.converters.get(attname)
+            if convert is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                field = self.fields[attname]
+                row[attname] = None if field.null else field.get_default()
+            else:
+                row[attname] = convert(value)
+
+        if 'result_ppt' in self.fields:
+            self.check_unit(row, 'result', 'result_ppt', calc_ppt_result)
+        if 'flow_rate_gpm' in self.fields:
+            self.check_unit(row, 'flow_rate', 'flow_rate_gpm', calc_gpm_flow_rate)
+        return row
+
+    @staticmethod
+    def converter(field):
+        """ Returns a function converting a non-empty raw value to the field's Python type. """
+        name = field.attname
+
+        if isinstance(field, models.TextField):
+            return lambda value: value if isinstance(value, str) else str(value)
+
+        if isinstance(field, models.BooleanField):
+            def to_boolean(value):
+                if isinstance(value, bool):
+                    return value
+                if str(value).lower() not in BOOLEAN_VALUES:
+                    raise ValueError(f"{name}: '{value}' is not a boolean")
+                return BOOLEAN_VALUES[str(value).lower()]
+            return to_boolean
+
+        if isinstance(field, models.FloatField):
+            def to_float(value):
+                try:
+                    value = float(value)
+                except ValueError:
+                    raise ValueError(f"{name}: '{value}' is not a number")
+                if not math.isfinite(value):
+                    raise ValueError(f"{name}: {value} is not a finite number")
+                return value
+            return to_float
+
+        def to_python(value):
+            try:
+                value = field.to_python(value)
+            except ValidationError as e:
+                raise ValueError(f"{name}: {'; '.join(e.messages)}")
+            if isinstance(field, models.DateTimeField) and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            return value
+        return to_python
+
+    @staticmethod
+    def check_unit(row, value_column, converted_column, convert):
+        value, unit = row.get(value_column), row.get('unit')
+        if value is None or unit is None:
+            return
+        try:
+            # Claim PFAS results are text, and may be non-numeric (e.g. 'ND'); those keep their result_ppt
+            value = float(value)
+        except ValueError:
+            return
+        converted = convert(value, unit.lower())
+        reported = row.get(converted_column)
+        if reported is None:
+            row[converted_column] = converted
+        elif not math.isclose(reported, converted, rel_tol=1e-6, abs_tol=1e-9):
+            raise ValueError(f"{converted_column} {reported} doesn't match {value_column} {value} {unit} "
+                             f"(expected {converted:g})")
+
+
+class ImportResult:
+    """ Counts and errors of an import. """
+
+    def __init__(self, table, mode):
+        self.table = table
+        self.mode = mode
+        self.rows = 0
+        self.deleted = 0
+        self.pwsids = set()
+        self.n_errors = 0
+        self.errors = []
+
+    def add_error(self, line_number, message):
+        self.n_errors += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Line {line_number}: {message}")
+
+
+def validate_rows(model, rows, result):
+    """ Yields the cleaned rows, recording the invalid ones in result. """
+    validator = ClaimRowValidator(model)
+    for line_number, raw in rows:
+        try:
+            row = validator.clean(raw)
+        except (ValueError, TypeError) as e:
+            result.add_error(line_number, e)
+            continue
+        result.rows += 1
+        result.pwsids.add(row.get('pwsid'))
+        yield row
+
+
+def import_claim_rows(table, rows, mode='merge', max_errors=0, batch_size=COPY_BATCH_SIZE, dry_run=False):
+    """
+    Load rows of a claims portal export into a claim table in one transaction.
+
+    On PostgreSQL the rows are streamed with COPY into a temporary staging table, then moved into the live
+    table with a DELETE and an INSERT ... SELECT. Readers are never blocked: until the transaction commits
+    they keep seeing the previous rows (no TRUNCATE or table swap, which take an exclusive lock). Other
+    databases hold the rows in memory and use bulk_create, which is only meant for development.
+
+    Args:
+        table: One of CLAIM_TABLES.
+        rows: Iterable of (line number, dict of column -> value), e.g. from read_import_rows.
+        mode: 'merge' replaces the rows of the PWSIDs in the export, 'replace' replaces the whole table.
+        max_errors: Number of invalid rows that are skipped before the import is aborted.
+        batch_size: Rows per COPY batch.
+        dry_run: Validate and stage the rows, but roll back instead of touching the live table.
+
+    Returns:
+        ImportResult
+
+    Raises:
+        ClaimImportError: Too many invalid rows, or an empty export; nothing is written.
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode '{mode}'.")
+    model = get_claim_model(table)
+    result = ImportResult(table, mode)
+    rows = validate_rows(model, rows, result)
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            columns = stage_rows(model, rows, batch_size)
+        else:
+            rows = list(rows)
+        result.pwsids.discard(None)
+
+        if result.n_errors > max_errors:
+            raise ClaimImportError(f"{result.n_errors} invalid rows in the {table} import (at most {max_errors} "
+                                   f"allowed); nothing was imported.", result.errors)
+        if not result.rows:
+            raise ClaimImportError(f"No rows to import into {table}.", result.errors)
+        if dry_run:
+            transaction.set_rollback(True)
+            return result
+
+        if connection.vendor == 'postgresql':
+            result.deleted = replace_from_staging(model, columns, mode)
+        else:
+            live = model.objects.all() if mode == 'replace' else model.objects.filter(pwsid__in=result.pwsids)
+            result.deleted = live.delete()[0]
+            model.objects.bulk_create((model(**row) for row in rows), batch_size=5_000)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+    logger.info(f"Imported {result.rows} rows into {table} ({mode}), replacing {result.deleted}.",
+                extra={'table': table, 'rows': result.rows, 'deleted': result.deleted})
+    return result
+
+
+def staging_table(model):
+    return f"{model._meta.db_table}_import"
+
+
+def stage_rows(model, rows, batch_size):
+    """
+    COPY the rows into a temporary copy of the model's table, dropped at the end of the transaction.
+
+    Returns:
+        The quoted column names of the staging table.
+    """
+    quote_name = connection.ops.quote_name
+    pk = model._meta.pk
+    columns = [quote_name(field.column) for field in model._meta.concrete_fields if field is not pk]
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE {quote_name(staging_table(model))} ON COMMIT DROP AS "
+                       f"SELECT {', '.join(columns)} FROM {quote_name(model._meta.db_table)} WITH NO DATA")
+
+    writer = CopyWriter(model, batch_size, table=staging_table(model))
+    for row in rows:
+        writer.add(row)
+    writer.flush()
+    return columns
+
+
+def replace_from_staging(model, columns, mode):
+    """
+    Replace the live rows (all of them, or those of the staged PWSIDs) with the staged rows.
+
+    Returns:
+        The number of live rows deleted.
+    """
+    quote_name = connection.ops.quote_name
+    live, staging = quote_name(model._meta.db_table), quote_name(staging_table(model))
+    with connection.cursor() as cursor:
+        if mode == 'replace':
+            cursor.execute(f"DELETE FROM {live}")
+        else:
+            cursor.execute(f"DELETE FROM {live} WHERE pwsid IN (SELECT DISTINCT pwsid FROM {staging})")
+        deleted = cursor.rowcount
+        cursor.execute(f"INSERT INTO {live} ({', '.join(columns)}) SELECT {', '.join(columns)} FROM {staging}")
+    return deleted
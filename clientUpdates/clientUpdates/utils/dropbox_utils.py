@@ -4,7 +4,10 @@ import dropbox
 import logging
 import os
 import requests
+import threading
+import time
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.http import JsonResponse
 from ..utils.file_upload_utils import upload_to_local
@@ -16,70 +19,134 @@ DROPBOX_TOKEN_URL = "https://api.dropbox.com/oauth2/token"
 
 
 
-def refresh_dropbox_access_token():
+class DropboxTokenError(Exception):
+    """ Raised when no Dropbox access token can be obtained. """
+
+
+class DropboxClientManager:
     """
-    Refresh the Dropbox access token using the refresh token.
-    
-    Returns:
-        str: The new access token if successful, or None if failed.
+    Process-wide, thread-safe holder of the Dropbox client.
+
+    All clients share one connection-pooled requests.Session, so calls reuse open connections instead of
+    doing a new TLS handshake each time. The access token expiry is tracked from the OAuth response and the
+    token is refreshed ahead of expiry under a lock, so concurrent callers trigger a single refresh.
     """
-    try:
-        response = requests.post(
-            "https://api.dropbox.com/oauth2/token",
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # The session is created on first use, which can be a token refresh made while _lock is held
+        self._session_lock = threading.Lock()
+        self._session = None
+        self._client = None
+        self._access_token = None
+        self._expires_at = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = dropbox.create_session(max_connections=settings.DROPBOX['max_connections'])
+        return self._session
+
+    def _token_is_fresh(self):
+        if not self._access_token:
+            return False
+        if self._expires_at is None:
+            return True
+        return time.monotonic() < self._expires_at - settings.DROPBOX['token_refresh_margin_seconds']
+
+    def _set_token(self, access_token, expires_in=None):
+        self._access_token = access_token
+        self._expires_at = time.monotonic() + expires_in if expires_in else None
+        self._client = dropbox.Dropbox(access_token, session=self.session)
+        settings.DROPBOX['access_token'] = access_token
+
+    def refresh(self):
+        """
+        Refresh the access token using the refresh token.
+
+        Returns:
+            str: The new access token.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        response = self.session.post(
+            DROPBOX_TOKEN_URL,
             data={
                 'grant_type': 'refresh_token',
                 'refresh_token': settings.DROPBOX['refresh_token']
-                #'client_id': settings.DROPBOX['app_key'],
-                #'client_secret': settings.DROPBOX['app_secret']
             },
             auth=(settings.DROPBOX['app_key'], settings.DROPBOX['app_secret'])
         )
-        response.raise_for_status()  # Fixed missing parentheses
+        response.raise_for_status()
         token_data = response.json()
 
-        # Update access token in settings or database
-        settings.DROPBOX['access_token'] = token_data['access_token']
-        return token_data['access_token']
-    except requests.exceptions.RequestException as e:
-        print(f"Error refreshing Dropbox access token: {e}")
-        return None
+        self._set_token(token_data['access_token'], token_data.get('expires_in'))
+        logger.info("Dropbox access token refreshed.")
+        return self._access_token
 
+    def get_client(self):
+        """
+        Returns:
+            dropbox.Dropbox: A client with an access token that is not about to expire.
+        """
+        if not self._token_is_fresh():
+            with self._lock:
+                if not self._token_is_fresh():
+                    # A token set in the environment has no known expiry and is used until it is rejected
+                    if not self._access_token and settings.DROPBOX['access_token']:
+                        self._set_token(settings.DROPBOX['access_token'])
+                    else:
+                        try:
+                            self._refresh()
+                        except requests.exceptions.RequestException as e:
+                            logger.error(f"Error refreshing Dropbox access token: {e}")
+                            raise DropboxTokenError('Failed to refresh Dropbox token') from e
+        return self._client
 
-def dropboxLink(pwsid):
-    dropbox_access_token = settings.DROPBOX['access_token']
-    if not dropbox_access_token:
-        dropbox_access_token = refresh_dropbox_access_token()
-        if not dropbox_access_token:
-            logging.error("Failed to refresh access token")
+    def call(self, func):
+        """
+        Calls func(dbx) with a shared client. If Dropbox rejects the token, it is refreshed once and func is retried.
+        """
+        dbx = self.get_client()
+        try:
+            return func(dbx)
+        except AuthError:
+            logger.info("Need to refresh dropbox access token...")
+            with self._lock:
+                # Only expire the token if another thread hasn't already replaced it
+                if self._client is dbx:
+                    self._access_token = None
+                    settings.DROPBOX['access_token'] = ''
+            return func(self.get_client())
+
+
+dropbox_clients = DropboxClientManager()
 
-    folderPath = f"/uploads/{pwsid}"
 
+def refresh_dropbox_access_token():
+    """
+    Refresh the Dropbox access token using the refresh token.
+
+    Returns:
+        str: The new access token if successful, or None if failed.
+    """
     try:
-        #expiration_time = datetime.datetime.now(tz=datetime.UTC) + datetime.timedelta(hours=1)
-        # Initialize Dropbox client
-        dbx = dropbox.Dropbox(dropbox_access_token)
-        linkMetaData = dbx.sharing_create_shared_link_with_settings(folderPath)
-        dropboxURL = linkMetaData.url
-        return dropboxURL
+        return dropbox_clients.refresh()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error refreshing Dropbox access token: {e}")
+        return None
 
-    except AuthError as e:
-        try:
-            dropbox_access_token = refresh_dropbox_access_token()
-            logger.info(f"Encountered Auth error: {e}. Dropbox access token should be refreshed.")
-            dbx = dropbox.Dropbox(dropbox_access_token)
-            linkMetaData = dbx.sharing_create_shared_link_with_settings(folderPath)
-            dropboxLink = linkMetaData.url
-            return dropboxLink
-        except ApiError as e:
-            # error was thrown because a shared link already exists. Get the most recent one:
-            ## the direct only parameter is to only provide access to the folderPath, no Parent folders above it
-            existingLink = dbx.sharing_list_shared_links(path=folderPath, direct_only=True)
-            # extract the url of the link
-            url = existingLink.links[-1].url
-            # ensure there is no expiration
-            dbx.sharing_modify_shared_link_settings(url, settings=SharedLinkSettings(), remove_expiration=True)
-            return url
-    except ApiError as e:
+
+def get_shared_link(dbx, folderPath):
+    """ Create a shared link to folderPath, or return the existing one without an expiration. """
+    try:
+        linkMetaData = dbx.sharing_create_shared_link_with_settings(folderPath)
+        return linkMetaData.url
+    except ApiError:
         # error was thrown because a shared link already exists. Get the most recent one:
         ## the direct only parameter is to only provide access to the folderPath, no Parent folders above it
         existingLink = dbx.sharing_list_shared_links(path=folderPath, direct_only=True)
@@ -90,6 +157,120 @@ def dropboxLink(pwsid):
         return url
 
 
+def dropboxLink(pwsid):
+    folderPath = f"/uploads/{pwsid}"
+    try:
+        return dropbox_clients.call(lambda dbx: get_shared_link(dbx, folderPath))
+    except DropboxTokenError:
+        logger.error("Failed to refresh access token")
+        raise
+
+# Process cache of resolved shared folder links: {pwsid: (url, expires_at)}
+_link_cache = {}
+_link_cache_lock = threading.Lock()
+
+
+def _cache_dropbox_link(pwsid, url):
+    with _link_cache_lock:
+        _link_cache[pwsid] = (url, time.monotonic() + settings.DROPBOX['link_cache_ttl_seconds'])
+
+
+def get_stored_dropbox_link(pwsid):
+    """ The shared folder link of a PWS stored in DropboxLinks, or None. """
+    from ..models import DropboxLinks
+
+    return (DropboxLinks.objects.filter(pwsid=pwsid, url_shared_folder__isnull=False)
+            .order_by('-row_names').values_list('url_shared_folder', flat=True).first())
+
+
+def schedule_dropbox_link_check(pwsid):
+    """
+    Enqueues a check of the stored shared folder link of a PWS, at most once per link_check_interval_seconds
+    across all worker processes.
+
+    Returns:
+        bool: Whether a check was enqueued.
+    """
+    from .jobs import enqueue_dropbox_link_check
+
+    # cache.add is a no-op while the key of the previous check hasn't expired
+    if not cache.add(f"dropbox_link_check:{pwsid}", True, settings.DROPBOX['link_check_interval_seconds']):
+        return False
+    enqueue_dropbox_link_check(pwsid)
+    return True
+
+
+def get_dropbox_link(pwsid):
+    """
+    Get the shared folder link of a PWS without waiting on Dropbox when the link is already known.
+
+    Links are read from the process cache, then from the DropboxLinks table. Dropbox is only called when
+    the PWS has no stored link yet. Links read from the table are checked in the background by a job that
+    replaces them if they were revoked, at most once per link_check_interval_seconds.
+
+    Returns:
+        str: The shared link, or None if it could not be resolved.
+    """
+    cached = _link_cache.get(pwsid)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    url = get_stored_dropbox_link(pwsid)
+    if url:
+        _cache_dropbox_link(pwsid, url)
+        try:
+            schedule_dropbox_link_check(pwsid)
+        except Exception as e:
+            logger.error(f"Error enqueuing Dropbox link check for {pwsid}: {e}")
+        return url
+
+    try:
+        return refresh_dropbox_link(pwsid)
+    except Exception as e:
+        logger.error(f"Error resolving Dropbox link for {pwsid}: {e}")
+        return None
+
+
+def refresh_dropbox_link(pwsid):
+    """
+    Resolve the shared folder link of a PWS from Dropbox and store it in DropboxLinks and the process cache.
+
+    The link is stored on the newest DropboxLinks row of the PWS, or on a new row if it has none. The
+    file request URLs of the rows are left as they are.
+
+    Returns:
+        str: The shared link.
+    """
+    from ..models import DropboxLinks
+
+    url = dropboxLink(pwsid)
+    row = DropboxLinks.objects.filter(pwsid=pwsid).order_by('-row_names').first()
+    if row is None:
+        DropboxLinks.objects.create(pwsid=pwsid, url_shared_folder=url)
+    else:
+        row.url_shared_folder = url
+        row.save(update_fields=['url_shared_folder'])
+    _cache_dropbox_link(pwsid, url)
+    logger.info(f"Dropbox link stored for {pwsid}.")
+    return url
+
+
+def check_dropbox_link(pwsid):
+    """
+    Check that the stored shared folder link of a PWS still exists in Dropbox, and replace it if it was revoked.
+
+    Returns:
+        str: The valid shared link.
+    """
+    url = get_stored_dropbox_link(pwsid)
+    if url:
+        try:
+            dropbox_clients.call(lambda dbx: dbx.sharing_get_shared_link_metadata(url))
+            return url
+        except ApiError as e:
+            logger.info(f"Stored Dropbox link for {pwsid} is no longer valid ({e}), refreshing.")
+    return refresh_dropbox_link(pwsid)
+
 
 def ensure_dropbox_folder(dbx, folder_path):
     """
@@ -107,6 +288,45 @@ def ensure_dropbox_folder(dbx, folder_path):
 
 
 
+def stream_to_dropbox(dbx, f, dropbox_path, chunk_size=None):
+    """
+    Upload an open file to Dropbox without reading it into memory all at once.
+
+    Files that fit in a single chunk are sent with files_upload. Larger files are sent through an
+    upload session (files_upload_session_start / append_v2 / finish), so at most two chunks are held
+    in memory at a time.
+
+    Args:
+        dbx (dropbox.Dropbox): Authenticated Dropbox client.
+        f: File object opened in binary mode.
+        dropbox_path (str): Destination path in Dropbox. Existing files are overwritten.
+        chunk_size (int): Chunk size in bytes. Defaults to settings.DROPBOX['upload_chunk_size'].
+
+    Returns:
+        dropbox.files.FileMetadata: Metadata of the uploaded file.
+    """
+    chunk_size = chunk_size or settings.DROPBOX['upload_chunk_size']
+    mode = dropbox.files.WriteMode.overwrite
+
+    chunk = f.read(chunk_size)
+    next_chunk = f.read(chunk_size)
+    if not next_chunk:
+        return dbx.files_upload(chunk, dropbox_path, mode=mode)
+
+    session = dbx.files_upload_session_start(chunk)
+    cursor = dropbox.files.UploadSessionCursor(session_id=session.session_id, offset=len(chunk))
+    chunk = next_chunk
+    while True:
+        next_chunk = f.read(chunk_size)
+        if not next_chunk:
+            break
+        dbx.files_upload_session_append_v2(chunk, cursor)
+        cursor.offset += len(chunk)
+        chunk = next_chunk
+
+    commit = dropbox.files.CommitInfo(path=dropbox_path, mode=mode)
+    return dbx.files_upload_session_finish(chunk, cursor, commit)
+
 
 def upload_to_dropbox(file, filetype, pwsid):
     """
@@ -123,44 +343,29 @@ def upload_to_dropbox(file, filetype, pwsid):
     if not file:
         return JsonResponse({'error': 'No file uploaded'}, status=400)
 
-    # Get the current access token
-    dropbox_access_token = settings.DROPBOX['access_token']
-    if not dropbox_access_token:
-        dropbox_access_token = refresh_dropbox_access_token()
-        if not dropbox_access_token:
-            return JsonResponse({'error': 'Failed to refresh Dropbox token'}, status=401)
-
-    try:
-        # Initialize Dropbox client
-        dbx = dropbox.Dropbox(dropbox_access_token)
-
-        # Define folder and file paths
-        folder_path = f"/uploads/{pwsid}/{filetype}"
-        dropbox_path = f"{folder_path}/{file.name}"
+    # Define folder and file paths
+    folder_path = f"/uploads/{pwsid}/{filetype}"
+    dropbox_path = f"{folder_path}/{file.name}"
 
+    def upload(dbx):
         # Ensure folder exists
         ensure_dropbox_folder(dbx, folder_path)
 
         # Upload the file to both dropbox and locally
         with file.open('rb') as f:
-            dbx.files_upload(f.read(), dropbox_path, mode=dropbox.files.WriteMode.overwrite)
+            stream_to_dropbox(dbx, f, dropbox_path)
             upload_to_local(pwsid=pwsid, file=file, folder=filetype)
 
+    try:
+        dropbox_clients.call(upload)
+
         # Return success response
         logger.info(f"{file} uploaded to Dropbox and local storage successfully for {pwsid}.")
         return JsonResponse({'success': 'File uploaded to Dropbox successfully', 'path': dropbox_path})
 
+    except DropboxTokenError:
+        return JsonResponse({'error': 'Failed to refresh Dropbox token'}, status=401)
     except dropbox.exceptions.AuthError:
-        # Refresh token and retry
-        logger.info("Need to refresh dropbox access token...")
-        dropbox_access_token = refresh_dropbox_access_token()
-        if dropbox_access_token:
-            dbx = dropbox.Dropbox(dropbox_access_token)
-            with file.open('rb') as f:
-                dbx.files_upload(f.read(), dropbox_path, mode=dropbox.files.WriteMode.overwrite)
-                upload_to_local(pwsid=pwsid, file=file, folder=filetype)
-            logger.info(f"{file} uploaded to Dropbox and local storage successfully for {pwsid}.")
-            return JsonResponse({'success': 'File uploaded to Dropbox successfully', 'path': dropbox_path})
         return JsonResponse({'error': 'Dropbox authentication failed'}, status=401)
     except dropbox.exceptions.ApiError as e:
         logger.error(f"{e}: Error while loading file {file.name} to Dropbox and local storage for {pwsid}.")
@@ -168,3 +373,31 @@ def upload_to_dropbox(file, filetype, pwsid):
     except Exception as e:
         logger.error(f"{e}: Error while loading file {file.name} to Dropbox and local storage for {pwsid}.")
         return JsonResponse({'error': f'Unexpected error: {str(e)}'}, status=500)
+
+
+
+def upload_local_file_to_dropbox(local_path, filetype, pwsid):
+    """
+    Upload a file that was already saved to local storage (see upload_to_local) to Dropbox.
+    Used by background jobs, so errors are raised rather than returned to allow retries.
+
+    Args:
+        local_path (str): Path of the file in default_storage.
+        filetype (str): Type of the file to organize folders (e.g., 'Phase2/PFAS').
+        pwsid (str): A unique identifier for the folder in Dropbox.
+
+    Returns:
+        str: The Dropbox path of the uploaded file.
+    """
+    folder_path = f"/uploads/{pwsid}/{filetype}"
+    dropbox_path = f"{folder_path}/{os.path.basename(local_path)}"
+
+    def upload(dbx):
+        ensure_dropbox_folder(dbx, folder_path)
+        with default_storage.open(local_path, 'rb') as f:
+            stream_to_dropbox(dbx, f, dropbox_path)
+
+    dropbox_clients.call(upload)
+
+    logger.info(f"{local_path} uploaded to Dropbox successfully for {pwsid}.")
+    return dropbox_path
@@ -0,0 +1,88 @@
+import csv
+
+from .tables_utils import annotate_flow_rate_conversions, get_claim_models
+
+# Rows fetched per round trip; on PostgreSQL .iterator() reads them through a server-side cursor
+EXPORT_CHUNK_SIZE = 2_000
+
+# Rows per chunk of CSV text handed to the response or file
+ROWS_PER_WRITE = 500
+
+EXPORT_DATASETS = ('sources', 'pfas_results', 'flow_rates', 'payments')
+
+# Source payment funds of each claim, as shown on the source payment info page
+CLAIM_PAYMENT_FUNDS = {
+    '3M_DuPont': ('3M Phase One Action Fund', 'Dupont Phase One Action Fund'),
+}
+
+
+class Echo:
+    """ File-like object returning what is written to it, so csv.writer can produce lines for streaming. """
+
+    def write(self, value):
+        return value
+
+
+def get_export_queryset(claim, dataset, pwsid=None):
+    """
+    The rows of a claim dataset, for one PWS or for everyone.
+
+    Args:
+        claim: '3M_DuPont' or 'Tyco_BASF', as in the page URLs.
+        dataset: One of EXPORT_DATASETS.
+        pwsid: PWSID to export, or None for every PWS.
+
+    Returns:
+        tuple: (list of column names, queryset of value tuples in that column order)
+
+    Raises:
+        ValueError: Unknown claim or dataset, or a dataset the claim doesn't have (payments for Tyco/BASF).
+    """
+    from ..models import srcPaymentDist
+
+    claim_models = dict(zip(('sources', 'pfas_results', 'flow_rates'), get_claim_models(claim)))
+
+    if dataset == 'payments':
+        if claim not in CLAIM_PAYMENT_FUNDS:
+            raise ValueError(f"No source payments to export for the {claim} claim.")
+        model = srcPaymentDist
+        queryset = model.objects.filter(fund_description__in=CLAIM_PAYMENT_FUNDS[claim])
+    elif dataset in claim_models:
+        model = claim_models[dataset]
+        queryset = model.objects.all()
+    else:
+        raise ValueError(f"Unknown dataset '{dataset}'.")
+
+    # Every column but the internal row number
+    columns = [field.attname for field in model._meta.concrete_fields if not field.primary_key]
+    if dataset == 'flow_rates':
+        # The conversions shown on the source detail page
+        queryset = annotate_flow_rate_conversions(queryset)
+        columns += ['flow_rate_gpy', 'flow_rate_mgd', 'flow_rate_afpy']
+    if pwsid is not None:
+        queryset = queryset.filter(pwsid=pwsid)
+
+    return columns, queryset.order_by('pwsid', 'source_name', 'pk').values_list(*columns)
+
+
+def iter_csv(columns, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields the CSV text of the rows, ROWS_PER_WRITE rows at a time, starting with a header.
+
+    The rows are read with .iterator(), so memory stays flat however many rows are exported. The text
+    starts with a byte order mark, so Excel opens the file as UTF-8.
+    """
+    writer = csv.writer(Echo())
+    yield '\ufeff' + writer.writerow(columns)
+    lines = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        lines.append(writer.writerow(row))
+        if len(lines) >= ROWS_PER_WRITE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def export_filename(claim, dataset, pwsid=None):
+    return f"{pwsid or 'all'}_{claim}_{dataset}.csv"
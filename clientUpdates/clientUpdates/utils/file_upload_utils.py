@@ -3,7 +3,7 @@ from django.core.files.storage import default_storage
 
 def upload_to_local(pwsid, file, folder):
     local_path = f"{pwsid}/{folder}/{file.name}"
-    default_storage.save(local_path, file)
+    return default_storage.save(local_path, file)
 
 
 def validate_file(file):
@@ -0,0 +1,85 @@
+from collections import defaultdict
+
+
+def prepare_form_instances(forms, **fields):
+    """
+    Build the unsaved instances of a form or formset and set shared fields on each of them.
+
+    Args:
+        forms: A ModelForm, or an iterable of ModelForms (e.g. a model formset).
+        **fields: Field values to set on every instance (e.g. pwsid, source_name, timestamp).
+
+    Returns:
+        list: The unsaved model instances, in form order.
+    """
+    if hasattr(forms, 'save') and not hasattr(forms, 'forms'):
+        forms = [forms]
+
+    instances = []
+    for form in forms:
+        instance = form.save(commit=False)
+        for field, value in fields.items():
+            setattr(instance, field, value)
+        instances.append(instance)
+    return instances
+
+
+def set_per_instance(instances, field, values):
+    """
+    Set one value of a field on each instance, in order (e.g. the year of each annual flow row).
+
+    Args:
+        instances: Model instances, as returned by prepare_form_instances.
+        field: Name of the field to set.
+        values: One value per instance.
+
+    Raises:
+        ValueError: If there isn't exactly one value per instance, instead of leaving rows without a value
+            or dropping them.
+    """
+    values = list(values)
+    if len(instances) != len(values):
+        raise ValueError(f"Expected {len(values)} {field} values to match {len(instances)} form rows.")
+
+    for instance, value in zip(instances, values):
+        setattr(instance, field, value)
+    return instances
+
+
+def bulk_save_instances(instances, batch_size=None):
+    """
+    Save model instances with one INSERT for the new and one UPDATE for the existing instances of each model,
+    instead of one query per instance.
+
+    New instances are written with bulk_create (their primary keys are set on backends that return them,
+    such as PostgreSQL), and existing instances with bulk_update of all their concrete fields. A model with a
+    single instance is saved with instance.save(), which is already a single statement.
+
+    Args:
+        instances: Model instances, possibly of several models.
+        batch_size: Optional batch size passed to bulk_create / bulk_update.
+
+    Returns:
+        list: The saved instances.
+    """
+    instances = list(instances)
+
+    by_model = defaultdict(list)
+    for instance in instances:
+        by_model[type(instance)].append(instance)
+
+    for model, model_instances in by_model.items():
+        if len(model_instances) == 1:
+            model_instances[0].save()
+            continue
+
+        new = [instance for instance in model_instances if instance._state.adding or instance.pk is None]
+        existing = [instance for instance in model_instances if not (instance._state.adding or instance.pk is None)]
+
+        if new:
+            model.objects.bulk_create(new, batch_size=batch_size)
+        if existing:
+            fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+            model.objects.bulk_update(existing, fields, batch_size=batch_size)
+
+    return instances
@@ -1,10 +1,8 @@
 import logging
 
-from django.core.files.storage import default_storage
-
 # Custom functions
-from .updates import update_ehe_pws_table, update_ehe_source_table
-from .dropbox_utils import upload_to_dropbox
+from .source_state import apply_update_to_source_state
+from .jobs import enqueue_source_recompute, enqueue_dropbox_upload
 # Django functions
 from django.utils import timezone
 from django.contrib import messages
@@ -25,6 +23,7 @@ def handle_update(request, form_class, extra_fields, impacted=None, calc_func=No
         water_source_id = request.POST.get('water_source_id')
         source_name = request.POST.get('source_name')
         form = form_class(request.POST, request.FILES)
+        log_context = {'pwsid': pwsid, 'source_name': source_name}
 
         if form.is_valid():
             logger.debug("Received valid form data: %s", form.cleaned_data)
@@ -56,38 +55,41 @@ def handle_update(request, form_class, extra_fields, impacted=None, calc_func=No
             try:
                 instance.save()
 
-                # Trigger updates of EH&E Source and Pws tables
-                # update_ehe_source_table(pwsid, source_name)
-                # update_ehe_pws_table(pwsid)
+                # Keep the current-state row of the source in sync with the new update
+                try:
+                    apply_update_to_source_state(instance)
+                except Exception as e:
+                    logger.error("Error updating current state for %s: %s", source_name, e, extra=log_context)
+
+                # Trigger updates of EH&E Source and Pws tables in the background
+                try:
+                    enqueue_source_recompute(pwsid, source_name)
+                except Exception as e:
+                    logger.error("Error enqueuing recompute for %s: %s", source_name, e, extra=log_context)
 
                 filetype = 'Flow Rate' if source_variable else 'PFAS Results'
-                logger.info(f"{filetype} updated successfully for {source_name}.")
+                logger.info(f"{filetype} updated successfully for {source_name}.", extra=log_context)
                 messages.success(request, f"{filetype} updated successfully.")
 
-                # Upload file to Dropbox
+                # Save the file locally and upload it to Dropbox in the background
                 file = request.FILES.get('filename')
-                
-                if file:
-                    #upload_to_dropbox(file, filetype, pwsid)
 
-                    # Temporarily saving files locally. Uncomment the upload_to_dropbox function
-                    # once ready for production.
-                    local_path = f"{pwsid}/{filetype}/{file.name}"
-                    default_storage.save(local_path, file)
+                if file:
+                    enqueue_dropbox_upload(file=file, filetype=filetype, pwsid=pwsid, source_name=source_name)
 
-                return redirect('source-detail', pwsid=pwsid, source_name=source_name)
+                return redirect('source-detail', claim='3M_DuPont', pwsid=pwsid, source_name=source_name)
             except Exception as e:
-                logger.error("Error saving instance: %s", e)
+                logger.error("Error saving instance: %s", e, extra=log_context)
                 messages.error(request, "Failed to save updates due to a system error.")
-                return redirect('source-detail', pwsid=pwsid, source_name=source_name)
+                return redirect('source-detail', claim='3M_DuPont', pwsid=pwsid, source_name=source_name)
 
         else:
-            logger.error("Form validation failed with errors: %s", form.errors)
+            logger.error("Form validation failed with errors: %s", form.errors, extra=log_context)
             messages.error(request, "Form validation failed. Please correct the errors below.")
-            return redirect('source-detail', pwsid=pwsid, source_name=source_name)
+            return redirect('source-detail', claim='3M_DuPont', pwsid=pwsid, source_name=source_name)
 
     messages.error(request, "Invalid request.")
-    return redirect('source-detail', pwsid=request.POST.get('pwsid'), source_name=request.POST.get('source_name'))
+    return redirect('source-detail', claim='3M_DuPont', pwsid=request.POST.get('pwsid'), source_name=request.POST.get('source_name'))
 
 
 def file_upload(instance, filename):
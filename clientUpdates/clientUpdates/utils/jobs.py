@@ -0,0 +1,227 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .dropbox_utils import upload_local_file_to_dropbox, check_dropbox_link
+from .file_upload_utils import upload_to_local
+from .updates import bulk_update_ehe_source_table, bulk_update_ehe_pws_table
+
+logger = logging.getLogger('clientUpdates')
+
+RECOMPUTE_SOURCE = 'recompute_source'
+DROPBOX_UPLOAD = 'dropbox_upload'
+DROPBOX_LINK_CHECK = 'dropbox_link_check'
+USER_PASSWORD = 'user_password'
+
+# Inserts tried by enqueue_job when a concurrent request races it for the same dedup key
+ENQUEUE_ATTEMPTS = 3
+
+
+def recompute_source_job(pwsid, source_name=None):
+    """
+    Recomputes the EH&E Source rows of the PWS and its aggregated GFEs in the Pws table.
+
+    The whole PWS is recomputed, since its Pws row aggregates every source; source_name is only kept
+    for jobs enqueued per source.
+    """
+    bulk_update_ehe_source_table([pwsid])
+    bulk_update_ehe_pws_table([pwsid])
+
+
+def dropbox_upload_job(local_path, filetype, pwsid):
+    """ Uploads a file that was saved to local storage during the request to Dropbox. """
+    upload_local_file_to_dropbox(local_path, filetype, pwsid)
+
+
+def dropbox_link_check_job(pwsid):
+    """ Replaces the stored shared folder link of a PWS if it was revoked. """
+    check_dropbox_link(pwsid)
+
+
+def user_password_job(username):
+    """
+    Hashes the pwsCreds password of a user created on their first login into the User's password, so
+    ModelBackend accepts it too. The password is read from pwsCreds here rather than stored in the payload.
+    """
+    from django.contrib.auth.models import User
+    from ..models import pwsCreds
+
+    password = pwsCreds.objects.filter(username=username).values_list('password', flat=True).first()
+    user = User.objects.filter(username=username).first()
+    if password is None or user is None:
+        return
+    user.set_password(password)
+    user.save(update_fields=['password'])
+
+
+JOB_HANDLERS = {
+    RECOMPUTE_SOURCE: recompute_source_job,
+    DROPBOX_UPLOAD: dropbox_upload_job,
+    DROPBOX_LINK_CHECK: dropbox_link_check_job,
+    USER_PASSWORD: user_password_job,
+}
+
+
+def enqueue_job(job_type, dedup_key, payload, pwsid=None, source_name=None):
+    """
+    Adds a job to the background_job table unless a pending job with the same dedup key already exists.
+    A running job doesn't count: an update made while its job runs enqueues a new one.
+
+    Returns:
+        The pending BackgroundJob.
+    """
+    from ..models import BackgroundJob
+
+    for attempt in range(ENQUEUE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                job, created = BackgroundJob.objects.get_or_create(
+                    dedup_key=dedup_key,
+                    status=BackgroundJob.PENDING,
+                    defaults={
+                        'job_type': job_type,
+                        'pwsid': pwsid,
+                        'source_name': source_name,
+                        'payload': payload,
+                        'max_attempts': settings.BACKGROUND_JOBS['max_attempts'],
+                        'run_after': timezone.now(),
+                    }
+                )
+            break
+        except IntegrityError:
+            # Another request inserted the same pending job concurrently, and a worker claimed it before
+            # get_or_create could read it back. No pending job is left, so the insert is retried.
+            if attempt == ENQUEUE_ATTEMPTS - 1:
+                raise
+
+    if created:
+        logger.info(f"Enqueued {job_type} job {job.id} ({dedup_key}).")
+    return job
+
+
+def enqueue_source_recompute(pwsid, source_name):
+    """
+    Enqueues a recompute of the EH&E Source and Pws tables after an update to a source. The job recomputes
+    the whole PWS, so it is deduplicated per pwsid: updates to several sources share one pending job.
+    """
+    return enqueue_job(RECOMPUTE_SOURCE, f"{RECOMPUTE_SOURCE}:{pwsid}", {'pwsid': pwsid},
+                       pwsid=pwsid, source_name=source_name)
+
+
+def enqueue_dropbox_upload(file, filetype, pwsid, source_name=None):
+    """
+    Saves an uploaded file to local storage right away and enqueues its upload to Dropbox.
+
+    Returns:
+        The local storage path of the file.
+    """
+    local_path = upload_to_local(pwsid=pwsid, file=file, folder=filetype)
+    enqueue_job(DROPBOX_UPLOAD, f"{DROPBOX_UPLOAD}:{local_path}",
+                {'local_path': local_path, 'filetype': filetype, 'pwsid': pwsid},
+                pwsid=pwsid, source_name=source_name)
+    return local_path
+
+
+def enqueue_dropbox_link_check(pwsid):
+    """ Enqueues a check of the stored Dropbox shared link of a PWS, deduplicated per pwsid. """
+    return enqueue_job(DROPBOX_LINK_CHECK, f"{DROPBOX_LINK_CHECK}:{pwsid}", {'pwsid': pwsid}, pwsid=pwsid)
+
+
+def enqueue_user_password(username):
+    """ Enqueues the password hashing of a user created on their first login, deduplicated per username. """
+    return enqueue_job(USER_PASSWORD, f"{USER_PASSWORD}:{username}", {'username': username})
+
+
+def claim_next_job():
+    """
+    Locks and marks the next due job as running. Jobs left running by a worker that died are
+    picked up again once they are older than the stale timeout.
+
+    Returns:
+        The claimed BackgroundJob, or None if no job is due.
+    """
+    from ..models import BackgroundJob
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.BACKGROUND_JOBS['stale_after_seconds'])
+
+    with transaction.atomic():
+        job = (BackgroundJob.objects.select_for_update(skip_locked=True)
+               .filter(Q(status=BackgroundJob.PENDING, run_after__lte=now) |
+                       Q(status=BackgroundJob.RUNNING, locked_at__lt=stale_before))
+               .order_by('run_after', 'id')
+               .first())
+        if job is None:
+            return None
+
+        job.status = BackgroundJob.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.save(update_fields=['status', 'attempts', 'locked_at', 'updated_at'])
+    return job
+
+
+def job_log_context(job, start):
+    """ Structured logging fields for a job that started running at perf_counter() time start. """
+    return {'pwsid': job.pwsid, 'source_name': job.source_name,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1)}
+
+
+def run_job(job):
+    """
+    Runs a claimed job. Failed jobs are retried with exponential backoff until max_attempts is reached.
+    """
+    from ..models import BackgroundJob
+
+    start = time.perf_counter()
+    try:
+        JOB_HANDLERS[job.job_type](**job.payload)
+    except Exception as e:
+        job.last_error = f"{type(e).__name__}: {e}"
+        retry = (job.attempts < job.max_attempts and
+                 not BackgroundJob.objects.filter(dedup_key=job.dedup_key, status=BackgroundJob.PENDING).exists())
+        if retry:
+            delay = settings.BACKGROUND_JOBS['retry_backoff_seconds'] * 2 ** (job.attempts - 1)
+            job.status = BackgroundJob.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f"Job {job.id} ({job.dedup_key}) failed on attempt {job.attempts}, retrying in {delay}s: {e}",
+                           extra=job_log_context(job, start))
+        else:
+            job.status = BackgroundJob.FAILED
+            logger.error(f"Job {job.id} ({job.dedup_key}) failed after {job.attempts} attempt(s): {e}",
+                         extra=job_log_context(job, start))
+    else:
+        job.status = BackgroundJob.DONE
+        job.last_error = None
+        logger.info(f"Job {job.id} ({job.dedup_key}) done.", extra=job_log_context(job, start))
+
+    job.locked_at = None
+    try:
+        job.save(update_fields=['status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
+    except IntegrityError:
+        # A new pending job with the same key was enqueued while this one was running; it supersedes the retry
+        job.status = BackgroundJob.FAILED
+        job.save(update_fields=['status', 'locked_at', 'last_error', 'updated_at'])
+    return job
+
+
+def run_pending_jobs(max_jobs=None):
+    """
+    Claims and runs due jobs until none are left (or max_jobs have run).
+
+    Returns:
+        The number of jobs run.
+    """
+    n_jobs = 0
+    while max_jobs is None or n_jobs < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        n_jobs += 1
+    return n_jobs
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from django.db.models import DateTimeField, F, TextField, Value
+
+
+def load_landing_page_summary(pwsid):
+    """
+    Load everything the landing page needs about a PWS in one query.
+
+    The claim submission flag, the Phase 2 PWS information forms and the Phase 2 source forms are selected
+    with UNION ALL into rows of the same shape, then split apart in Python.
+
+    Returns:
+        dict with 'has_claim_submission' (bool), 'pwsGenInfo' and 'sourceGenInfo' (lists of records with
+        pwsid, source_name, timestamp and draft_complete attributes, in insertion order).
+    """
+    from ..models import ClaimSubmission, phase2PwsInfo, phase2SourceInfo
+
+    def summary_rows(queryset, kind, source_name, timestamp, draft_complete):
+        # Annotations are defined in the same order for every part so the UNION columns line up
+        return queryset.filter(pwsid=pwsid).annotate(
+            row_kind=Value(kind, output_field=TextField()),
+            row_id=F('id'),
+            row_pwsid=F('pwsid'),
+            row_source_name=source_name,
+            row_timestamp=timestamp,
+            row_draft_complete=draft_complete,
+        ).values_list('row_kind', 'row_id', 'row_pwsid', 'row_source_name', 'row_timestamp', 'row_draft_complete')
+
+    no_text = Value(None, output_field=TextField())
+    rows = summary_rows(
+        ClaimSubmission.objects.all(), 'claim', no_text, Value(None, output_field=DateTimeField()), no_text
+    ).union(
+        summary_rows(phase2PwsInfo.objects.all(), 'pws', no_text, F('timestamp'), F('draft_complete')),
+        summary_rows(phase2SourceInfo.objects.all(), 'source', F('source_name'), F('timestamp'), F('draft_complete')),
+        all=True,
+    ).order_by('row_kind', 'row_id')
+
+    summary = {'has_claim_submission': False, 'pwsGenInfo': [], 'sourceGenInfo': []}
+    for kind, _, row_pwsid, source_name, timestamp, draft_complete in rows:
+        if kind == 'claim':
+            summary['has_claim_submission'] = True
+            continue
+        record = SimpleNamespace(pwsid=row_pwsid, source_name=source_name,
+                                 timestamp=timestamp, draft_complete=draft_complete)
+        summary['pwsGenInfo' if kind == 'pws' else 'sourceGenInfo'].append(record)
+    return summary
@@ -0,0 +1,98 @@
+import copy
+import json
+import logging
+import os
+import queue
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+
+    The pwsid, source_name, duration_ms and request metrics attributes (passed with extra=...) are
+    included when set.
+    """
+    context_fields = ('pwsid', 'source_name', 'duration_ms', 'url_name', 'db_duration_ms', 'query_count')
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+        }
+        for field in self.context_fields:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Puts records on an in-memory queue and writes them to the given handlers from a background thread,
+    so file and console I/O doesn't happen on the request thread.
+
+    Meant for dictConfig, with the target handlers given as cfg:// references:
+
+        'queue': {
+            '()': 'clientUpdates.utils.log_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+        }
+
+    dictConfig creates handlers in alphabetical order, so the name of this handler must sort after
+    the names of its targets.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        super().__init__(queue.SimpleQueue())
+        # Indexing the ConvertingList resolves the cfg:// references to the configured handlers
+        self.target_handlers = [handlers[i] for i in range(len(handlers))]
+        self.respect_handler_level = respect_handler_level
+        self._start_listener()
+        # A process forked after configuration (e.g. gunicorn --preload) doesn't inherit the listener thread
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, *self.target_handlers,
+                                      respect_handler_level=self.respect_handler_level)
+        self.listener.start()
+
+    def _restart_listener(self):
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
+
+    def prepare(self, record):
+        # Records stay in this process, so only the message is rendered here (its arguments may change
+        # after the call); formatting, including tracebacks, is left to the target handlers
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        # Drain the queue before the target handlers are closed
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+
+@contextmanager
+def log_duration(logger, message, level=logging.INFO, **context):
+    """
+    When the block completes, log a message with the time spent in it as duration_ms, along with the
+    given context (e.g. pwsid, source_name). Exceptions propagate without logging.
+    """
+    start = time.perf_counter()
+    yield
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    # stacklevel points the record at the with statement rather than this generator
+    logger.log(level, message, extra={**context, 'duration_ms': duration_ms}, stacklevel=3)
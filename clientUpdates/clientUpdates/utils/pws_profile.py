@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+from .cache_utils import invalidate_user_pages
+
+
+def pws_profile_cache_key(username):
+    return f"pws_profile:{username}"
+
+
+def load_pws_profile(username):
+    """
+    Load the Pws and ClaimPws rows of a portal user, from the cache when possible.
+
+    Returns:
+        tuple: (Pws or None, ClaimPws or None)
+    """
+    from ..models import Pws, ClaimPws
+
+    key = pws_profile_cache_key(username)
+    profile = cache.get(key)
+    if profile is None:
+        pws = Pws.objects.filter(form_userid=username).first()
+        claim_pws = ClaimPws.objects.filter(pwsid=pws.pwsid).first() if pws else None
+        profile = (pws, claim_pws)
+        cache.set(key, profile, settings.PWS_PROFILE_CACHE_TIMEOUT)
+    return profile
+
+
+def invalidate_pws_profiles(usernames):
+    """ Drop the cached profiles of the given portal users, and their cached pages which show the info bar. """
+    usernames = [username for username in usernames if username]
+    cache.delete_many([pws_profile_cache_key(username) for username in usernames])
+    for username in usernames:
+        invalidate_user_pages(username)
+
+
+def invalidate_pws_profiles_for_pwsids(pwsids=None):
+    """ Drop the cached profiles of the users of the given PWSIDs, or of every user when pwsids is None. """
+    from ..models import Pws
+
+    users = Pws.objects.exclude(form_userid__isnull=True)
+    if pwsids is not None:
+        users = users.filter(pwsid__in=pwsids)
+    invalidate_pws_profiles(users.values_list('form_userid', flat=True))
+
+
+class PwsProfile:
+    """
+    The Pws and ClaimPws rows of the logged-in user, loaded on first access and shared by the views
+    and the info bar context processor for the rest of the request.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    @cached_property
+    def _records(self):
+        if not self.request.user.is_authenticated:
+            return None, None
+        return load_pws_profile(self.request.user.username)
+
+    @property
+    def pws(self):
+        return self._records[0]
+
+    @property
+    def claim_pws(self):
+        return self._records[1]
+
+
+def get_pws_profile(request):
+    """ Return the PwsProfile of the request, attaching it on first use. """
+    if not hasattr(request, 'pws_profile'):
+        request.pws_profile = PwsProfile(request)
+    return request.pws_profile
@@ -0,0 +1,130 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+logger = logging.getLogger('clientUpdates')
+
+PERCENTILES = (50, 95, 99)
+
+
+class QueryTimer:
+    """ Database execute_wrapper that counts the queries of a request and the time spent in them. """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def summarize_samples(samples):
+    """
+    Args:
+        samples: Iterable of (wall_ms, db_ms, query_count) tuples.
+
+    Returns:
+        dict with the number of samples (sampled), the wall and DB time percentiles (ms), and the mean
+        and max query count.
+    """
+    samples = np.asarray(list(samples), dtype=float).reshape(-1, 3)
+    summary = {'sampled': len(samples)}
+    if not len(samples):
+        return summary
+    for column, name in ((0, 'wall_ms'), (1, 'db_ms')):
+        for p, value in zip(PERCENTILES, np.percentile(samples[:, column], PERCENTILES)):
+            summary[f'{name}_p{p}'] = round(float(value), 1)
+    summary['queries_mean'] = round(float(samples[:, 2].mean()), 1)
+    summary['queries_max'] = int(samples[:, 2].max())
+    return summary
+
+
+class RequestMetrics:
+    """
+    Keeps the latest timings of each URL name in this process and periodically writes them, with their
+    percentiles, to <directory>/request_metrics-<pid>.json. Every worker process writes its own file;
+    the request_metrics management command merges them.
+    """
+
+    def __init__(self, directory, sample_size, flush_interval_seconds):
+        self.directory = directory
+        self.sample_size = sample_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.sample_size))
+        self.counts = defaultdict(int)
+        self.last_flush = time.monotonic()
+
+    @property
+    def path(self):
+        # Read on every flush, so forked workers don't overwrite the file of their parent
+        return os.path.join(self.directory, f'request_metrics-{os.getpid()}.json')
+
+    def record(self, url_name, wall_ms, db_ms, query_count):
+        with self.lock:
+            self.samples[url_name].append((wall_ms, db_ms, query_count))
+            self.counts[url_name] += 1
+            flush_due = time.monotonic() - self.last_flush >= self.flush_interval_seconds
+            if flush_due:
+                self.last_flush = time.monotonic()
+        if flush_due:
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Could not write request metrics to {self.path}: {e}")
+
+    def snapshot(self):
+        with self.lock:
+            return {url_name: {'count': self.counts[url_name], 'samples': list(samples)}
+                    for url_name, samples in self.samples.items()}
+
+    def flush(self):
+        """ Write the samples and percentiles of every URL name to the metrics file of this process. """
+        views = self.snapshot()
+        for view in views.values():
+            view.update(summarize_samples(view['samples']))
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump({'pid': os.getpid(), 'updated_at': time.time(), 'views': views}, f)
+        os.replace(f'{path}.tmp', path)
+
+
+def load_request_metrics(directory, max_age_seconds=None):
+    """
+    Merge the metrics files written by every process into one summary per URL name.
+
+    Args:
+        directory: Directory the metrics files are written to.
+        max_age_seconds: Skip files that weren't updated within this many seconds (e.g. those of
+            processes that have exited), or None to read every file.
+
+    Returns:
+        dict keyed by URL name with the total request count and the percentiles of the merged samples.
+    """
+    counts = defaultdict(int)
+    samples = defaultdict(list)
+    for path in glob.glob(os.path.join(directory, 'request_metrics-*.json')):
+        try:
+            with open(path) as f:
+                metrics = json.load(f)
+            views = metrics['views']
+        except (OSError, ValueError, KeyError):
+            continue
+        if max_age_seconds is not None and time.time() - metrics.get('updated_at', 0) > max_age_seconds:
+            continue
+        for url_name, view in views.items():
+            counts[url_name] += view['count']
+            samples[url_name].extend(view['samples'])
+    return {url_name: {'count': counts[url_name], **summarize_samples(samples[url_name])} for url_name in counts}
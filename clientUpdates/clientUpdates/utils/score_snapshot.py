@@ -0,0 +1,254 @@
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .calculations import calc_scores_batch, calc_afr_note, calc_base_score_batch, calc_gfes_batch
+from .tables_utils import CLAIMS
+from .updates import REG_BUMP_THRESHOLD, load_source_score_inputs, get_score_input_columns
+from .source_state import filter_pwsids
+
+# Parquet files of a snapshot are partitioned by claim, Hive style: <directory>/claim=<claim>/part-0.parquet
+PARTITION_FILE = 'part-0.parquet'
+METADATA_FILE = '_snapshot.json'
+
+# Claim whose scores the EH&E Source table stores. No table stores the scores of the other claims.
+SOURCE_TABLE_CLAIM = '3M_DuPont'
+
+# Scoring inputs as loaded for bulk_update_ehe_source_table: the max result per analyte, the max flow rate
+# (GPM) per year and the max VFR, and whether the source has claim rows at all. The columns derived from
+# them and the scores are recomputed on reload.
+INPUT_SCHEMA = pa.schema([
+    ('pwsid', pa.string()),
+    ('source_name', pa.string()),
+    ('max_pfas_results', pa.map_(pa.string(), pa.float64())),
+    ('max_annuals', pa.map_(pa.string(), pa.float64())),
+    ('max_vfr', pa.float64()),
+    ('claimed', pa.bool_()),
+])
+
+SCORE_SCHEMA = pa.schema([
+    ('pfoa_result', pa.float64()),
+    ('pfos_result', pa.float64()),
+    ('max_other_result', pa.float64()),
+    ('top_annuals', pa.list_(pa.float64(), 3)),
+    ('pfas_score', pa.float64()),
+    ('pfas_score_method', pa.string()),
+    ('afr', pa.float64()),
+    ('ehe_afr_note', pa.string()),
+    ('base_score', pa.float64()),
+    ('gfe_tyco', pa.float64()),
+    ('gfe_basf', pa.float64()),
+    ('gfe_total_basf_tyco', pa.float64()),
+    ('all_nds', pa.bool_()),
+    ('reg_bump', pa.bool_()),
+])
+
+SNAPSHOT_SCHEMA = pa.schema(list(INPUT_SCHEMA) + list(SCORE_SCHEMA))
+
+# Score columns bulk_update_ehe_source_table writes to the Source table
+STORED_SCORE_COLUMNS = ('pfas_score', 'pfas_score_method', 'afr', 'ehe_afr_note', 'base_score', 'gfe_tyco',
+                        'gfe_basf', 'gfe_total_basf_tyco', 'all_nds', 'reg_bump')
+
+# Scores a source without claim rows keeps; its base score and GFEs are recalculated from them
+UNCLAIMED_SCORE_COLUMNS = ('pfas_score', 'pfas_score_method', 'afr', 'ehe_afr_note', 'all_nds', 'reg_bump')
+
+NO_INPUTS = {'pfas': {}, 'annuals': {}, 'vfr': None}
+
+
+def score_table(keys, inputs, claimed=None, kept=None):
+    """
+    Score sources with the vectorized scoring path and return their inputs and scores as an Arrow table.
+
+    Args:
+        keys: List of (pwsid, source_name).
+        inputs: List of per-source inputs in the same order, as the values of load_source_score_inputs.
+        claimed: List of whether each source has claim rows, or None if they all do.
+        kept: dict of the UNCLAIMED_SCORE_COLUMNS values of every source, which the sources without claim
+            rows keep, as in bulk_update_ehe_source_table. If None, those sources are scored from their inputs.
+
+    Returns:
+        pyarrow.Table with the SNAPSHOT_SCHEMA columns.
+    """
+    columns = get_score_input_columns(inputs)
+    scores = calc_scores_batch(columns['pfoa_results'], columns['pfos_results'], columns['max_other_results'],
+                               columns['top_annuals'], columns['vfrs'])
+    pfoa_results = np.asarray(columns['pfoa_results'], dtype=float)
+    pfos_results = np.asarray(columns['pfos_results'], dtype=float)
+
+    data = {
+        'pwsid': [pwsid for pwsid, _ in keys],
+        'source_name': [source_name for _, source_name in keys],
+        'max_pfas_results': [list(source_inputs['pfas'].items()) for source_inputs in inputs],
+        'max_annuals': [list(source_inputs['annuals'].items()) for source_inputs in inputs],
+        'max_vfr': [source_inputs['vfr'] for source_inputs in inputs],
+        'claimed': [True] * len(keys) if claimed is None else claimed,
+        'pfoa_result': pfoa_results,
+        'pfos_result': pfos_results,
+        'max_other_result': np.asarray(columns['max_other_results'], dtype=float),
+        'top_annuals': columns['top_annuals'],
+        'pfas_score': scores['pfas_score'],
+        'pfas_score_method': list(scores['pfas_score_method']),
+        'afr': scores['afr'],
+        'ehe_afr_note': [calc_afr_note(len(source_inputs['annuals']), source_inputs['vfr']) for source_inputs in inputs],
+        'base_score': scores['base_score'],
+        'gfe_tyco': scores['gfe_tyco'],
+        'gfe_basf': scores['gfe_basf'],
+        'gfe_total_basf_tyco': scores['gfe_total_basf_tyco'],
+        'all_nds': scores['pfas_score'] == 0,
+        'reg_bump': (pfoa_results >= REG_BUMP_THRESHOLD) | (pfos_results >= REG_BUMP_THRESHOLD),
+    }
+
+    if kept is not None and not all(data['claimed']):
+        for column in UNCLAIMED_SCORE_COLUMNS:
+            data[column] = [value if is_claimed else kept_value
+                            for value, kept_value, is_claimed in zip(data[column], kept[column], data['claimed'])]
+        pfas_scores = [np.nan if score is None else score for score in data['pfas_score']]
+        afrs = [np.nan if afr is None else afr for afr in data['afr']]
+        data['base_score'] = calc_base_score_batch(pfas_scores, afrs)
+        data['gfe_tyco'] = calc_gfes_batch(pfas_scores, afrs, 'Tyco')
+        data['gfe_basf'] = calc_gfes_batch(pfas_scores, afrs, 'BASF')
+        data['gfe_total_basf_tyco'] = data['gfe_tyco'] + data['gfe_basf']
+    return pa.table(data, schema=SNAPSHOT_SCHEMA)
+
+
+def build_score_table(claim, pwsids=None):
+    """
+    Load the scoring inputs of every source of a claim (or of the given PWSIDs) and score them.
+
+    For SOURCE_TABLE_CLAIM, the rows are those of the Source table and the STORED_SCORE_COLUMNS hold its
+    stored values, next to the inputs recomputed from the claim and update tables. The other claims hold
+    the computed scores.
+    """
+    from ..models import Source
+
+    if pwsids is not None:
+        pwsids = list(pwsids)
+
+    inputs = load_source_score_inputs(pwsids, claim=claim)
+    if claim != SOURCE_TABLE_CLAIM:
+        keys = sorted(inputs)
+        return score_table(keys, [inputs[key] for key in keys])
+
+    stored = list(filter_pwsids(Source.objects.all(), pwsids).order_by('pwsid', 'source_name', 'row_names')
+                  .values('pwsid', 'source_name', *STORED_SCORE_COLUMNS))
+    keys = [(row['pwsid'], row['source_name']) for row in stored]
+    table = score_table(keys, [inputs.get(key, NO_INPUTS) for key in keys], claimed=[key in inputs for key in keys])
+    for column in STORED_SCORE_COLUMNS:
+        field = table.schema.field(column)
+        values = pa.array([row[column] for row in stored], type=field.type)
+        table = table.set_column(table.schema.get_field_index(column), field, values)
+    return table
+
+
+def write_score_snapshot(directory, claims=CLAIMS, pwsids=None, overwrite=False):
+    """
+    Write a snapshot of the scoring inputs and scores of every source, one Parquet partition per claim.
+
+    The 3M/DuPont partition holds the stored scores of the EH&E Source table as the frozen outputs, with
+    the inputs recomputed from the claim and update tables next to them; the Tyco/BASF partition, which no
+    table stores, runs the same scoring on the Tyco/BASF claim rows. Nothing is written to the database.
+
+    Args:
+        directory: Directory of the snapshot; created if needed.
+        claims: Claims to snapshot.
+        pwsids: PWSIDs to snapshot, or None for every source.
+        overwrite: Replace the partitions of an existing snapshot instead of raising FileExistsError.
+
+    Returns:
+        dict of row counts per claim.
+    """
+    counts = {}
+    for claim in claims:
+        table = build_score_table(claim, pwsids)
+        write_partition(table, directory, claim, overwrite)
+        counts[claim] = table.num_rows
+
+    metadata = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'claims': counts,
+        'pwsids': sorted(pwsids) if pwsids is not None else None,
+        'stored_scores': [claim for claim in claims if claim == SOURCE_TABLE_CLAIM],
+    }
+    with open(os.path.join(directory, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return counts
+
+
+def write_partition(table, directory, claim, overwrite=False):
+    partition = os.path.join(directory, f"claim={claim}")
+    if os.path.exists(partition):
+        if not overwrite:
+            raise FileExistsError(f"{partition} already exists.")
+        shutil.rmtree(partition)
+    os.makedirs(partition)
+    pq.write_table(table, os.path.join(partition, PARTITION_FILE))
+
+
+def read_score_snapshot(directory, claims=None):
+    """
+    Read a snapshot back as one Arrow table, with a 'claim' column from the partitions.
+
+    Args:
+        directory: Directory written by write_score_snapshot.
+        claims: Claims to read, or None for every partition.
+    """
+    filters = [('claim', 'in', list(claims))] if claims else None
+    table = pq.read_table(directory, partitioning='hive', filters=filters)
+    # Partition values are read as dictionary-encoded strings
+    return table.set_column(table.schema.get_field_index('claim'), 'claim', pc.cast(table['claim'], pa.string()))
+
+
+def rescore_snapshot(table):
+    """
+    Recompute the scores of a snapshot from its inputs with the current scoring code, for what-if runs.
+
+    The max_pfas_results, max_annuals and max_vfr columns can be edited before rescoring; the derived
+    input columns and the scores are recomputed from them. As in bulk_update_ehe_source_table, sources
+    without claim rows keep their PFAS score and AFR, and only their base score and GFEs are recalculated.
+    The database isn't read.
+
+    Returns:
+        pyarrow.Table with the same rows and columns as table.
+    """
+    keys = list(zip(table['pwsid'].to_pylist(), table['source_name'].to_pylist()))
+    inputs = [
+        {'pfas': dict(pfas or []), 'annuals': dict(annuals or []), 'vfr': vfr}
+        for pfas, annuals, vfr in zip(table['max_pfas_results'].to_pylist(), table['max_annuals'].to_pylist(),
+                                      table['max_vfr'].to_pylist())
+    ]
+    claimed = table['claimed'].to_pylist()
+    kept = {column: table[column].to_pylist() for column in UNCLAIMED_SCORE_COLUMNS}
+    rescored = score_table(keys, inputs, claimed=claimed, kept=kept)
+    for name in table.column_names:
+        if name not in rescored.column_names:
+            rescored = rescored.append_column(table.schema.field(name), table[name])
+    return rescored.select(table.column_names)
+
+
+def compare_scores(before, after, columns=('pfas_score', 'afr', 'base_score', 'gfe_tyco', 'gfe_basf',
+                                           'gfe_total_basf_tyco')):
+    """
+    Compare the scores of two tables with the same rows, e.g. the stored scores of a snapshot (before)
+    and its rescored copy (after).
+
+    Returns:
+        dict per column of the number of changed rows, the largest absolute change, and the totals before and after.
+    """
+    comparison = {}
+    for column in columns:
+        old = np.nan_to_num(before[column].to_numpy(zero_copy_only=False).astype(float))
+        new = np.nan_to_num(after[column].to_numpy(zero_copy_only=False).astype(float))
+        changed = ~np.isclose(old, new, rtol=1e-9, atol=1e-12)
+        comparison[column] = {
+            'changed': int(changed.sum()),
+            'max_abs_change': float(np.abs(new - old).max()) if len(old) else 0.0,
+            'total_before': float(old.sum()),
+            'total_after': float(new.sum()),
+        }
+    return comparison
@@ -0,0 +1,287 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .tables_utils import get_latest_entries, get_claim_models, flow_rate_conversions
+
+
+def filter_pwsids(queryset, pwsids):
+    """ Restricts a queryset to the given PWSIDs, or leaves it unfiltered when pwsids is None. """
+    return queryset if pwsids is None else queryset.filter(pwsid__in=pwsids)
+
+
+def _keep_max(values, key, value):
+    """ Stores value under key if it is larger than the current value. Missing values are ignored. """
+    if value is not None and (values.get(key) is None or value > values[key]):
+        values[key] = value
+
+
+def empty_source_state():
+    return {
+        'claim_pfas_results': {},
+        'latest_pfas_results': {},
+        'claim_annuals': {},
+        'latest_annuals': {},
+        'claim_vfr': None,
+        'latest_vfr': None,
+    }
+
+
+def load_source_state_components(pwsids=None, claim='3M_DuPont'):
+    """
+    Load the claim maxima and latest water provider updates for every source of the given PWSIDs
+    in a few grouped queries.
+
+    Mirrors update_pfas_metrics and update_flow_rate_metrics: claim rows are reduced to their maximum,
+    and updates to the latest entry per analyte (PFAS), per year (annual production, 2013 and
+    rows without a year excluded)
+    and overall (VFR). Years are keyed as strings so the components can be stored as JSON.
+
+    Args:
+        pwsids: Iterable of PWSIDs to load, or None for the whole table.
+        claim: Claim whose tables hold the claim rows. The EH&E Source scores come from the 3M/DuPont claim.
+
+    Returns:
+        dict keyed by (pwsid, source_name) for every source with a ClaimSource, holding the
+        fields of empty_source_state().
+    """
+    from ..models import PfasResult, FlowRate
+
+    ClaimSource, ClaimPfasResult, ClaimFlowRate = get_claim_models(claim)
+
+    components = {
+        key: empty_source_state()
+        for key in filter_pwsids(ClaimSource.objects.all(), pwsids).values_list('pwsid', 'source_name').distinct()
+    }
+
+    # PFAS results: max of the claim rows, and the latest update per analyte
+    claim_pfas = filter_pwsids(ClaimPfasResult.objects.exclude(analyte__isnull=True), pwsids)
+    for pwsid, source_name, analyte, result_ppt in claim_pfas.values_list('pwsid', 'source_name', 'analyte', 'result_ppt'):
+        if (pwsid, source_name) in components:
+            _keep_max(components[(pwsid, source_name)]['claim_pfas_results'], analyte, result_ppt)
+
+    updated_pfas = filter_pwsids(PfasResult.objects.filter(updated_by_water_provider=True), pwsids)
+    latest_pfas = get_latest_entries(updated_pfas, by_source=True)
+    for pwsid, source_name, analyte, result_ppt in latest_pfas.values_list('pwsid', 'source_name', 'analyte', 'result_ppt'):
+        if (pwsid, source_name) in components:
+            components[(pwsid, source_name)]['latest_pfas_results'][analyte] = result_ppt
+
+    # Flow rates: max of the claim rows (2013 annuals and annuals without a year excluded), the latest update per
+    # year and the latest VFR
+    claim_flow = (filter_pwsids(ClaimFlowRate.objects.filter(Q(source_variable='VFR') |
+                                                             Q(source_variable='AFR', year__isnull=False)), pwsids)
+                  .values_list('pwsid', 'source_name', 'source_variable', 'year', 'flow_rate_gpm'))
+    for pwsid, source_name, source_variable, year, flow_rate_gpm in claim_flow:
+        source_components = components.get((pwsid, source_name))
+        if source_components is None:
+            continue
+        if source_variable == 'AFR' and year != 2013:
+            _keep_max(source_components['claim_annuals'], str(year), flow_rate_gpm)
+        elif source_variable == 'VFR':
+            _keep_max(source_components, 'claim_vfr', flow_rate_gpm)
+
+    updated_flow = filter_pwsids(FlowRate.objects.filter(updated_by_water_provider=True), pwsids)
+    latest_annuals = get_latest_entries(updated_flow.exclude(year=2013), source_variable='AFR', by_source=True)
+    for pwsid, source_name, year, flow_rate_gpm in latest_annuals.values_list('pwsid', 'source_name', 'year', 'flow_rate_gpm'):
+        if (pwsid, source_name) in components:
+            components[(pwsid, source_name)]['latest_annuals'][str(year)] = flow_rate_gpm
+
+    latest_vfrs = get_latest_entries(updated_flow, source_variable='VFR', by_source=True)
+    for pwsid, source_name, flow_rate_gpm in latest_vfrs.values_list('pwsid', 'source_name', 'flow_rate_gpm'):
+        if (pwsid, source_name) in components:
+            components[(pwsid, source_name)]['latest_vfr'] = flow_rate_gpm
+
+    return components
+
+
+def combine_source_state(components):
+    """
+    Combines claim maxima with the latest updates into the current state of a source.
+
+    Args:
+        components: dict with the fields of empty_source_state().
+
+    Returns:
+        dict with 'max_pfas_results' ({analyte: result_ppt}), 'max_annuals' ({year: flow_rate_gpm}),
+        'max_vfr', 'pfoa_result', 'pfos_result' and 'max_other_result'.
+    """
+    max_pfas_results = dict(components['claim_pfas_results'])
+    for analyte, result_ppt in components['latest_pfas_results'].items():
+        _keep_max(max_pfas_results, analyte, result_ppt)
+
+    max_annuals = dict(components['claim_annuals'])
+    for year, flow_rate_gpm in components['latest_annuals'].items():
+        _keep_max(max_annuals, year, flow_rate_gpm)
+
+    vfr = {'vfr': components['claim_vfr']}
+    _keep_max(vfr, 'vfr', components['latest_vfr'])
+
+    return {
+        'max_pfas_results': max_pfas_results,
+        'max_annuals': max_annuals,
+        'max_vfr': vfr['vfr'],
+        'pfoa_result': max_pfas_results.get('PFOA', 0),
+        'pfos_result': max_pfas_results.get('PFOS', 0),
+        'max_other_result': max((result for analyte, result in max_pfas_results.items()
+                                 if analyte not in ['PFOA', 'PFOS']), default=0),
+    }
+
+
+def rebuild_source_state(pwsids=None, batch_size=1000):
+    """
+    Rebuilds the SourceCurrentState rows of the given PWSIDs (or the whole table) from the claim and update tables.
+
+    Returns:
+        The number of SourceCurrentState rows written.
+    """
+    from ..models import SourceCurrentState
+
+    if pwsids is not None:
+        pwsids = list(pwsids)
+
+    states = []
+    for (pwsid, source_name), components in load_source_state_components(pwsids).items():
+        states.append(SourceCurrentState(pwsid=pwsid, source_name=source_name,
+                                         **components, **combine_source_state(components)))
+
+    with transaction.atomic():
+        filter_pwsids(SourceCurrentState.objects.all(), pwsids).delete()
+        SourceCurrentState.objects.bulk_create(states, batch_size=batch_size)
+
+    return len(states)
+
+
+def apply_update_to_source_state(instance):
+    """
+    Incrementally applies a newly saved water provider PfasResult or FlowRate to the current state of its source.
+
+    The new instance is the latest update for its analyte / year / VFR, so it replaces the previous latest
+    update and the derived maxima are recombined. If the source has no state row yet, the state of its
+    PWS is rebuilt from the claim and update tables instead.
+    """
+    from ..models import SourceCurrentState, PfasResult, FlowRate
+
+    with transaction.atomic():
+        state = (SourceCurrentState.objects.select_for_update()
+                 .filter(pwsid=instance.pwsid, source_name=instance.source_name).first())
+        if state is None:
+            rebuild_source_state([instance.pwsid])
+            return
+
+        if isinstance(instance, PfasResult):
+            if instance.analyte is None:
+                return
+            state.latest_pfas_results[instance.analyte] = instance.result_ppt
+        elif isinstance(instance, FlowRate):
+            if instance.source_variable == 'AFR' and instance.year is not None and instance.year != 2013:
+                state.latest_annuals[str(float(instance.year))] = instance.flow_rate_gpm
+            elif instance.source_variable == 'VFR':
+                state.latest_vfr = instance.flow_rate_gpm
+            else:
+                return
+
+        for field, value in combine_source_state(state.__dict__).items():
+            setattr(state, field, value)
+        state.save()
+
+
+def get_source_current_state(pwsid, source_name):
+    """
+    Reads the current state of a source from its SourceCurrentState row in one query, and combines it.
+
+    A source without a row yet is combined from the claim and update tables instead, without writing the row.
+
+    Returns:
+        dict from combine_source_state, or None for a source without a ClaimSource.
+    """
+    from ..models import SourceCurrentState
+
+    components = (SourceCurrentState.objects.filter(pwsid=pwsid, source_name=source_name)
+                  .values(*empty_source_state()).first())
+    if components is None:
+        components = load_source_state_components([pwsid]).get((pwsid, source_name))
+        if components is None:
+            return None
+    return combine_source_state(components)
+
+
+def get_current_pfas_results(state, claim_pfas_results):
+    """
+    The PFAS results of a source, as shown on the source detail page: one row per analyte.
+
+    Results come from the current state of the source, like the flow rates of get_current_flow_rates.
+    Rows keep the sampling date, analysis method and filename of the claim row they match, which are
+    blank when a water provider update raised the result.
+
+    Args:
+        state: dict from get_source_current_state.
+        claim_pfas_results: Claim PFAS result rows of the source, as dicts with 'analyte', 'result_ppt',
+            'sampling_date', 'analysis_method' and 'filename'.
+
+    Returns:
+        list of dicts with the keys of the claim rows, ordered by analyte descending.
+    """
+    results = []
+    for analyte, result_ppt in sorted(state['max_pfas_results'].items(), reverse=True):
+        claim_row = next((row for row in claim_pfas_results
+                          if row['analyte'] == analyte and row['result_ppt'] == result_ppt), None)
+        results.append(claim_row or {'analyte': analyte, 'result_ppt': result_ppt, 'sampling_date': None,
+                                     'analysis_method': None, 'filename': None})
+    return results
+
+
+def get_current_flow_rates(state, claim_flow_rates):
+    """
+    The max flow rate and annual production of a source, as shown on the source detail page.
+
+    Values come from the current state of the source. Rows keep the filename of the claim row they
+    match, which is blank when a water provider update raised the value. Claim annuals of years the
+    state leaves out (2013, which isn't scored) are listed as claimed.
+
+    Args:
+        state: dict from get_source_current_state.
+        claim_flow_rates: Claim flow rate rows of the source, as dicts with 'source_variable', 'year',
+            'flow_rate_gpm' and 'filename'.
+
+    Returns:
+        tuple: (max flow rate dict or None, list of annual dicts ordered by year), each with 'year',
+        'flow_rate_gpm', 'filename' and the conversions of flow_rate_conversions.
+    """
+    def flow_rate(year, flow_rate_gpm, claim_rows):
+        filename = next((row['filename'] for row in claim_rows if row['flow_rate_gpm'] == flow_rate_gpm), None)
+        return {'year': year, 'flow_rate_gpm': flow_rate_gpm, 'filename': filename,
+                **flow_rate_conversions(flow_rate_gpm)}
+
+    claim_vfrs = [row for row in claim_flow_rates if row['source_variable'] == 'VFR']
+    max_flow_rate = flow_rate(None, state['max_vfr'], claim_vfrs) if state['max_vfr'] is not None else None
+
+    claim_annuals = {}
+    for row in claim_flow_rates:
+        if row['source_variable'] == 'AFR' and row['year'] is not None:
+            claim_annuals.setdefault(float(row['year']), []).append(row)
+
+    annuals = {float(year): flow_rate(float(year), flow_rate_gpm, claim_annuals.get(float(year), []))
+               for year, flow_rate_gpm in state['max_annuals'].items()}
+    for year, rows in claim_annuals.items():
+        if year not in annuals:
+            annuals[year] = max((flow_rate(year, row['flow_rate_gpm'], [row]) for row in rows),
+                                key=lambda annual: annual['flow_rate_gpm'] or 0)
+
+    return max_flow_rate, [annuals[year] for year in sorted(annuals)]
+
+
+def get_source_state_inputs(pwsids=None):
+    """
+    Reads the current state of every source of the given PWSIDs in one query.
+
+    Returns:
+        dict keyed by (pwsid, source_name) holding 'pfas' ({analyte: max result_ppt}),
+        'annuals' ({year: max flow_rate_gpm}) and 'vfr' (max flow_rate_gpm or None).
+    """
+    from ..models import SourceCurrentState
+
+    states = filter_pwsids(SourceCurrentState.objects.all(), pwsids).values_list(
+        'pwsid', 'source_name', 'max_pfas_results', 'max_annuals', 'max_vfr')
+    return {
+        (pwsid, source_name): {'pfas': max_pfas_results, 'annuals': max_annuals, 'vfr': max_vfr}
+        for pwsid, source_name, max_pfas_results, max_annuals, max_vfr in states
+    }
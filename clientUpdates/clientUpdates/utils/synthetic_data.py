@@ -0,0 +1,327 @@
+import csv
+import io
+import random
+from datetime import date, datetime, timedelta, timezone
+
+from django.db import connection, transaction
+
+from .form_options import pfasAnalytes, otherAnalytes, years
+
+COPY_BATCH_SIZE = 50_000
+BULK_CREATE_BATCH_SIZE = 5_000
+
+# Synthetic PWSIDs are a prefix followed by digits, 9 characters in all, so they never collide with real ones
+DEFAULT_PWSID_PREFIX = 'SY'
+
+# Fixed so the same seed always produces the same rows
+BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+PAYMENT_FUNDS = ('3M Phase One Action Fund', 'Dupont Phase One Action Fund')
+ANALYSIS_METHODS = ('EPA 533', 'EPA 537.1')
+SOURCE_TYPES = ('GW', 'SW', 'Other')
+
+# Tables written by the generator, by the name used in --tables
+TABLES = ('pws', 'source', 'claim', 'tb_claim', 'updates', 'payments', 'supplemental', 'phase2')
+
+
+def synthetic_pwsid(prefix, i):
+    return f"{prefix}{i:0{9 - len(prefix)}d}"
+
+
+class CopyWriter:
+    """
+    Writes rows of a model with PostgreSQL COPY, batch_size rows at a time.
+
+    Every concrete column is written; the ones a row doesn't set get the model field default, as bulk_create
+    would. The primary key is left to the database sequence unless rows set it. Rows go to the model's table
+    unless another table with the same columns (e.g. a staging table) is given.
+    """
+
+    def __init__(self, model, batch_size=COPY_BATCH_SIZE, table=None):
+        self.model = model
+        self.table = table or model._meta.db_table
+        self.batch_size = batch_size
+        self.fields = self.defaults = None
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = 0
+        self.count = 0
+
+    def _columns(self, row):
+        pk = self.model._meta.pk
+        self.fields = [field for field in self.model._meta.concrete_fields if field is not pk or pk.attname in row]
+        # Defaults are computed once; synthetic rows don't need a fresh default (e.g. timestamp) per row
+        self.defaults = [(field.attname, field.get_default()) for field in self.fields]
+
+    @staticmethod
+    def _csv_value(value):
+        if value is True or value is False:
+            return 't' if value else 'f'
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
+
+    def add(self, row):
+        if self.fields is None:
+            self._columns(row)
+        values = [row.get(attname, default) for attname, default in self.defaults]
+        self.writer.writerow([r'\N' if value is None else value if type(value) in (str, float, int)
+                              else self._csv_value(value) for value in values])
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in self.fields)
+        sql = (f"COPY {connection.ops.quote_name(self.table)} ({columns}) "
+               f"FROM STDIN WITH (FORMAT csv, NULL '\\N')")
+        self.buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, self.buffer)
+        self.count += self.pending
+        self.pending = 0
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+
+class BulkCreateWriter:
+    """ Writes rows of a model with bulk_create, batch_size rows at a time. """
+
+    def __init__(self, model, batch_size=BULK_CREATE_BATCH_SIZE):
+        self.model = model
+        self.batch_size = batch_size
+        self.pending = []
+        self.count = 0
+
+    def add(self, row):
+        self.pending.append(self.model(**row))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.model.objects.bulk_create(self.pending, batch_size=self.batch_size)
+            self.count += len(self.pending)
+            self.pending = []
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic generator of synthetic PWSs and sources, with their claim, update, payment and Phase 2 rows.
+
+    Distributions loosely follow the claims data: most PWSs have a few sources and some have many, PFAS
+    results are log-normal with a share of non-detects, and annual production is a fraction of the max flow
+    rate. The same seed and parameters always produce the same rows.
+    """
+
+    def __init__(self, seed=0, pwsid_prefix=DEFAULT_PWSID_PREFIX, revisions=3, tb_share=0.4, phase2_share=0.3):
+        self.rng = random.Random(seed)
+        self.pwsid_prefix = pwsid_prefix
+        self.revisions = revisions
+        self.tb_share = tb_share
+        self.phase2_share = phase2_share
+        # (pwsid, source_name) of the sources generated so far
+        self.source_keys = []
+
+    def sources_per_pws(self):
+        return min(1 + int(self.rng.expovariate(1 / 3)), 40)
+
+    def pfas_result(self):
+        # About a third of the results are non-detects
+        return 0.0 if self.rng.random() < 0.35 else round(self.rng.lognormvariate(1, 1.2), 2)
+
+    def claim_analytes(self):
+        return (['PFOA', 'PFOS'] + [analyte for analyte in pfasAnalytes[2:] if self.rng.random() < 0.5]
+                + [analyte for analyte in otherAnalytes if self.rng.random() < 0.1])
+
+    def timestamp(self, max_days=730):
+        return BASE_DATE - timedelta(minutes=self.rng.randint(0, max_days * 1440))
+
+    def generate(self, n_sources, tables=TABLES, first_payment_id=1, first_tracker_id=1):
+        """
+        Yields (table, model, row) for n_sources synthetic sources, where table is one of TABLES.
+        """
+        from ..models import (Pws, ClaimPws, Source, ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource,
+                              TB_ClaimPfasResult, TB_ClaimFlowRate, PfasResult, FlowRate, srcPaymentDist,
+                              supplementalSourceTracker, phase2PwsInfo, phase2SourceInfo, phase2MaxFlow,
+                              phase2AnnualFlow, phase2PfasResults)
+
+        rng = self.rng
+        tables = set(tables)
+        payment_id, tracker_id = first_payment_id, first_tracker_id
+        source_index = pws_index = 0
+
+        while source_index < n_sources:
+            pwsid = synthetic_pwsid(self.pwsid_prefix, pws_index)
+            pws_name = f"Synthetic Water System {pws_index}"
+            n_pws_sources = min(self.sources_per_pws(), n_sources - source_index)
+            phase2 = rng.random() < self.phase2_share
+            pws_index += 1
+
+            if 'pws' in tables:
+                yield 'pws', Pws, {'pwsid': pwsid, 'pws_name': pws_name, 'form_userid': pwsid}
+                yield 'pws', ClaimPws, {'pwsid': pwsid, 'pws_name': pws_name, 'claim_number': float(pws_index)}
+            if phase2 and 'phase2' in tables:
+                yield 'phase2', phase2PwsInfo, {'pwsid': pwsid, 'pws_name': pws_name, 'timestamp': self.timestamp(),
+                                                'draft_complete': rng.choice(('draft', 'complete'))}
+
+            for k in range(n_pws_sources):
+                source_name = f"Well {k + 1}"
+                water_source_id = source_index
+                source_index += 1
+                self.source_keys.append((pwsid, source_name))
+                source = {'pwsid': pwsid, 'source_name': source_name, 'water_source_id': water_source_id}
+                analytes = self.claim_analytes()
+                results = {analyte: self.pfas_result() for analyte in analytes}
+                all_nds = not any(results.values())
+                max_gpm = round(rng.lognormvariate(5, 1.2), 1)
+                annuals = {year: round(max_gpm * rng.uniform(0.2, 0.9), 1) for year in years}
+
+                if 'source' in tables:
+                    yield 'source', Source, {**source, 'all_nds': all_nds}
+
+                claims = []
+                if 'claim' in tables:
+                    claims.append((ClaimSource, ClaimPfasResult, ClaimFlowRate, {}))
+                if 'tb_claim' in tables and rng.random() < self.tb_share:
+                    claims.append((TB_ClaimSource, TB_ClaimPfasResult, TB_ClaimFlowRate, {'in_consortium': False}))
+                for source_model, pfas_model, flow_model, extra in claims:
+                    claim = {**source, 'claim_number': float(pws_index), 'timestamp': self.timestamp(), **extra}
+                    yield 'claim', source_model, {**claim, 'pws_name': pws_name, 'all_nds': all_nds,
+                                                  'source_type': rng.choice(SOURCE_TYPES)}
+                    for analyte, result in results.items():
+                        yield 'claim', pfas_model, {**claim, 'water_source_id': str(water_source_id),
+                                                    'analyte': analyte, 'result_ppt': result, 'unit': 'ppt',
+                                                    'sampling_date': self.timestamp(3650).date(),
+                                                    'analysis_method': rng.choice(ANALYSIS_METHODS),
+                                                    'filename': 'claim_pfas_results.pdf'}
+                    yield 'claim', flow_model, {**claim, 'source_variable': 'VFR', 'year': None, 'flow_rate': max_gpm,
+                                                'unit': 'gpm', 'flow_rate_gpm': max_gpm,
+                                                'filename': 'claim_max_flow.pdf'}
+                    for year, gpm in annuals.items():
+                        yield 'claim', flow_model, {**claim, 'source_variable': 'AFR', 'year': float(year),
+                                                    'flow_rate': gpm, 'unit': 'gpm', 'flow_rate_gpm': gpm,
+                                                    'filename': 'claim_annual_production.pdf'}
+
+                if 'updates' in tables:
+                    # Several revisions per source; later revisions of the same value have later submit dates
+                    for _ in range(rng.randint(0, 2 * self.revisions)):
+                        yield 'updates', PfasResult, {**source, 'analyte': rng.choice(analytes),
+                                                      'result_ppt': self.pfas_result(), 'unit': 'ppt',
+                                                      'submit_date': self.timestamp(),
+                                                      'updated_by_water_provider': True,
+                                                      'data_origin': 'EHE Update Portal',
+                                                      'filename': 'uploads/pfas_results.pdf'}
+                    for _ in range(rng.randint(0, 2 * self.revisions)):
+                        year = rng.choice([None] + years)
+                        gpm = round((max_gpm if year is None else annuals[year]) * rng.uniform(0.8, 1.2), 1)
+                        yield 'updates', FlowRate, {**source, 'source_variable': 'VFR' if year is None else 'AFR',
+                                                    'year': year, 'flow_rate': gpm, 'unit': 'gpm',
+                                                    'flow_rate_gpm': gpm, 'submit_date': self.timestamp(),
+                                                    'updated_by_water_provider': True,
+                                                    'data_origin': 'EHE Update Portal',
+                                                    'filename': 'uploads/flow_rates.pdf'}
+
+                if 'payments' in tables:
+                    for batch in range(rng.randint(0, 4)):
+                        amount = round(rng.lognormvariate(9, 1.5), 2)
+                        yield 'payments', srcPaymentDist, {
+                            'id': payment_id, 'fund_description': rng.choice(PAYMENT_FUNDS), 'batch_id': batch + 1,
+                            'batch_name': f"Batch {batch + 1}", 'claim_id': pws_index, 'pwsid': pwsid,
+                            'pws_name': pws_name, 'water_source_id': water_source_id, 'source_name': source_name,
+                            'law_firm': 'Synthetic Law Firm', 'entity_name': pws_name, 'recipient_name': pws_name,
+                            'payment_amount': amount, 'payment_id': payment_id, 'payment_method': 'ACH',
+                            'total_transaction_value': amount,
+                            'payment_date': (BASE_DATE + timedelta(days=90 * batch)).date(),
+                        }
+                        payment_id += 1
+
+                if 'supplemental' in tables:
+                    yield 'supplemental', supplementalSourceTracker, {
+                        'id': tracker_id, 'claim': '3M/DuPont Phase 1', 'pwsid': pwsid, 'pws_name': pws_name,
+                        'source_name': source_name, 'all_nds': all_nds, 'reg_bump': False,
+                    }
+                    tracker_id += 1
+
+                if phase2 and 'phase2' in tables:
+                    form = {'pwsid': pwsid, 'pws_name': pws_name, 'source_name': source_name,
+                            'timestamp': self.timestamp(), 'draft_complete': rng.choice(('draft', 'complete'))}
+                    yield 'phase2', phase2SourceInfo, {**form, 'source_type': rng.choice(SOURCE_TYPES)}
+                    yield 'phase2', phase2MaxFlow, {**form, 'flow_rate': max_gpm, 'units': 'GPM'}
+                    for year, gpm in annuals.items():
+                        yield 'phase2', phase2AnnualFlow, {**form, 'year': year, 'flow_rate': round(gpm * 525_600),
+                                                           'units': 'GPY'}
+                    for analyte in pfasAnalytes:
+                        yield 'phase2', phase2PfasResults, {**form, 'analyte': analyte,
+                                                            'result': results.get(analyte, 0.0), 'units': 'ppt',
+                                                            'sample_date': self.timestamp(3650).date()}
+
+
+def next_id(model):
+    return (model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+
+
+def load_synthetic_data(n_sources, seed=0, pwsid_prefix=DEFAULT_PWSID_PREFIX, revisions=3, tables=TABLES,
+                        method='auto', batch_size=None):
+    """
+    Generate synthetic data for n_sources sources and load it in one transaction.
+
+    Args:
+        n_sources: Number of sources to generate.
+        seed: Seed of the random generator; the same seed loads the same rows.
+        pwsid_prefix: Prefix of the synthetic PWSIDs.
+        revisions: Average number of PfasResult and of FlowRate updates per source.
+        tables: Groups of tables to load (see TABLES).
+        method: 'copy' (PostgreSQL only), 'bulk_create', or 'auto' to use COPY where available.
+        batch_size: Rows per COPY or INSERT batch. Defaults to COPY_BATCH_SIZE / BULK_CREATE_BATCH_SIZE.
+
+    Returns:
+        tuple: (list of (pwsid, source_name) of the generated sources, dict of row counts per table)
+    """
+    from ..models import srcPaymentDist, supplementalSourceTracker
+
+    if method == 'auto':
+        method = 'copy' if connection.vendor == 'postgresql' else 'bulk_create'
+    if method == 'copy' and connection.vendor != 'postgresql':
+        raise ValueError("COPY is only available on PostgreSQL.")
+    writer_class = CopyWriter if method == 'copy' else BulkCreateWriter
+    batch_size = batch_size or (COPY_BATCH_SIZE if method == 'copy' else BULK_CREATE_BATCH_SIZE)
+
+    generator = SyntheticDataGenerator(seed=seed, pwsid_prefix=pwsid_prefix, revisions=revisions)
+    writers = {}
+    with transaction.atomic():
+        rows = generator.generate(n_sources, tables, first_payment_id=next_id(srcPaymentDist),
+                                  first_tracker_id=next_id(supplementalSourceTracker))
+        for _, model, row in rows:
+            if model not in writers:
+                writers[model] = writer_class(model, batch_size)
+            writers[model].add(row)
+        for writer in writers.values():
+            writer.flush()
+
+        # Refresh the planner statistics, so queries are planned as they would be on a loaded database
+        with connection.cursor() as cursor:
+            for model in writers:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    return generator.source_keys, {model._meta.db_table: writer.count for model, writer in writers.items()}
+
+
+def delete_synthetic_data(pwsid_prefix=DEFAULT_PWSID_PREFIX):
+    """ Delete every row whose pwsid starts with the prefix from the tables the generator loads. """
+    from ..models import (Pws, ClaimPws, Source, ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource,
+                          TB_ClaimPfasResult, TB_ClaimFlowRate, PfasResult, FlowRate, srcPaymentDist,
+                          supplementalSourceTracker, phase2PwsInfo, phase2SourceInfo, phase2MaxFlow,
+                          phase2AnnualFlow, phase2PfasResults)
+
+    counts = {}
+    with transaction.atomic():
+        for model in (Pws, ClaimPws, Source, ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource,
+                      TB_ClaimPfasResult, TB_ClaimFlowRate, PfasResult, FlowRate, srcPaymentDist,
+                      supplementalSourceTracker, phase2PwsInfo, phase2SourceInfo, phase2MaxFlow, phase2AnnualFlow,
+                      phase2PfasResults):
+            # delete() rather than a raw DELETE, so the cached PWS profiles are invalidated (signals)
+            counts[model._meta.db_table] = model.objects.filter(pwsid__startswith=pwsid_prefix).delete()[0]
+    return counts
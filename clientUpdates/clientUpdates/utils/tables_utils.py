@@ -1,7 +1,30 @@
 from collections import defaultdict
-from django.db.models import OuterRef, Subquery
+from django.db import connections
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from itertools import chain
 
+# Factors converting a flow rate in gallons per minute
+GPM_TO_GPY = 1440 * 365
+GPM_TO_MGD = 1440 / 1_000_000
+GPM_TO_AFPY = 1440 * 365 / 325_851
+
+# Claims, as named in the page URLs
+CLAIMS = ('3M_DuPont', 'Tyco_BASF')
+
+
+def get_claim_models(claim):
+    """
+    Returns the (source, PFAS result, flow rate) claim models of a claim ('3M_DuPont' or 'Tyco_BASF').
+    """
+    from ..models import (ClaimSource, ClaimPfasResult, ClaimFlowRate, TB_ClaimSource, TB_ClaimPfasResult,
+                          TB_ClaimFlowRate)
+
+    if claim == '3M_DuPont':
+        return ClaimSource, ClaimPfasResult, ClaimFlowRate
+    if claim == 'Tyco_BASF':
+        return TB_ClaimSource, TB_ClaimPfasResult, TB_ClaimFlowRate
+    raise ValueError(f"Unknown claim '{claim}'.")
 
 
 def get_max_results_by_analyte(combined_pfas_results):
@@ -59,29 +82,47 @@ def get_combined_results(queryset_1, queryset_2, columns):
 
 
 
-def get_latest_entries(queryset, source_variable=None):
+def get_latest_entries(queryset, source_variable=None, by_source=False):
     """
     Returns the latest entry from EH&E PFAS results or Flow Rate table.
     Handles `source_variable` conditions for AFR and VFR specifically.
 
+    On PostgreSQL the latest revisions are selected in a single pass with DISTINCT ON; other
+    backends fall back to a correlated subquery. Revisions submitted at the same time are ordered
+    by primary key, so both pick the last one inserted.
+
     Arguments:
         queryset: The queryset to filter.
         source_variable: Specifies whether to process 'AFR', 'VFR', or other cases.
+        by_source: If True, returns the latest entries per (pwsid, source_name) so that many
+            sources can be fetched in one query.
 
     Returns:
         A queryset containing the latest entries based on the specified conditions.
     """
+    source_fields = ['pwsid', 'source_name'] if by_source else []
+
     if source_variable == 'AFR':
         # Get the latest entries for each year where source_variable is 'AFR'
-        latest_annuals = queryset.filter(source_variable='AFR', year=OuterRef('year')).order_by('-submit_date')
-        return queryset.filter(row_names__in=Subquery(latest_annuals.values('row_names')[:1]))
+        queryset = queryset.filter(source_variable='AFR', year__isnull=False)
+        partition = source_fields + ['year']
     elif source_variable == 'VFR':
         # Get the single latest entry for source_variable 'VFR'
-        return queryset.filter(source_variable='VFR').order_by('-submit_date')[:1]
+        queryset = queryset.filter(source_variable='VFR')
+        if not by_source:
+            return queryset.order_by('-submit_date', '-pk')[:1]
+        partition = source_fields
     else:
         # Handle PFAS results, getting the latest entry per analyte
-        latest_pfas_results = queryset.filter(analyte=OuterRef('analyte')).order_by('-submit_date')
-        return queryset.filter(row_names__in=Subquery(latest_pfas_results.values('row_names')[:1]))
+        queryset = queryset.filter(analyte__isnull=False)
+        partition = source_fields + ['analyte']
+
+    if connections[queryset.db].features.can_distinct_on_fields:
+        return queryset.order_by(*partition, '-submit_date', '-pk').distinct(*partition)
+
+    latest_entries = (queryset.filter(**{field: OuterRef(field) for field in partition})
+                      .order_by('-submit_date', '-pk'))
+    return queryset.filter(row_names__in=Subquery(latest_entries.values('row_names')[:1]))
 
 
 
@@ -93,4 +134,27 @@ def get_max_annuals_by_year(combined_annuals):
         year = record['year']
         if max_annuals_by_year[year] is None or record['flow_rate_gpm'] > max_annuals_by_year[year]['flow_rate_gpm']:
             max_annuals_by_year[year] = record
-    return list(max_annuals_by_year.values())
\ No newline at end of file
+    return list(max_annuals_by_year.values())
+
+
+def annotate_flow_rate_conversions(queryset):
+    """
+    Annotate a ClaimFlowRate/TB_ClaimFlowRate queryset with flow_rate_gpy, flow_rate_mgd and flow_rate_afpy,
+    computed by the database from flow_rate_gpm (a missing flow_rate_gpm counts as 0).
+    """
+    gpm = Coalesce(F('flow_rate_gpm'), Value(0.0), output_field=FloatField())
+    return queryset.annotate(
+        flow_rate_gpy=gpm * GPM_TO_GPY,
+        flow_rate_mgd=gpm * GPM_TO_MGD,
+        flow_rate_afpy=gpm * GPM_TO_AFPY,
+    )
+
+
+def flow_rate_conversions(flow_rate_gpm):
+    """ The conversions of annotate_flow_rate_conversions for a single flow rate (GPM). """
+    gpm = flow_rate_gpm or 0.0
+    return {
+        'flow_rate_gpy': gpm * GPM_TO_GPY,
+        'flow_rate_mgd': gpm * GPM_TO_MGD,
+        'flow_rate_afpy': gpm * GPM_TO_AFPY,
+    }
@@ -1,10 +1,21 @@
-from .calculations import calc_pfas_score_and_method, calc_afr_and_note, calc_gfes, calc_base_score
+import logging
+
+import numpy as np
+
+from .calculations import calc_pfas_score_and_method, calc_afr_and_note, calc_gfes, calc_base_score, \
+    calc_afr_note, calc_scores_batch, calc_base_score_batch, calc_gfes_batch, get_top_annuals
 from .tables_utils import get_latest_entries, get_combined_results, get_max_results_by_analyte, get_max_annuals_by_year, get_max_entry
+from .source_state import load_source_state_components, combine_source_state, get_source_state_inputs, filter_pwsids
+from .pws_profile import invalidate_pws_profiles
+from .log_utils import log_duration
 #from ..models import Pws, Source, PfasResult, FlowRate, ClaimSource, ClaimPfasResult, ClaimFlowRate
 #from clientUpdates import modePws, Source, PfasResult, FlowRate, ClaimSource, ClaimPfasResult, ClaimFlowRate
+from django.db import transaction
 from django.db.models import Sum
 from django.utils import timezone
 
+logger = logging.getLogger('clientUpdates')
+
 def update_pfas_metrics(pwsid, source_name):
     """
     Update the PFAS score, method, all_nds status, and regulatory bump for a given PWSID and source name.
@@ -23,10 +34,13 @@ def update_pfas_metrics(pwsid, source_name):
             - PFAS score
             - PFAS score method
     """
+    from ..models import ClaimSource, ClaimPfasResult, PfasResult, Source
+
     # Fetch ClaimSource
     claim_source = ClaimSource.objects.filter(pwsid=pwsid, source_name=source_name).first()
     if not claim_source:
-        print(f"No Claim Source found for pwsid: {pwsid}, source_name: {source_name}")
+        logger.warning(f"No Claim Source found for pwsid: {pwsid}, source_name: {source_name}",
+                       extra={'pwsid': pwsid, 'source_name': source_name})
         return
 
     # Fetch ClaimPfasResult and PfasResult
@@ -77,15 +91,18 @@ def update_flow_rate_metrics(pwsid, source_name):
 
     Calculates maximum annual production by year and maximum VFR.
     """
+    from ..models import ClaimSource, ClaimFlowRate, FlowRate, Source
+
 
     # Fetch ClaimSource
     claim_source = ClaimSource.objects.filter(pwsid=pwsid, source_name=source_name).first()
     if not claim_source:
-        print(f"No Claim Source found for pwsid: {pwsid}, source_name: {source_name}")
+        logger.warning(f"No Claim Source found for pwsid: {pwsid}, source_name: {source_name}",
+                       extra={'pwsid': pwsid, 'source_name': source_name})
         return
 
     # Fetch and combine AFR data
-    claim_annuals = ClaimFlowRate.objects.filter(pwsid=pwsid, source_name=source_name, source_variable='AFR').exclude(year=2013)
+    claim_annuals = ClaimFlowRate.objects.filter(pwsid=pwsid, source_name=source_name, source_variable='AFR', year__isnull=False).exclude(year=2013)
     updated_annuals = FlowRate.objects.filter(pwsid=pwsid, source_name=source_name, source_variable='AFR', updated_by_water_provider = True).exclude(year=2013)
     latest_annuals = get_latest_entries(updated_annuals, source_variable='AFR')
     combined_annuals = get_combined_results(claim_annuals, latest_annuals, ['year', 'flow_rate_gpm'])
@@ -120,6 +137,8 @@ def update_base_scores(pwsid, source_name):
     Updates the Source model with:
         - Base Score (base_score)
     """
+    from ..models import Source
+
     # Fetch the Source object
     source = Source.objects.filter(pwsid=pwsid, source_name=source_name).first()
 
@@ -129,7 +148,8 @@ def update_base_scores(pwsid, source_name):
         # Eventually also update adjusted base score, which will take into account regulatory bump, lit bump
         source.save()
     else: 
-        print(f"No Source found for pwsid: {pwsid}, source_name: {source_name}")
+        logger.warning(f"No Source found for pwsid: {pwsid}, source_name: {source_name}",
+                       extra={'pwsid': pwsid, 'source_name': source_name})
         return
 
 
@@ -146,6 +166,8 @@ def update_gfes(pwsid, source_name):
         - GFE for BASF (gfe_basf)
         - Total GFE for both (gfe_total_basf_tyco)
     """
+    from ..models import Source
+
     # Fetch the Source object
     source = Source.objects.filter(pwsid=pwsid, source_name=source_name).first()
     
@@ -160,7 +182,8 @@ def update_gfes(pwsid, source_name):
         source.gfe_total_basf_tyco = gfe_total_basf_tyco
         source.save()
     else: 
-        print(f"No Source found for pwsid: {pwsid}, source_name: {source_name}")
+        logger.warning(f"No Source found for pwsid: {pwsid}, source_name: {source_name}",
+                       extra={'pwsid': pwsid, 'source_name': source_name})
         return
 
 
@@ -180,29 +203,21 @@ def update_ehe_source_table(pwsid, source_name):
     Returns:
         None
     """
-    try:
-        update_pfas_metrics(pwsid, source_name)
-        print(f"PFAS metrics updated successfully for PWSID: {pwsid}, Source: {source_name}")
-    except Exception as e:
-        print(f"Failed to update PFAS metrics for PWSID: {pwsid}, Source: {source_name}. Error: {e}")
-
-    try:
-        update_flow_rate_metrics(pwsid, source_name)
-        print(f"Flow rate metrics updated successfully for PWSID: {pwsid}, Source: {source_name}")
-    except Exception as e:
-        print(f"Failed to update flow rate metrics for PWSID: {pwsid}, Source: {source_name}. Error: {e}")
-
-    try: 
-        update_base_scores(pwsid, source_name)
-        print(f"Base Score updated successfully for PWSID: {pwsid}, Source: {source_name}")
-    except Exception as e:
-        print(f"Failed to update Base Score in Source table for PWSID: {pwsid}, Source: {source_name}. Error: {e}")
-
-    try:
-        update_gfes(pwsid, source_name)
-        print(f"GFEs updated successfully for PWSID: {pwsid}, Source: {source_name}")
-    except Exception as e:
-        print(f"Failed to update GFEs in Source table for PWSID: {pwsid}, Source: {source_name}. Error: {e}")
+    context = {'pwsid': pwsid, 'source_name': source_name}
+    steps = [
+        (update_pfas_metrics, "PFAS metrics", "PFAS metrics"),
+        (update_flow_rate_metrics, "Flow rate metrics", "flow rate metrics"),
+        (update_base_scores, "Base Score", "Base Score in Source table"),
+        (update_gfes, "GFEs", "GFEs in Source table"),
+    ]
+    for update, updated, failed in steps:
+        try:
+            with log_duration(logger, f"{updated} updated successfully for PWSID: {pwsid}, Source: {source_name}",
+                              **context):
+                update(pwsid, source_name)
+        except Exception as e:
+            logger.error(f"Failed to update {failed} for PWSID: {pwsid}, Source: {source_name}. Error: {e}",
+                         extra=context)
 
 
 
@@ -215,6 +230,8 @@ def update_ehe_pws_table(pwsid):
     Args:
         pwsid: The PWSID for which to update the Pws table.
     """
+    from ..models import Pws, Source
+
     # Aggregate GFE values from all sources related to the PWSID
     gfe_sums = Source.objects.filter(pwsid=pwsid).aggregate(
         total_gfe_tyco=Sum('gfe_tyco'),
@@ -235,7 +252,173 @@ def update_ehe_pws_table(pwsid):
             gfe_total_basf_tyco=total_gfe_basf_tyco, 
             data_origin = 'EHE Update Portal'
         )
-        print(f"GFEs updated successfully in the Pws table")
+        logger.info(f"GFEs updated successfully in the Pws table", extra={'pwsid': pwsid})
     except Exception as e:
-        print(f"Failed to update GFEs in Pws table for PWSID: {pwsid}. Error: {e}")
-    
\ No newline at end of file
+        logger.error(f"Failed to update GFEs in Pws table for PWSID: {pwsid}. Error: {e}", extra={'pwsid': pwsid})
+    
+
+
+
+REG_BUMP_THRESHOLD = 4
+BULK_UPDATE_BATCH_SIZE = 1000
+
+
+def load_source_score_inputs(pwsids=None, claim='3M_DuPont'):
+    """
+    Load the claim and update rows needed to score every source of the given PWSIDs in a few grouped queries.
+
+    Mirrors update_pfas_metrics and update_flow_rate_metrics: claim rows are combined with the latest
+    water provider update per analyte (PFAS), per year (annual production) and overall (VFR), and the
+    maximum is kept for each. Rows with a missing result or flow rate are ignored.
+
+    Args:
+        pwsids: Iterable of PWSIDs to load, or None for the whole table.
+        claim: Claim whose tables hold the claim rows (see load_source_state_components).
+
+    Returns:
+        dict keyed by (pwsid, source_name) for every source with a ClaimSource, holding
+        'pfas' ({analyte: max result_ppt}), 'annuals' ({year: max flow_rate_gpm}) and 'vfr' (max flow_rate_gpm or None).
+    """
+    inputs = {}
+    for key, components in load_source_state_components(pwsids, claim=claim).items():
+        state = combine_source_state(components)
+        inputs[key] = {'pfas': state['max_pfas_results'], 'annuals': state['max_annuals'], 'vfr': state['max_vfr']}
+    return inputs
+
+
+def get_score_input_columns(inputs):
+    """
+    Columnar inputs of calc_scores_batch for a list of sources.
+
+    Args:
+        inputs: List of per-source inputs, as the values of load_source_score_inputs
+            ({'pfas': {analyte: result_ppt}, 'annuals': {year: flow_rate_gpm}, 'vfr': flow_rate_gpm or None}).
+
+    Returns:
+        dict of lists keyed by 'pfoa_results', 'pfos_results', 'max_other_results', 'top_annuals'
+        (three highest annuals, zero padded) and 'vfrs' (NaN where missing), in the order of inputs.
+    """
+    columns = {'pfoa_results': [], 'pfos_results': [], 'max_other_results': [], 'top_annuals': [], 'vfrs': []}
+    for source_inputs in inputs:
+        pfas = source_inputs['pfas']
+        columns['pfoa_results'].append(pfas.get('PFOA', 0))
+        columns['pfos_results'].append(pfas.get('PFOS', 0))
+        columns['max_other_results'].append(
+            max((result for analyte, result in pfas.items() if analyte not in ['PFOA', 'PFOS']), default=0))
+        columns['top_annuals'].append(
+            get_top_annuals([{'flow_rate_gpm': gpm} for gpm in source_inputs['annuals'].values()]))
+        columns['vfrs'].append(np.nan if source_inputs['vfr'] is None else source_inputs['vfr'])
+    return columns
+
+
+def bulk_update_ehe_source_table(pwsids=None, batch_size=BULK_UPDATE_BATCH_SIZE, from_state=False):
+    """
+    Set-based equivalent of update_ehe_source_table for many sources at once.
+
+    Loads the claim and update rows for every source of the given PWSIDs in a few grouped queries,
+    scores them in memory with the vectorized calculations, and writes the Source table back with
+    bulk_update in batches. Sources without a ClaimSource keep their PFAS score and AFR, but their
+    base score and GFEs are recalculated, as in the per-source functions.
+
+    Args:
+        pwsids: Iterable of PWSIDs to recompute, or None for the whole table.
+        batch_size: Number of Source rows written per UPDATE batch.
+        from_state: If True, reads the score inputs from the SourceCurrentState table instead of
+            re-merging the claim and update tables.
+
+    Returns:
+        The number of Source rows updated.
+    """
+    from ..models import Source
+
+    if pwsids is not None:
+        pwsids = list(pwsids)
+
+    inputs = get_source_state_inputs(pwsids) if from_state else load_source_score_inputs(pwsids)
+    sources = list(filter_pwsids(Source.objects.all(), pwsids).order_by('row_names'))
+    if not sources:
+        return 0
+
+    # Score every source with a claim in one vectorized pass
+    claimed = [source for source in sources if (source.pwsid, source.source_name) in inputs]
+    if claimed:
+        claimed_inputs = [inputs[(source.pwsid, source.source_name)] for source in claimed]
+        columns = get_score_input_columns(claimed_inputs)
+        scores = calc_scores_batch(columns['pfoa_results'], columns['pfos_results'], columns['max_other_results'],
+                                   columns['top_annuals'], columns['vfrs'])
+        submit_date = timezone.now()
+        for i, (source, source_inputs) in enumerate(zip(claimed, claimed_inputs)):
+            source.submit_date = submit_date
+            source.pfas_score = float(scores['pfas_score'][i])
+            source.pfas_score_method = scores['pfas_score_method'][i]
+            source.all_nds = source.pfas_score == 0
+            source.reg_bump = (columns['pfoa_results'][i] >= REG_BUMP_THRESHOLD
+                               or columns['pfos_results'][i] >= REG_BUMP_THRESHOLD)
+            source.afr = float(scores['afr'][i])
+            source.ehe_afr_note = calc_afr_note(len(source_inputs['annuals']), source_inputs['vfr'])
+            source.data_origin = 'EHE Update Portal'
+
+    # Base scores and GFEs for every source, from the (possibly just updated) PFAS score and AFR
+    pfas_scores = [np.nan if source.pfas_score is None else source.pfas_score for source in sources]
+    afrs = [np.nan if source.afr is None else source.afr for source in sources]
+    base_scores = calc_base_score_batch(pfas_scores, afrs)
+    gfes_tyco = calc_gfes_batch(pfas_scores, afrs, 'Tyco')
+    gfes_basf = calc_gfes_batch(pfas_scores, afrs, 'BASF')
+    for i, source in enumerate(sources):
+        source.base_score = float(base_scores[i])
+        source.gfe_tyco = float(gfes_tyco[i])
+        source.gfe_basf = float(gfes_basf[i])
+        source.gfe_total_basf_tyco = source.gfe_tyco + source.gfe_basf
+
+    fields = ['submit_date', 'all_nds', 'reg_bump', 'pfas_score', 'pfas_score_method', 'afr', 'ehe_afr_note',
+              'data_origin', 'base_score', 'gfe_tyco', 'gfe_basf', 'gfe_total_basf_tyco']
+    with transaction.atomic():
+        Source.objects.bulk_update(sources, fields, batch_size=batch_size)
+
+    return len(sources)
+
+
+def bulk_update_ehe_pws_table(pwsids=None, batch_size=BULK_UPDATE_BATCH_SIZE):
+    """
+    Set-based equivalent of update_ehe_pws_table: aggregates Source GFEs for every PWSID in one
+    grouped query and writes the Pws table back with bulk_update.
+
+    Args:
+        pwsids: Iterable of PWSIDs to recompute, or None for the whole table.
+        batch_size: Number of Pws rows written per UPDATE batch.
+
+    Returns:
+        The number of Pws rows updated.
+    """
+    from ..models import Pws, Source
+
+    if pwsids is not None:
+        pwsids = list(pwsids)
+
+    gfe_sums = {
+        row['pwsid']: row
+        for row in filter_pwsids(Source.objects.all(), pwsids).values('pwsid').annotate(
+            total_gfe_tyco=Sum('gfe_tyco'),
+            total_gfe_basf=Sum('gfe_basf')
+        )
+    }
+
+    submit_date = timezone.now()
+    pws_records = list(filter_pwsids(Pws.objects.all(), pwsids))
+    for pws in pws_records:
+        sums = gfe_sums.get(pws.pwsid, {})
+        pws.submit_date = submit_date
+        pws.gfe_tyco = sums.get('total_gfe_tyco') or 0
+        pws.gfe_basf = sums.get('total_gfe_basf') or 0
+        pws.gfe_total_basf_tyco = pws.gfe_tyco + pws.gfe_basf
+        pws.data_origin = 'EHE Update Portal'
+
+    with transaction.atomic():
+        Pws.objects.bulk_update(pws_records,
+                                ['submit_date', 'gfe_tyco', 'gfe_basf', 'gfe_total_basf_tyco', 'data_origin'],
+                                batch_size=batch_size)
+
+    # bulk_update doesn't send post_save, so drop the cached info bar profiles here
+    invalidate_pws_profiles(pws.form_userid for pws in pws_records)
+
+    return len(pws_records)
@@ -8,20 +8,28 @@ from django.core.files.storage import default_storage
 from django.views.decorators.cache import never_cache
 import django_localflavor_us.us_states as us_states
 
-from .models import (Pws, Source, PfasResult, FlowRate, ClaimSource, ClaimFlowRate,
+from .models import (ClaimSource, ClaimFlowRate,
                      ClaimPfasResult, paymentInfo,
                      TB_ClaimPfasResult, TB_ClaimFlowRate, supplementalSourceTracker, TB_ClaimSource,
-                     pwsPaymentDist, srcPaymentDist, ClaimSubmission, phase2PwsInfo, phase2AnnualFlow, phase2PfasResults,
+                     pwsPaymentDist, srcPaymentDist, phase2PwsInfo, phase2AnnualFlow, phase2PfasResults,
                      pwsCreds, phase2SourceInfo, phase2MaxFlow)
 from .forms import MaxFlowRateUpdateForm, AnnualProductionForm, PfasResultUpdateForm, ContactForm, pwsInfoForm, \
     phase2SourceInfoForm, phase2MaxFlowForm, phase2AnnualFlowForm, phase2PfasResultsForm, \
     formConstants, annualFiles, pfasFiles, maxFlowFile
-from .utils.dropbox_utils import upload_to_dropbox, dropboxLink
+from .utils.dropbox_utils import upload_to_dropbox, get_dropbox_link
 
 # Custom functions
 from .utils.handler import handle_update
-from .utils.tables_utils import add_pfoas_if_missing, get_max_other_threshold, get_latest_entries, get_combined_results
+from .utils.jobs import enqueue_dropbox_upload
+from .utils.form_utils import prepare_form_instances, set_per_instance, bulk_save_instances
+from .utils.pws_profile import get_pws_profile
+from .utils.landing_page import load_landing_page_summary
+from .utils.activity import get_activity_page
+from .utils.cache_utils import cache_per_user, invalidates_user_pages
+from .utils.tables_utils import add_pfoas_if_missing, get_max_other_threshold, annotate_flow_rate_conversions
 from .utils.calculations import calc_ppt_result, calc_gpm_flow_rate
+from .utils.exports import get_export_queryset, iter_csv, export_filename
+from .utils.source_state import get_source_current_state, get_current_pfas_results, get_current_flow_rates
 
 # Django functions
 from django.shortcuts import render, redirect, get_object_or_404, get_list_or_404
@@ -32,10 +40,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
 from django.conf import settings
 from django.core.mail import EmailMessage
-from django.http import JsonResponse, Http404
-from itertools import chain
+from django.http import JsonResponse, Http404, StreamingHttpResponse
 from datetime import datetime
-from django.db.models import Q, Sum
+from django.db.models import F, Q
 from .utils.dropbox_utils import upload_to_dropbox
 from .utils.file_upload_utils import upload_to_local, validate_file
 import logging
@@ -91,7 +98,7 @@ def root_redirect(request):
 @never_cache
 def dashboard(request, claim, supplemental=0):
     # Retrieve the PWS associated with the logged-in user; otherwise, throw an error.
-    pws_record = Pws.objects.get(form_userid=request.user.username)
+    pws_record = get_pws_profile(request).pws
     if not pws_record:
         raise Http404("Record not found")
 
@@ -127,7 +134,7 @@ def payment_dashboard(request, claim):
     # redirect to the landing page.
 
     # Retrieve the PWS associated with the logged-in user; otherwise, throw an error.
-    pws_record = Pws.objects.get(form_userid=request.user.username)
+    pws_record = get_pws_profile(request).pws
 
     # if claim == "3M_DuPont":
     #     pws_payment_info = pwsPaymentDist.objects.filter(
@@ -177,14 +184,16 @@ def payment_dashboard(request, claim):
 
 
 @login_required
+@cache_per_user()
 def supplemental_info(request):
     return render(request, 'supplemental_info.html')
 
 
 @login_required
+@cache_per_user()
 def source_payment_info(request, claim):
     # Retrieve the PWS associated with the logged-in user; otherwise, throw an error.
-    pws_record = Pws.objects.get(form_userid=request.user.username)
+    pws_record = get_pws_profile(request).pws
 
     if claim == "3M_DuPont":
         src_payment = srcPaymentDist.objects.filter(
@@ -201,10 +210,35 @@ def source_payment_info(request, claim):
     return render(request, 'source_payment_info.html', context)
 
 
+@login_required
+def export_data(request, claim, dataset):
+    """
+    Stream a claim dataset (sources, PFAS results, flow rates or source payments) as CSV.
+
+    Water systems get the rows of their own PWS. Staff get every PWS, or the one given as ?pwsid=.
+    """
+    if request.user.is_staff:
+        pwsid = request.GET.get('pwsid') or None
+    else:
+        pws_record = get_pws_profile(request).pws
+        if not pws_record:
+            raise Http404("Record not found")
+        pwsid = pws_record.pwsid
+
+    try:
+        columns, rows = get_export_queryset(claim, dataset, pwsid)
+    except ValueError as e:
+        raise Http404(str(e))
+
+    response = StreamingHttpResponse(iter_csv(columns, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(claim, dataset, pwsid)}"'
+    return response
+
+
 @login_required
 def payment_details(request):
     # Retrieve the PWS associated with the logged-in user; otherwise, throw an error.
-    pws_record = Pws.objects.get(form_userid=request.user.username)
+    pws_record = get_pws_profile(request).pws
 
     payment_info = paymentInfo.objects.get(pwsid=pws_record.pwsid)
 
@@ -222,27 +256,25 @@ def payment_details(request):
 @never_cache
 def landing_page(request):
     pwsid = request.user.username
-    # Retrieve the PWS associated with the logged-in user; otherwise, throw an error.
-    try:
+    # Load the claim submission flag and the Phase 2 forms of the PWS in a single query
+    summary = load_landing_page_summary(pwsid)
 
-        pws_submitted_claim = ClaimSubmission.objects.get(pwsid=pwsid)
-        pws_record = Pws.objects.get(form_userid=pwsid)
+    if summary['has_claim_submission']:
+        # Retrieve the PWS associated with the logged-in user
+        pws_record = get_pws_profile(request).pws
 
         context = {
             'pws': pws_record,
         }
 
         return render(request, 'landing_page.html', context)
-    # exception handling for if the query in the above try statement returns nothing.
-    except ClaimSubmission.DoesNotExist:
-
-        pwsGenInfo = phase2PwsInfo.objects.filter(pwsid=pwsid)
-        sourceGenInfo = phase2SourceInfo.objects.filter(pwsid=pwsid)
+    # no claim submission was found for the PWS
+    else:
 
         context = {
             'pws': pwsid,
-            'pwsGenInfo': pwsGenInfo,
-            'sourceGenInfo': sourceGenInfo
+            'pwsGenInfo': summary['pwsGenInfo'],
+            'sourceGenInfo': summary['sourceGenInfo']
         }
 
         #return render(request, 'no_data_landing_page.html', context)
@@ -263,28 +295,22 @@ def source_detail_view(request, claim, pwsid, source_name):
             analyte__isnull=True)
         flow_data = TB_ClaimFlowRate.objects.filter(pwsid=pwsid, source_name=source_name)
 
-    pfas_results = list(pfas_results.values())
-    for i in pfas_results:
-        print(i['analyte'])
-
-    #pfas_results = add_pfoas_if_missing(pfas_results, source.pwsid, source.water_source_id, source.source_name)
-    pfas_results = sorted(pfas_results, key=lambda x: x['analyte'], reverse=True)
-
-    flow_data = list(flow_data.values())
-    max_flow_rate = next((fr for fr in flow_data if fr['year'] is None), None)
-    max_gpm = max_flow_rate.get('flow_rate_gpm') or 0
-    max_flow_rate.update({
-        'flow_rate_gpy': max_gpm * 1440 * 365,
-        'flow_rate_mgd': max_gpm * 1440 / 1_000_000,
-        'flow_rate_afpy': max_gpm * 1440 * 365 / 325851,
-    })
-
-    annuals = [fr for fr in flow_data if fr['year'] is not None]
-    for annual in annuals:
-        gpm = annual.get('flow_rate_gpm') or 0
-        annual['flow_rate_gpm'] = gpm  # overwrite None with 0
-        annual['flow_rate_gpy'] = gpm * 1440 * 365
-        annual['flow_rate_afpy'] = gpm * 1440 * 365 / 325_851
+    pfas_results = list(pfas_results.order_by('-analyte').values(
+        'analyte', 'result_ppt', 'sampling_date', 'analysis_method', 'filename'))
+
+    # The 3M/DuPont PFAS results, max flow rate and annuals come from the current state of the source, the
+    # values its scores use, which include the water provider updates; the claim rows only supply the details
+    state = get_source_current_state(pwsid, source_name) if claim == "3M_DuPont" else None
+    if state is not None:
+        pfas_results = get_current_pfas_results(state, pfas_results)
+        max_flow_rate, annuals = get_current_flow_rates(
+            state, flow_data.values('source_variable', 'year', 'flow_rate_gpm', 'filename'))
+    else:
+        # Unit conversions are computed by the query; the max flow rate has no year and sorts after the annuals
+        flow_data = list(annotate_flow_rate_conversions(flow_data).order_by(F('year').asc(nulls_last=True)).values(
+            'year', 'flow_rate_gpm', 'filename', 'flow_rate_gpy', 'flow_rate_mgd', 'flow_rate_afpy'))
+        max_flow_rate = next((fr for fr in flow_data if fr['year'] is None), None)
+        annuals = [fr for fr in flow_data if fr['year'] is not None]
 
     impacted = True if not source.all_nds or pfas_results else False
 
@@ -406,6 +432,7 @@ def source_detail_view(request, claim, pwsid, source_name):
 #     return render(request, 'source_detail.html', context)
 
 @login_required
+@invalidates_user_pages
 def update_pfas_result_view(request):
     def calc_pfas_fields(instance, cleaned_data):
         instance.result = float(cleaned_data['result'])
@@ -430,6 +457,7 @@ def update_pfas_result_view(request):
 
 
 @login_required
+@invalidates_user_pages
 def update_max_flow_rate_view(request):
     def calc_max_flow_rate_fields(instance, cleaned_data):
         instance.flow_rate = cleaned_data['flow_rate']
@@ -448,6 +476,7 @@ def update_max_flow_rate_view(request):
 
 
 @login_required
+@invalidates_user_pages
 def update_annual_production_view(request):
     def calc_annual_production_fields(instance, cleaned_data):
         instance.flow_rate = cleaned_data['flow_rate']
@@ -507,6 +536,7 @@ def update_annual_production_view(request):
 
 
 @login_required
+@invalidates_user_pages
 def contact_view(request, claim=None, source_name=None, message=0):
     pwsid = request.user.username
     recipients = settings.EMAIL_RECIPIENTS
@@ -672,43 +702,19 @@ def no_data_contact_view(request):
 def activity_view(request):
     pwsid = request.user.username
 
-    pfas_results = PfasResult.objects.filter(pwsid=pwsid).values(
-        'submit_date', 'source_name', 'analyte', 'result_ppt'
-    )
-
-    # Format PFAS log entries
-    pfas_logs = [
-        {
-            'time': result['submit_date'],
-            'source_name': result['source_name'],
-            'table_name': 'PFAS Result',
-            'change': f"{result['analyte']} value changed to {result['result_ppt']} ng/L",
-        }
-        for result in pfas_results
-    ]
-
-    # Retrieve flow rate changes
-    flow_rates = FlowRate.objects.filter(pwsid=pwsid).values(
-        'submit_date', 'source_name', 'source_variable', 'year', 'flow_rate', 'unit'
-    )
+    # Read one page of PFAS result and flow rate changes, merged and ordered in SQL
+    page = get_activity_page(pwsid, cursor=request.GET.get('cursor'))
 
-    # Format flow rate log entries
-    flow_logs = [
-        {
-            'time': flow['submit_date'],
-            'source_name': flow['source_name'],
-            'table_name': 'Flow Rate',
-            'source_variable': flow['source_variable'],  # Keep the original value for logic
-            'change': f"{'Annual Production for ' + str(int(flow['year'])) if flow['source_variable'] == 'AFR' else 'Max Flow Rate'} changed to {flow['flow_rate']} {flow['unit']}",
-        }
-        for flow in flow_rates
-    ]
+    # Pass logs to template
+    return render(request, 'activity.html', page)
 
-    # Combine and sort logs
-    activity_logs = sorted(chain(pfas_logs, flow_logs), key=lambda x: x['time'], reverse=True)
 
-    # Pass logs to template
-    return render(request, 'activity.html', {'activity_logs': activity_logs})
+@login_required
+def activity_feed(request):
+    """ JSON page of the activity log. Pass the returned next_cursor as ?cursor= to get the following page. """
+    pwsid = request.user.username
+    page = get_activity_page(pwsid, cursor=request.GET.get('cursor'))
+    return JsonResponse(page)
 
 
 @login_required
@@ -720,6 +726,7 @@ def logout_view(request):
 
 @login_required
 @never_cache
+@invalidates_user_pages
 def pwsInfoCreate(request):
     pwsid = request.user.username
     pws_name = get_object_or_404(pwsCreds, pwsid=pwsid).pws_name
@@ -732,12 +739,8 @@ def pwsInfoCreate(request):
 
         if form.is_valid():
             try:
-                instance = form.save(commit=False)
-                instance.pwsid = pwsid
-                instance.pws_name = pws_name
-                instance.timestamp = timezone.now()
-                instance.draft_complete = draft_complete
-                instance.save()
+                bulk_save_instances(prepare_form_instances(form, pwsid=pwsid, pws_name=pws_name,
+                                                           timestamp=timezone.now(), draft_complete=draft_complete))
                 logger.info(
                     f"{pwsid} | PWS Information created.")
                 return render(request, 'form_success.html')
@@ -757,6 +760,7 @@ def pwsInfoCreate(request):
 
 @login_required
 @never_cache
+@invalidates_user_pages
 def pwsInfoEdit(request, pwsid):
     pwsInfoInstance = get_object_or_404(phase2PwsInfo, pwsid=pwsid)
     pws_name = get_object_or_404(pwsCreds, pwsid=pwsid).pws_name
@@ -768,12 +772,8 @@ def pwsInfoEdit(request, pwsid):
 
         if form.is_valid():
             try:
-                instance = form.save(commit=False)
-                instance.pwsid = pwsid
-                instance.pws_name = pws_name
-                instance.timestamp = timezone.now()
-                instance.draft_complete = draft_complete
-                instance.save()
+                bulk_save_instances(prepare_form_instances(form, pwsid=pwsid, pws_name=pws_name,
+                                                           timestamp=timezone.now(), draft_complete=draft_complete))
                 logger.info(
                     f"{pwsid} | PWS Information edited.")
                 return render(request, 'form_success.html')
@@ -792,6 +792,7 @@ def pwsInfoEdit(request, pwsid):
                                                   "action": f"url pws-info-edit {pwsid}"})
 
 @login_required
+@invalidates_user_pages
 def pwsInfoDelete(request, pwsid):
     if request.method == "POST":
         try:
@@ -810,8 +811,16 @@ def formSuccess(request):
     return render(request, 'form_success.html')
 
 
+# Errors shown above the source form when a submission isn't saved
+SOURCE_FORM_INVALID = "Your changes were not saved. Please check the form fields and submit it again."
+SOURCE_FORM_MISMATCH = ("Your changes were not saved because the annual production rows don't match the years of the "
+                        "form. Please reload the form and submit it again.")
+SOURCE_FORM_ERROR = "Your changes were not saved due to a system error. Please try again or contact EH&E."
+
+
 @never_cache
 @login_required
+@invalidates_user_pages
 def sourceFormCreate(request):
     # get pwsid and associated pws name
     pwsid = request.user.username
@@ -860,61 +869,46 @@ def sourceFormCreate(request):
                     comments_pfas = form5.cleaned_data['comments_pfas']
                     dt = timezone.now()
 
-                    # modify and save sourceinfo form
-                    form1 = form1.save(commit=False)
-                    form1.pwsid = pwsid
-                    form1.pws_name = pws_name
-                    form1.source_name = source_name
-                    form1.timestamp = dt
-                    form1.draft_complete = draft_complete
-                    form1.save()
-
-                    # modify and save max flow form
-                    form2 = form2.save(commit=False)
-                    form2.pwsid = pwsid
-                    form2.pws_name = pws_name
-                    form2.source_name = source_name
-                    form2.timestamp = dt
-                    form2.draft_complete = draft_complete
-                    form2.save()
-
-                    # modify and save annual flow form
-                    for form, year in zip(form3, years):
-                        instance = form.save(commit=False)
-                        instance.pwsid = pwsid
-                        instance.pws_name = pws_name
-                        instance.source_name = source_name
-                        instance.comments = comments_annual_flow
-                        instance.year = year
-                        instance.timestamp = dt
-                        instance.draft_complete = draft_complete
-                        instance.save()
-
-                    # modify and save pfas form
-                    for form in form4:
-                        instance = form.save(commit=False)
-                        instance.pwsid = pwsid
-                        instance.pws_name = pws_name
-                        instance.source_name = source_name
-                        instance.comments = comments_pfas
-                        instance.timestamp = dt
-                        instance.draft_complete = draft_complete
-                        instance.save()
+                    shared_fields = {'pwsid': pwsid, 'pws_name': pws_name, 'source_name': source_name,
+                                     'timestamp': dt, 'draft_complete': draft_complete}
 
+                    # modify sourceinfo and max flow forms
+                    sourceInfoInstances = prepare_form_instances(form1, **shared_fields)
+                    maxFlowInstances = prepare_form_instances(form2, **shared_fields)
+
+                    # modify annual flow form
+                    annualFlowInstances = prepare_form_instances(form3, comments=comments_annual_flow, **shared_fields)
+                    set_per_instance(annualFlowInstances, 'year', years)
+
+                    # modify pfas form
+                    pfasInstances = prepare_form_instances(form4, comments=comments_pfas, **shared_fields)
+
+                    # save all forms with one write per table
+                    bulk_save_instances(sourceInfoInstances + maxFlowInstances + annualFlowInstances + pfasInstances)
+
+                    # save files locally now and upload them to dropbox in the background
                     for file in request.FILES:
                         if "annualFile" in file:
-                            upload_to_dropbox(file=request.FILES[file], filetype="Phase2/Annual-Flow", pwsid=pwsid)
+                            enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/Annual-Flow", pwsid=pwsid, source_name=source_name)
                         elif "pfasFile" in file:
-                            upload_to_dropbox(file=request.FILES[file], filetype="Phase2/PFAS", pwsid=pwsid)
+                            enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/PFAS", pwsid=pwsid, source_name=source_name)
                         elif "maxFlow" in file:
-                            upload_to_dropbox(file=request.FILES[file], filetype="Phase2/Max-Flow", pwsid=pwsid)
+                            enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/Max-Flow", pwsid=pwsid, source_name=source_name)
 
-                    logger.info(f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data saved.")
+                    logger.info(f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data saved.",
+                                extra={'pwsid': pwsid, 'source_name': source_name})
 
                     return render(request, 'form_success.html')
 
+            form_error = SOURCE_FORM_INVALID
+
+        except ValueError as e:
+            logger.exception(f"{pwsid} | Source form rows don't match the form: {e}", extra={'pwsid': pwsid})
+            form_error = SOURCE_FORM_MISMATCH
+
         except Exception as e:
-            print(e)
+            logger.exception(f"{pwsid} | Error saving source form: {e}", extra={'pwsid': pwsid})
+            form_error = SOURCE_FORM_ERROR
 
     else:
 
@@ -933,38 +927,43 @@ def sourceFormCreate(request):
         form6 = annualFiles()
         form7 = pfasFiles()
         form8 = maxFlowFile()
+        form_error = None
 
-        existingSourceNames = phase2SourceInfo.objects.filter(pwsid=pwsid).values_list('source_name', flat=True).distinct();
+    existingSourceNames = phase2SourceInfo.objects.filter(pwsid=pwsid).values_list('source_name', flat=True).distinct();
 
-        context = {
+    context = {
 
-            "phase2SourceInfoForm": form1,
-            "phase2MaxFlowForm": form2,
-            "phase2AnnualFlowForm": form3,
-            "phase2PfasResultsForm": form4,
-            "formConstants": form5,
-            "annualFilesForm": form6,
-            "pfasFilesForm": form7,
-            "maxFlowFile": form8,
-            "yesNo": yesNo,
-            "sourceTypeOptions": sourceTypeOptions,
-            "unitOptions": unitOptions,
-            "annualUnitOptions": annualUnitOptions,
-            "years": years,
-            "otherAnalytes": otherAnalytes,
-            "action": "/source-form-create/",
-            "existingSourceNames": existingSourceNames
+        "phase2SourceInfoForm": form1,
+        "phase2MaxFlowForm": form2,
+        "phase2AnnualFlowForm": form3,
+        "phase2PfasResultsForm": form4,
+        "formConstants": form5,
+        "annualFilesForm": form6,
+        "pfasFilesForm": form7,
+        "maxFlowFile": form8,
+        "yesNo": yesNo,
+        "sourceTypeOptions": sourceTypeOptions,
+        "unitOptions": unitOptions,
+        "annualUnitOptions": annualUnitOptions,
+        "years": years,
+        "otherAnalytes": otherAnalytes,
+        "action": "/source-form-create/",
+        "existingSourceNames": existingSourceNames,
+        "formError": form_error
 
-        }
+    }
 
-        return render(request, 'source_form.html', context=context)
+    return render(request, 'source_form.html', context=context)
 
 
 # ------------------------------------------------------------------------------------------------------------------
 @login_required
 @never_cache
+@invalidates_user_pages
 def sourceFormEdit(request, pwsid, source_name):
     try:
+        # A rejected submission is shown again under the source's current name
+        action = f"url source-form-edit {pwsid} {source_name}"
 
         phase2SourceInfoInstance = get_object_or_404(phase2SourceInfo, pwsid=pwsid, source_name=source_name)
         phase2MaxFlowInstance = get_object_or_404(phase2MaxFlow, pwsid=pwsid, source_name=source_name)
@@ -1005,53 +1004,48 @@ def sourceFormEdit(request, pwsid, source_name):
                         comments_pfas = form5.cleaned_data['comments_pfas']
                         dt = timezone.now()
 
-                        # modify and save sourceinfo form
-                        form1 = form1.save(commit=False)
-                        form1.source_name = source_name
-                        form1.timestamp = dt
-                        form1.draft_complete = draft_complete
-                        form1.save()
-
-                        # modify and save max flow form
-                        form2 = form2.save(commit=False)
-                        form2.source_name = source_name
-                        form2.timestamp = dt
-                        form2.draft_complete = draft_complete
-                        form2.save()
-
-                        # modify and save annual flow form
-                        for form, year in zip(form3, years):
-                            instance = form.save(commit=False)
-                            instance.source_name = source_name
-                            instance.year = year
-                            instance.comments = comments_annual_flow
-                            instance.timestamp = dt
-                            instance.draft_complete = draft_complete
-                            instance.save()
-
-                        for form in form4:
-                            instance = form.save(commit=False)
-                            instance.source_name = source_name
-                            instance.comments = comments_pfas
-                            instance.timestamp = dt
-                            instance.draft_complete = draft_complete
-                            instance.save()
+                        shared_fields = {'source_name': source_name, 'timestamp': dt, 'draft_complete': draft_complete}
+
+                        # modify sourceinfo and max flow forms
+                        sourceInfoInstances = prepare_form_instances(form1, **shared_fields)
+                        maxFlowInstances = prepare_form_instances(form2, **shared_fields)
+
+                        # modify annual flow form
+                        annualFlowInstances = prepare_form_instances(form3, comments=comments_annual_flow, **shared_fields)
+                        set_per_instance(annualFlowInstances, 'year', years)
+
+                        # modify pfas form
+                        pfasInstances = prepare_form_instances(form4, comments=comments_pfas, **shared_fields)
+
+                        # save all forms with one write per table
+                        bulk_save_instances(sourceInfoInstances + maxFlowInstances + annualFlowInstances + pfasInstances)
 
+                        # save files locally now and upload them to dropbox in the background
                         for file in request.FILES:
                             if "annualFile" in file:
-                                upload_to_dropbox(file=request.FILES[file], filetype="Phase2/Annual-Flow", pwsid=pwsid)
+                                enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/Annual-Flow", pwsid=pwsid, source_name=source_name)
                             elif "pfasFile" in file:
-                                upload_to_dropbox(file=request.FILES[file], filetype="Phase2/PFAS", pwsid=pwsid)
+                                enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/PFAS", pwsid=pwsid, source_name=source_name)
                             elif "maxFlow" in file:
-                                upload_to_dropbox(file=request.FILES[file], filetype="Phase2/Max-Flow", pwsid=pwsid)
+                                enqueue_dropbox_upload(file=request.FILES[file], filetype="Phase2/Max-Flow", pwsid=pwsid, source_name=source_name)
 
                         logger.info(
-                            f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data edited.")
+                            f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data edited.",
+                            extra={'pwsid': pwsid, 'source_name': source_name})
 
                         return render(request, 'form_success.html')
 
+                form_error = SOURCE_FORM_INVALID
+
+            except ValueError as e:
+                logger.exception(f"{pwsid} | {source_name} | Source form rows don't match the form: {e}",
+                                 extra={'pwsid': pwsid, 'source_name': source_name})
+                form_error = SOURCE_FORM_MISMATCH
+
             except Exception as e:
-                print(e)
+                logger.exception(f"{pwsid} | {source_name} | Error saving source form edits: {e}",
+                                 extra={'pwsid': pwsid, 'source_name': source_name})
+                form_error = SOURCE_FORM_ERROR
 
         else:
 
@@ -1078,36 +1072,39 @@ def sourceFormEdit(request, pwsid, source_name):
             form6 = annualFiles()
             form7 = pfasFiles()
             form8 = maxFlowFile()
+            form_error = None
+
+        existingSourceNames = phase2SourceInfo.objects.filter(pwsid=pwsid).values_list('source_name', flat=True).distinct()
+
+        context = {
 
-            existingSourceNames = phase2SourceInfo.objects.filter(pwsid=pwsid).values_list('source_name', flat=True).distinct()
-
-            context = {
-
-                "phase2SourceInfoForm": form1,
-                "phase2MaxFlowForm": form2,
-                "phase2AnnualFlowForm": form3,
-                "phase2PfasResultsForm": form4,
-                "formConstants": form5,
-                "annualFilesForm": form6,
-                "pfasFilesForm": form7,
-                "maxFlowFile": form8,
-                "yesNo": yesNo,
-                "sourceTypeOptions": sourceTypeOptions,
-                "unitOptions": unitOptions,
-                "annualUnitOptions": annualUnitOptions,
-                "years": years,
-                "otherAnalytes": otherAnalytes,
-                "action": f"url source-form-edit {pwsid} {source_name}",
-                "dropboxLink": dropboxLink(pwsid),
-                "existingSourceNames": existingSourceNames
-
-            }
-
-            return render(request, 'source_form.html', context=context)
+            "phase2SourceInfoForm": form1,
+            "phase2MaxFlowForm": form2,
+            "phase2AnnualFlowForm": form3,
+            "phase2PfasResultsForm": form4,
+            "formConstants": form5,
+            "annualFilesForm": form6,
+            "pfasFilesForm": form7,
+            "maxFlowFile": form8,
+            "yesNo": yesNo,
+            "sourceTypeOptions": sourceTypeOptions,
+            "unitOptions": unitOptions,
+            "annualUnitOptions": annualUnitOptions,
+            "years": years,
+            "otherAnalytes": otherAnalytes,
+            "action": action,
+            "dropboxLink": get_dropbox_link(pwsid),
+            "existingSourceNames": existingSourceNames,
+            "formError": form_error
+
+        }
+
+        return render(request, 'source_form.html', context=context)
     except Exception as e:
         logger.error(e)
 
 @login_required
+@invalidates_user_pages
 def sourceInfoDelete(request, pwsid, source_name):
     if request.method == "POST":
         try:
@@ -1123,12 +1120,14 @@ def sourceInfoDelete(request, pwsid, source_name):
 
                 srcPfasResults = phase2PfasResults.objects.filter(pwsid=pwsid, source_name=source_name)
                 srcPfasResults.delete()
-                logger.info(f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data deleted.")
+                logger.info(f"{pwsid} | {source_name} | Source information, PFAS Data, Max Flow Data, and Annual Production Data deleted.",
+                            extra={'pwsid': pwsid, 'source_name': source_name})
                 return redirect('landing_page')
         except Exception as e:
             logger.exception(f"Error deleting data related to this source: {e}")
             raise
 
 @login_required
+@cache_per_user()
 def phase2HelpInfo(request):
     return render(request, template_name='phase2_helpful_info.html')